@@ -1,2 +1,41 @@
-from .badgrmodels import Assertion, BadgeClass, Issuer  # noqa: F401
-from .badgrclient import BadgrClient  # noqa: F401
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names and the module they are defined in, imported on first access
+# so that importing the package stays fast
+_EXPORTS = {
+    "Assertion": ".badgrmodels",
+    "BadgeClass": ".badgrmodels",
+    "Issuer": ".badgrmodels",
+    "BadgrClient": ".badgrclient",
+    "AsyncAssertion": ".asyncmodels",
+    "AsyncBadgeClass": ".asyncmodels",
+    "AsyncIssuer": ".asyncmodels",
+    "AsyncBadgrClient": ".asyncclient",
+    "load_env": ".env",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .badgrmodels import Assertion, BadgeClass, Issuer  # noqa: F401
+    from .badgrclient import BadgrClient  # noqa: F401
+    from .asyncmodels import AsyncAssertion, AsyncBadgeClass, AsyncIssuer  # noqa: F401
+    from .asyncclient import AsyncBadgrClient  # noqa: F401
+    from .env import load_env  # noqa: F401
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    # Cache it so __getattr__ isn't called again
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,705 @@
+import asyncio
+import datetime
+from typing import AsyncIterator, Iterable, List, Sequence, Tuple, Union
+from .badgrclient import BadgrClient, Logger
+from .env import env_credentials
+from .bulk import (
+    IssueResult,
+    RevokeResult,
+    chunks,
+    is_rejection,
+    issue_kwargs,
+    revoke_errors,
+    revoke_results,
+)
+from .asyncmodels import AsyncAssertion, AsyncBadgeClass, AsyncIssuer
+from .exceptions import BadgrClientError
+from .image import JSONStream
+from .journal import IssuanceJournal
+from .metrics import RequestEvent
+from .tracing import start_span, traced
+from .util import aprefetch
+
+ASYNC_MODELS = {
+    "Assertion": AsyncAssertion,
+    "BadgeClass": AsyncBadgeClass,
+    "Issuer": AsyncIssuer,
+}
+
+
+class AsyncBadgrClient(BadgrClient):
+
+    MODELS = ASYNC_MODELS
+
+    def __init__(self, *args, http_client=None, **kwargs):
+        """
+        Initalize a new asyncio client. Takes the same arguments as
+        :class:`~badgrclient.badgrclient.BadgrClient`
+
+        Args:
+            http_client (httpx.AsyncClient, optional): Client to send requests
+                with, the pool options are ignored. Defaults to a new client
+                owned by this instance.
+
+        Note:
+            httpx keeps a single pool, so pool_maxsize bounds its keep-alive
+            connections and pool_connections and adapter don't apply. Without
+            pool_block extra connections are opened when the pool is exhausted.
+
+        Note:
+            Authentication with username and password is deferred to the first
+            API call, so the client can be created outside of a running loop.
+            Use ``async with`` or call
+            :func:`~badgrclient.asyncclient.AsyncBadgrClient.aclose` when done.
+
+        Note:
+            Stored tokens are reused and updated like with the sync client, but
+            the token store isn't locked while authenticating, as that would
+            block the event loop
+
+        Note:
+            Requires httpx, install it with ``pip install badgrclient[async]``
+        """
+        self._credentials = None
+        # Created on first use so it belongs to the running loop
+        self._auth_lock = None
+        self._refresh_task = None
+        self._recipient_load_locks = {}
+        super().__init__(*args, session=http_client, **kwargs)
+
+    def _create_session(self):
+        """Create the httpx client used to call the API with the pool options"""
+        try:
+            import httpx
+        except ImportError:
+            raise BadgrClientError(
+                "AsyncBadgrClient requires httpx, install it with "
+                "pip install badgrclient[async]"
+            )
+
+        from .transport import keepalive_socket_options
+
+        options = self._pool_options
+        socket_options = None
+        if options["tcp_keepalive"]:
+            socket_options = keepalive_socket_options(options["tcp_keepalive"])
+
+        limits = httpx.Limits(
+            max_connections=options["pool_maxsize"] if options["pool_block"] else None,
+            max_keepalive_connections=options["pool_maxsize"],
+        )
+        transport = httpx.AsyncHTTPTransport(
+            limits=limits, socket_options=socket_options
+        )
+
+        return httpx.AsyncClient(transport=transport)
+
+    def _login(self, username: str, password: str):
+        """Keep the credentials until the first API call authenticates"""
+        if self.token_store is not None:
+            username, password = self._login_credentials(username, password)
+
+        self._credentials = (username, password)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def close(self):
+        """The http client can only be closed from a coroutine, use
+        :func:`~badgrclient.asyncclient.AsyncBadgrClient.aclose` instead
+
+        Raises:
+            BadgrClientError: Always
+        """
+        raise BadgrClientError(
+            "Close an AsyncBadgrClient with await client.aclose() or async with"
+        )
+
+    def __enter__(self):
+        raise BadgrClientError("Use an AsyncBadgrClient with async with, not with")
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def aclose(self):
+        """Stop background token renewal and close the underlying http client
+        if it's owned by this instance
+        """
+        self._closed = True
+        self._cancel_refresh()
+
+        if self._owns_session:
+            await self.session.aclose()
+
+    async def _call_api(
+        self,
+        endpoint,
+        method="GET",
+        params=None,
+        data=None,
+        auth=True,
+        idempotent=False,
+    ) -> dict:
+        """Awaitable version of :func:`~badgrclient.badgrclient.BadgrClient._call_api`
+
+        Args:
+            endpoint: the endpoint to call
+            method: the HTTP method to use when calling the specified
+            URL, can be GET, POST, DELETE, UPDATE...
+            Defaults to GET
+            params: the params to specify to a GET request
+            data: the data to send to a POST request
+            auth: Wether authorization is required
+            idempotent: Wether the request can be retried whatever its method
+        """
+        req = await self._request(endpoint, method, params, data, auth, idempotent)
+
+        return self._get_json(req)
+
+    async def _request(
+        self,
+        endpoint,
+        method="GET",
+        params=None,
+        data=None,
+        auth=True,
+        idempotent=False,
+        headers=None,
+    ):
+        """Send a request to the API and return the raw response,
+        see :func:`~badgrclient.badgrclient.BadgrClient._request`
+        """
+        if not self._instrumented():
+            return await self._send(
+                None, endpoint, method, params, data, auth, idempotent, headers
+            )
+
+        event = RequestEvent(method, endpoint)
+
+        with start_span(self, "{} {}".format(method, event.endpoint)) as span:
+            try:
+                req = await self._send(
+                    event, endpoint, method, params, data, auth, idempotent, headers
+                )
+            except Exception as err:
+                self._emit(event, span, error=err)
+                raise
+
+            self._emit(event, span, req)
+
+        return req
+
+    async def _send(
+        self, event, endpoint, method, params, data, auth, idempotent, headers
+    ):
+        """Send a request, retrying it as allowed by the retry policy,
+        see :func:`~badgrclient.badgrclient.BadgrClient._send`
+        """
+        import httpx
+
+        attempt = 0
+        reauthenticated = False
+        body, headers = self._encode_body(data, headers)
+        if event is not None:
+            event.bytes_sent = len(body) if body else 0
+
+        while True:
+            if auth and (self._credentials or self._token_expired()):
+                await self._authenticate()
+
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(method, endpoint)
+
+            req, error = None, None
+            try:
+                req = await self.session.request(
+                    method,
+                    self._get_url(endpoint),
+                    params=params,
+                    headers=self._get_headers(auth, headers),
+                    # Each attempt streams the body again
+                    content=body.aiter() if isinstance(body, JSONStream) else body,
+                )
+            except httpx.TransportError as err:
+                if self.retry is None:
+                    raise
+                error = err
+
+            if auth and not reauthenticated and self._token_rejected(req):
+                reauthenticated = True
+                continue
+
+            delay = None
+            if self.retry is not None:
+                delay = self.retry.get_retry_delay(
+                    method, attempt, idempotent, req, error
+                )
+
+            if delay is None:
+                if error is not None:
+                    raise error
+                return req
+
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+            Logger.warning(
+                "Retrying {} {} in {:.2f}s (retry {})".format(
+                    method, endpoint, delay, attempt
+                )
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _ttfb(response):
+        # httpx only reports the time until the response was read
+        return None
+
+    def _iter_pages(
+        self, endpoint, params=None, page_size: int = 100, prefetch: int = 0
+    ) -> AsyncIterator[list]:
+        """Call a list endpoint page by page, see
+        :func:`~badgrclient.badgrclient.BadgrClient._iter_pages`
+        """
+        pages = self._fetch_pages(endpoint, params, page_size)
+
+        if prefetch:
+            return aprefetch(pages, prefetch)
+
+        return pages
+
+    async def _fetch_pages(
+        self, endpoint, params, page_size: int
+    ) -> AsyncIterator[list]:
+        """Generate the pages of a list endpoint"""
+        params = dict(params or {}, num=page_size)
+
+        while endpoint:
+            req = await self._request(endpoint, params=params)
+            response = self._get_json(req)
+
+            yield response["result"]
+
+            # The next link already carries the query params
+            endpoint = self._next_page_url(req)
+            params = None
+
+    async def _iter_models(
+        self, endpoint, params=None, page_size: int = 100, prefetch: int = 0
+    ):
+        """Iterate over the models of a list endpoint, deserializing a page
+        at a time
+        """
+        async for page in self._iter_pages(endpoint, params, page_size, prefetch):
+            for model in self._deserialize(page):
+                yield model
+
+    async def _authenticate(self, skew: int = 0):
+        """Login or refresh the expired token. Only one task authenticates at
+        a time, the others wait for it and reuse its token
+
+        Args:
+            skew (int): Refresh if the token expires within this many seconds
+        """
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+
+        async with self._auth_lock:
+            if self._credentials:
+                if not self._load_stored_token():
+                    await self._get_auth_token(*self._credentials)
+                self._credentials = None
+            elif self._token_expired(skew) and not self._load_stored_token(skew):
+                await self._get_auth_token()
+
+    def _schedule_refresh(self):
+        """Schedule the background renewal of the current token on the running
+        loop, unless the client was closed
+        """
+        if self._closed:
+            return
+
+        self._cancel_refresh()
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self._background_refresh(self._refresh_delay())
+        )
+
+    def _cancel_refresh(self):
+        """Cancel the scheduled background renewal, if any"""
+        task = self._refresh_task
+        self._refresh_task = None
+
+        # The renewal task reschedules itself once it got a new token
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _background_refresh(self, delay: float):
+        """Renew the token after delay seconds"""
+        await asyncio.sleep(delay)
+
+        try:
+            await self._authenticate(self._auto_refresh_skew())
+        except Exception as err:
+            # Requests will refresh the token themselves once it expires
+            Logger.error("Background token renewal failed: {}".format(err))
+
+    @traced
+    async def _get_auth_token(self, username=None, password=None):
+        """Fetches token and sets header for api calls. Uses refresh_token
+        if username and password isn't provided
+
+        Args:
+            username (string): Badgr username
+            password (string): Badgr password
+        Note:
+            Defaults to the BADGR_USERNAME and BADGR_PASSWORD environment
+            variables, read on every call
+        """
+        if username is None and password is None:
+            username, password = env_credentials()
+
+        now = datetime.datetime.now()
+        payload = self._token_payload(username, password)
+
+        req = await self.session.post(self.base_url + "/o/token", data=payload)
+
+        self._set_token(self._get_json(req), now)
+
+    async def _fetch_id_or_self(self, endpoint, eid, entity_type=None):
+        """Appends entityId to endpoint if provided and calls it
+
+        Args:
+            endpoint (string): Endpoint to call
+            eid ([type]): entityId
+            entity_type (string, optional): entityType of the entity, to look it
+                up in the cache
+        """
+        if eid:
+            ep = endpoint + "/{}".format(eid)
+            result = await self._fetch_result(ep, entity_type, eid)
+        else:
+            result = (await self._call_api(endpoint))["result"]
+
+        return self._deserialize(result)
+
+    async def _fetch_result(self, endpoint, entity_type=None, eid=None) -> list:
+        """Call endpoint and get its result list, see
+        :func:`~badgrclient.badgrclient.BadgrClient._fetch_result`
+        """
+        cache = self.cache
+        if cache is None or not cache.caches(entity_type):
+            return (await self._call_api(endpoint))["result"]
+
+        body = cache.get(entity_type, eid)
+        if body is not None:
+            return self._cached_result(body)
+
+        req = await self._request(
+            endpoint, headers=cache.get_validators(entity_type, eid)
+        )
+        if req.status_code == 304:
+            body = cache.revalidate(entity_type, eid)
+            if body is not None:
+                return self._cached_result(body)
+
+            # Evicted since we sent the validators
+            req = await self._request(endpoint)
+
+        return self._cache_result(req, entity_type, eid)
+
+    async def load_badge_names(self, issuer_eid: str, max_age: float = None):
+        """
+        (Re)loads the badge name index for an issuer, see
+        :func:`~badgrclient.badgrclient.BadgrClient.load_badge_names`
+        """
+        if self._badge_names_fresh(issuer_eid, max_age):
+            return
+
+        attributes = {"badgr.entity_type": "Issuer", "badgr.entity_id": issuer_eid}
+
+        with start_span(self, "AsyncBadgrClient.load_badge_names", attributes):
+            issuer = AsyncIssuer(self, issuer_eid)
+            issuers_badges = await issuer.fetch_badgeclasses(
+                load_badge_names=False
+            )  # We will load it ourselves
+
+            self._replace_badge_names(issuer_eid, issuers_badges)
+
+    def get_eid_from_badge_name(self, badge_name: str, issuer_eid: str):
+        """Get eid from badge name and it's issuer eid if it's in the index,
+        use :func:`~badgrclient.asyncclient.AsyncBadgrClient.resolve_badge_name`
+        to load it on a miss
+        """
+        return self._indexed_badge_eid(badge_name, issuer_eid)
+
+    async def resolve_badge_name(self, badge_name: str, issuer_eid: str):
+        """Awaitable version of
+        :func:`~badgrclient.badgrclient.BadgrClient.resolve_badge_name`
+        """
+        eid = self._indexed_badge_eid(badge_name, issuer_eid)
+        if eid or not self._should_resolve(badge_name, issuer_eid):
+            return eid
+
+        loads = self._badge_loads.get(issuer_eid, 0)
+        async with self._badge_load_lock(issuer_eid):
+            # Skip the load if another task did it while we waited
+            if self._badge_loads.get(issuer_eid, 0) == loads:
+                await self.load_badge_names(issuer_eid)
+                self._badge_loads[issuer_eid] = loads + 1
+
+        return self._indexed_badge_eid(badge_name, issuer_eid)
+
+    def _badge_load_lock(self, issuer_eid: str) -> asyncio.Lock:
+        """Get the lock serializing lazy loads of an issuer's badges"""
+        lock = self._badge_load_locks.get(issuer_eid)
+        if lock is None:
+            lock = self._badge_load_locks[issuer_eid] = asyncio.Lock()
+
+        return lock
+
+    async def fetch_tokens(self):
+        """Get a list of access tokens for authenticated user"""
+
+        response = await self._call_api("/v2/auth/tokens")
+        return response["result"]
+
+    async def fetch_assertion(self, eid=None) -> Sequence[AsyncAssertion]:
+        """
+        Get Assertion of the specified entityId, if eid is not provided
+        then get a list of Assertions in authenticated user's backpack
+
+        Args:
+            eid (string, optional): entityId of the entity to fetch. Defaults to None.
+        """
+        if eid:
+            result = await self._fetch_result(
+                self._assertion_ep(eid), AsyncAssertion.ENTITY_TYPE, eid
+            )
+        else:
+            result = (await self._call_api(self._assertion_ep()))["result"]
+
+        return self._deserialize(result)
+
+    def iter_backpack_assertions(
+        self, page_size: int = 100, prefetch: int = 0
+    ) -> AsyncIterator[AsyncAssertion]:
+        """
+        Iterate over the Assertions in authenticated user's backpack with
+        ``async for``, fetching them page by page
+
+        Args:
+            page_size (int, optional): Number of assertions per request.
+                Defaults to 100.
+            prefetch (int, optional): Number of pages to fetch in a background
+                task while the current one is processed. Defaults to 0.
+        """
+        return self._iter_models(
+            self._assertion_ep(), page_size=page_size, prefetch=prefetch
+        )
+
+    async def fetch_badgeclass(self, eid=None) -> Sequence[AsyncBadgeClass]:
+        """
+        Get BadgeClass of the specified entityId, if eid is not provided
+        then get a list of BadgeClasses for authenticated user
+
+        Args:
+            eid (string, optional): entityId of the entity to fetch. Defaults to None.
+        """
+        return await self._fetch_id_or_self(
+            AsyncBadgeClass.ENDPOINT, eid, AsyncBadgeClass.ENTITY_TYPE
+        )
+
+    async def fetch_issuer(self, eid=None) -> Sequence[AsyncIssuer]:
+        """
+        Get Issuer of the specified entityId, if eid is not provided
+        then get a list of Issuers for authenticated user
+
+        Args:
+            eid (string, optional): entityId of the entity to fetch. Defaults to None.
+        """
+        return await self._fetch_id_or_self(
+            AsyncIssuer.ENDPOINT, eid, AsyncIssuer.ENTITY_TYPE
+        )
+
+    async def fetch_collection(self, eid=None):
+        """
+        Get Collection of the specified entityId, if eid is not provided
+        then get a list of collections for authenticated user
+
+        Args:
+            eid (string, optional): entityId of the entity to fetch. Defaults to None.
+        """
+        return await self._fetch_id_or_self("/v2/backpack/collections", eid)
+
+    async def revoke_assertions(
+        self, ids: List[str], reason="Revoked by badgerclient"
+    ):
+        """Revoke multiple assertions
+
+        Args:
+            ids (list): List of entityIds of Assertionsto revoke
+            reason (string): Revocation reason, defaults to 'Revoked by badgerclient'
+        """
+        payload = self._revoke_payload(ids, reason)
+
+        response = await self._call_api(
+            "/v2/assertions/revoke", "POST", data=payload, idempotent=True
+        )
+
+        for eid in ids:
+            self._invalidate(AsyncAssertion.ENTITY_TYPE, eid)
+
+        self._discard_revoked(ids, response)
+
+        return response
+
+    async def _claim_recipient(self, badge_eid: str, recipient_email: str):
+        """Awaitable version of
+        :func:`~badgrclient.badgrclient.BadgrClient._claim_recipient`
+        """
+        index = self.recipient_index
+        if index is None:
+            return
+
+        if not index.loaded(badge_eid):
+            lock = self._recipient_load_locks.get(badge_eid)
+            if lock is None:
+                lock = self._recipient_load_locks[badge_eid] = asyncio.Lock()
+
+            async with lock:
+                if not index.loaded(badge_eid):
+                    badge = AsyncBadgeClass(self, badge_eid)
+                    index.load(badge_eid, [a async for a in badge.iter_assertions()])
+
+        self._check_claim(badge_eid, recipient_email)
+
+    @traced
+    async def revoke_many(
+        self,
+        ids: Iterable[str],
+        reason="Revoked by badgerclient",
+        chunk_size: int = 100,
+        concurrency: int = 4,
+    ) -> List[RevokeResult]:
+        """Revoke many assertions, in chunks sent concurrently, see
+        :func:`~badgrclient.badgrclient.BadgrClient.revoke_many`
+        """
+        ids = list(ids)
+        results = {}
+        # Created here so it belongs to the running loop
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def revoke(chunk):
+            try:
+                async with semaphore:
+                    response = await self.revoke_assertions(chunk, reason)
+            except Exception as err:
+                if len(chunk) == 1 or not is_rejection(err):
+                    results.update(revoke_errors(chunk, err))
+                    return
+
+                await asyncio.gather(
+                    *(revoke(half) for half in chunks(chunk, (len(chunk) + 1) // 2))
+                )
+                return
+
+            results.update(revoke_results(chunk, response))
+
+        await asyncio.gather(*(revoke(chunk) for chunk in chunks(ids, chunk_size)))
+
+        return [results[eid] for eid in ids]
+
+    @traced
+    async def issue_many(
+        self,
+        recipients: Iterable[Tuple[str, Union[str, dict]]],
+        concurrency: int = 8,
+        journal: IssuanceJournal = None,
+        **kwargs
+    ) -> List[IssueResult]:
+        """Issue badges to many recipients with at most concurrency
+        requests in flight, see
+        :func:`~badgrclient.badgrclient.BadgrClient.issue_many`
+        """
+        pairs = list(recipients)
+        results = [None] * len(pairs)
+        jobs = iter(enumerate(pairs))
+
+        async def worker():
+            # Workers share the job iterator so only concurrency tasks exist
+            for i, (badge_eid, recipient) in jobs:
+                results[i] = await self._issue_one(
+                    badge_eid, recipient, kwargs, journal
+                )
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        return results
+
+    async def _issue_one(
+        self, badge_eid: str, recipient, defaults: dict, journal=None
+    ) -> IssueResult:
+        """Issue a badge to a single recipient of issue_many and report the outcome"""
+        kwargs = issue_kwargs(recipient, defaults)
+        email = kwargs.get("recipient_email")
+
+        try:
+            if journal is not None:
+                eid = journal.issued(badge_eid, email)
+                if eid is None and journal.in_doubt(badge_eid, email):
+                    eid = await self._find_issued(badge_eid, email)
+                    if eid:
+                        journal.record_issued(badge_eid, email, eid)
+
+                if eid:
+                    return self._resumed_result(badge_eid, recipient, eid)
+
+                journal.record_intent(badge_eid, email)
+
+            assertion = await AsyncAssertion(self).create(
+                badge_eid=badge_eid, **kwargs
+            )
+        except Exception as err:
+            return self._issue_error(badge_eid, recipient, err, journal)
+
+        if journal is not None:
+            journal.record_issued(badge_eid, email, assertion.entityId)
+
+        return IssueResult(badge_eid, recipient, assertion)
+
+    async def _find_issued(self, badge_eid: str, recipient_email: str):
+        """Look up an unrevoked assertion of a badge to a recipient, see
+        :func:`~badgrclient.badgrclient.BadgrClient._find_issued`
+        """
+        badge = AsyncBadgeClass(self, badge_eid)
+
+        return self._unrevoked_eid(
+            await badge.fetch_assertions(recipient=recipient_email)
+        )
+
+    async def _v1_create_user(
+        self,
+        first_name: str,
+        last_name: str,
+        email: str,
+        password: str,
+        marketing_opt_in: bool = False,
+        agreed_terms_service: bool = True,
+    ):
+        payload = self._v1_user_payload(
+            first_name,
+            last_name,
+            email,
+            password,
+            marketing_opt_in,
+            agreed_terms_service,
+        )
+
+        response = await self._call_api(
+            "/v1/user/profile", "POST", data=payload, auth=False
+        )
+
+        return response
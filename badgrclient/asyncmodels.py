@@ -0,0 +1,356 @@
+from typing import AsyncIterator, Sequence, cast
+from .badgrmodels import Assertion, BadgeClass, Issuer
+from .tracing import traced
+from .util import eid_required
+
+
+class _AsyncBase:
+    """Awaitable versions of the :class:`~badgrclient.badgrmodels.Base` operations.
+    Must be mixed in before the model class it overrides.
+    """
+
+    @traced
+    @eid_required
+    async def delete(self) -> dict:
+        """Delete entity
+
+        Returns:
+            dict: Response dict
+        """
+        ep = self.get_entity_ep()
+        response = await self.client._call_api(ep, "DELETE")
+        self._invalidate()
+
+        return response
+
+    @traced
+    @eid_required
+    async def update(self) -> dict:
+        """Update entity
+
+        Returns:
+            dict: Response dict
+        """
+        ep = self.get_entity_ep()
+        response = await self.client._call_api(ep, "PUT", data=self.data)
+        self._invalidate()
+        # Fetch again to update self
+        await self.fetch()
+        return response
+
+    @traced
+    @eid_required
+    async def fetch(self):
+        """Fetch entity from entityId"""
+        ep = self.get_entity_ep()
+        result = await self.client._fetch_result(
+            ep, self.ENTITY_TYPE, self.entityId
+        )
+
+        self.set_data(result[0])
+
+
+class AsyncAssertion(_AsyncBase, Assertion):
+    @traced
+    async def create(
+        self,
+        recipient_email,
+        badge_eid=None,
+        issuer_eid=None,
+        badge_name=None,
+        narrative=None,
+        evidence=None,
+        expires=None,
+        issued_on=None,
+        notify=True,
+    ) -> "AsyncAssertion":
+        """Issue an Assetion to a single recipient,
+        see :func:`~badgrclient.badgrmodels.Assertion.create`
+        """
+        if not badge_eid and self.client.lazy_badge_names:
+            badge_eid = await self.client.resolve_badge_name(
+                badge_name, issuer_eid
+            )
+
+        badge_eid, ep, payload = self._create_request(
+            recipient_email,
+            badge_eid,
+            issuer_eid,
+            badge_name,
+            narrative,
+            evidence,
+            expires,
+            issued_on,
+            notify,
+        )
+
+        await self.client._claim_recipient(badge_eid, recipient_email)
+        try:
+            response = await self.client._call_api(ep, "POST", data=payload)
+        except Exception:
+            self.client._release_recipient(badge_eid, recipient_email)
+            raise
+
+        return self._on_create(badge_eid, recipient_email, response)
+
+    @traced
+    @eid_required
+    async def revoke(self, reason) -> dict:
+        """Revoke this assertion
+
+        Args:
+            reason (string): Reason of revocation
+
+        Returns:
+            dict: API response dict
+        """
+        ep = Assertion.ENDPOINT + "/{}".format(self.entityId)
+        response = await self.client._call_api(ep, "DELETE")
+        self._invalidate()
+        self.client._discard_recipient(self.entityId, self.data)
+
+        return response
+
+
+class AsyncBadgeClass(_AsyncBase, BadgeClass):
+    @traced
+    async def create(
+        self,
+        name,
+        image,
+        description,
+        issuer_eid,
+        criteria_text=None,
+        criteria_url=None,
+        alignments=None,
+        tags=None,
+        expires=None,
+    ) -> "AsyncBadgeClass":
+        """Create a new badgeclass,
+        see :func:`~badgrclient.badgrmodels.BadgeClass.create`
+        """
+        if self.client.unique_badge_names and self.client.lazy_badge_names:
+            # Load the issuer's badge names so the uniqueness check sees them
+            await self.client.resolve_badge_name(name, issuer_eid)
+
+        payload = self._create_payload(
+            name,
+            image,
+            description,
+            issuer_eid,
+            criteria_text,
+            criteria_url,
+            alignments,
+            tags,
+            expires,
+        )
+
+        response = await self.client._call_api(
+            BadgeClass.ENDPOINT, "POST", data=payload
+        )
+
+        return self._on_create(response)
+
+    @traced
+    @eid_required
+    async def fetch_assertions(
+        self, recipient=None, num=None, query=None
+    ) -> Sequence[AsyncAssertion]:
+        """
+        Get a list of Assertions for this badgeclass
+
+        Args:
+            recipient (string, optional): Filter by recipient
+            num (string, optional): Request pagination
+                of results
+            query (dict, optional): Query params
+        """
+        ep, query = self._assertions_request(recipient, query)
+        response = await self.client._call_api(ep, params=query)
+        result = cast(
+            Sequence[AsyncAssertion], self.client._deserialize(response["result"])
+        )
+        return result
+
+    @eid_required
+    def iter_assertions(
+        self, recipient=None, page_size: int = 100, query=None, prefetch: int = 0
+    ) -> AsyncIterator[AsyncAssertion]:
+        """
+        Iterate over the Assertions of this badgeclass with ``async for``,
+        see :func:`~badgrclient.badgrmodels.BadgeClass.iter_assertions`
+        """
+        ep, query = self._assertions_request(recipient, query)
+
+        return self.client._iter_models(ep, query, page_size, prefetch)
+
+    @traced
+    @eid_required
+    async def issue(
+        self,
+        recipient_email,
+        narrative=None,
+        evidence=None,
+        expires=None,
+        issued_on=None,
+        notify=True,
+    ) -> AsyncAssertion:
+        """Create a new assertion of this badge,
+        see :func:`~badgrclient.badgrmodels.BadgeClass.issue`
+        """
+        new_assertion = await AsyncAssertion(self.client).create(
+            recipient_email=recipient_email,
+            badge_eid=self.entityId,
+            narrative=narrative,
+            evidence=evidence,
+            expires=expires,
+            issued_on=issued_on,
+            notify=notify,
+        )
+
+        return new_assertion
+
+    @traced
+    @eid_required
+    async def issue_many(
+        self, recipients: list, concurrency: int = 8, journal=None, **kwargs
+    ) -> list:
+        """Issue this badge to many recipients concurrently,
+        see :func:`~badgrclient.badgrmodels.BadgeClass.issue_many`
+        """
+        return await self.client.issue_many(
+            [(self.entityId, recipient) for recipient in recipients],
+            concurrency,
+            journal,
+            **kwargs
+        )
+
+
+class AsyncIssuer(_AsyncBase, Issuer):
+    @traced
+    async def create(
+        self, name, description, email, url, image=None
+    ) -> "AsyncIssuer":
+        """Create a new Issuer,
+        see :func:`~badgrclient.badgrmodels.Issuer.create`
+        """
+        payload = {
+            "name": name,
+            "description": description,
+            "email": email,
+            "url": url,
+            "image": image,
+        }
+
+        response = await self.client._call_api(
+            Issuer.ENDPOINT, "POST", data=payload
+        )
+
+        return self._set_result(response)
+
+    @traced
+    @eid_required
+    async def fetch_assertions(self, query=None) -> Sequence[AsyncAssertion]:
+        """Get list of assertions for this issuer
+        Args:
+            query (dict, optional): Query params
+        """
+        ep = Issuer.ENDPOINT + "/{}/assertions".format(self.entityId)
+        response = await self.client._call_api(ep, params=query)
+        result = cast(
+            Sequence[AsyncAssertion], self.client._deserialize(response["result"])
+        )
+
+        return result
+
+    @eid_required
+    def iter_assertions(
+        self, query=None, page_size: int = 100, prefetch: int = 0
+    ) -> AsyncIterator[AsyncAssertion]:
+        """Iterate over the assertions of this issuer with ``async for``,
+        see :func:`~badgrclient.badgrmodels.Issuer.iter_assertions`
+        """
+        ep = Issuer.ENDPOINT + "/{}/assertions".format(self.entityId)
+
+        return self.client._iter_models(ep, query, page_size, prefetch)
+
+    @eid_required
+    async def iter_badgeclasses(
+        self,
+        load_badge_names: bool = True,
+        query=None,
+        page_size: int = 100,
+        prefetch: int = 0,
+    ) -> AsyncIterator[AsyncBadgeClass]:
+        """Iterate over the BadgeClasses of this issuer with ``async for``,
+        see :func:`~badgrclient.badgrmodels.Issuer.iter_badgeclasses`
+        """
+        ep = Issuer.ENDPOINT + "/{}/badgeclasses".format(self.entityId)
+
+        async for page in self.client._iter_pages(
+            ep, query, page_size, prefetch
+        ):
+            for badge in self._on_fetch_badgeclasses(
+                {"result": page}, load_badge_names
+            ):
+                yield badge
+
+    @traced
+    @eid_required
+    async def fetch_badgeclasses(
+        self, load_badge_names: bool = True, query=None
+    ) -> Sequence[AsyncBadgeClass]:
+        """Get a list of BadgeClasses for this issuer,
+        see :func:`~badgrclient.badgrmodels.Issuer.fetch_badgeclasses`
+        """
+        ep = Issuer.ENDPOINT + "/{}/badgeclasses".format(self.entityId)
+        response = await self.client._call_api(ep, params=query)
+
+        return self._on_fetch_badgeclasses(response, load_badge_names)
+
+    @traced
+    @eid_required
+    async def create_badgeclass(
+        self,
+        name,
+        image,
+        description,
+        criteria_text=None,
+        criteria_url=None,
+        alignment=None,
+        tags=None,
+        expires=None,
+    ) -> AsyncBadgeClass:
+        """Create a badgeclass for this issuer,
+        see :func:`~badgrclient.badgrmodels.Issuer.create_badgeclass`
+        """
+        badge_class = await AsyncBadgeClass(self.client).create(
+            name,
+            image,
+            description,
+            self.entityId,
+            criteria_text,
+            criteria_url,
+            alignment,
+            tags,
+            expires,
+        )
+
+        return badge_class
+
+    @traced
+    @eid_required
+    async def edit_staff(self, action: str, email: str, role: str) -> dict:
+        """Edit the staff list of this issuer,
+        see :func:`~badgrclient.badgrmodels.Issuer.edit_staff`
+        """
+        payload = self._staff_payload(action, email, role)
+
+        response = await self.client._call_api(
+            Issuer.V1_ENDPOINT.format(slug=self.entityId), "POST", data=payload
+        )
+
+        self._invalidate()
+        await self.fetch()
+
+        return response
@@ -1,21 +1,45 @@
-import requests
 import logging
 import datetime
-import base64
+import threading
+import time
+import weakref
 from .badgrmodels import (
     Assertion,
     BadgeClass,
     Issuer,
 )
-from typing import List, Union
-from .exceptions import APIError, BadgrClientError
-
-from os.path import join, dirname
-from dotenv import load_dotenv
-from os import getenv
-
-dotenv_path = join(dirname(__file__), '.env')
-load_dotenv(dotenv_path)
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Sequence, Tuple, Union
+from .bulk import (
+    IssueResult,
+    RevokeResult,
+    chunks,
+    is_rejection,
+    issue_kwargs,
+    revoke_errors,
+    revoke_results,
+)
+from .cache import EntityCache
+from .codec import JSON_HEADERS, JSONCodec, default_codec
+from .nameindex import BadgeNameIndex
+from .exceptions import APIError, BadgrClientError, DuplicateAssertionError
+from .image import ImageFile, JSONStream, has_image_file
+from .image import IMAGE_MIME_TYPES  # noqa: F401 (moved, kept importable from here)
+from .journal import IssuanceJournal
+from .metrics import RequestEvent
+from .tracing import start_span, traced
+from .recipients import RecipientIndex, recipient_identity
+from .results import LazyResult
+from .tokenstore import TokenStore, token_key
+from .retry import RetryPolicy
+from .env import env_credentials
+from .util import prefetch as prefetch_pages
+
+if TYPE_CHECKING:
+    # requests is imported when the first session is created, to keep
+    # importing the client fast
+    import requests
+    from .ratelimit import RateLimiter
 
 MODELS = {
     "Assertion": Assertion,
@@ -23,15 +47,31 @@ MODELS = {
     "Issuer": Issuer,
 }
 
-IMAGE_MIME_TYPES = {
-    "svg": "image/svg+xml",
-    "png": "image/png",
-}
-
 Logger = logging.getLogger("badgrclient")
 
 
+def _background_refresh(client_ref: weakref.ref):
+    """Renew the token of a client with auto_refresh enabled
+
+    Args:
+        client_ref (weakref.ref): Reference to the client
+    """
+    client = client_ref()
+    if client is None:
+        return
+
+    try:
+        client._refresh_auth_token(client._auto_refresh_skew())
+    except Exception as err:
+        # Requests will refresh the token themselves once it expires
+        Logger.error("Background token renewal failed: {}".format(err))
+
+
 class BadgrClient:
+
+    # Model classes used to deserialize results, keyed by entityType
+    MODELS = MODELS
+
     def __init__(
         self,
         username: str,
@@ -42,6 +82,25 @@ class BadgrClient:
         token: str = None,
         refresh_token: str = None,
         unique_badge_names: bool = False,
+        auto_refresh: bool = False,
+        refresh_skew: float = 60,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: int = None,
+        session=None,
+        adapter=None,
+        retry: RetryPolicy = None,
+        rate_limiter: "RateLimiter" = None,
+        cache: EntityCache = None,
+        badge_name_index: BadgeNameIndex = None,
+        lazy_badge_names: bool = False,
+        badge_name_miss_ttl: float = 30,
+        json_codec: JSONCodec = None,
+        recipient_index: RecipientIndex = None,
+        request_hooks: list = None,
+        tracer=None,
+        token_store: TokenStore = None,
     ):
         """
         Initalize a new client
@@ -56,6 +115,58 @@ class BadgrClient:
             refresh_token (str): Refresh token to use for auth. Defaults to None.
             unique_badge_names (str): Declares that badge_names per issuer are unique and
                 can be used as a unique identifier for operations.
+            auto_refresh (bool): Renew the token in the background before it
+                expires. Defaults to False.
+            refresh_skew (float): Seconds before expiry at which auto_refresh renews
+                the token, at most half the token's lifetime. Defaults to 60.
+            pool_connections (int): Number of hosts to keep connection pools for.
+                Defaults to 10.
+            pool_maxsize (int): Maximum number of connections kept per host, size
+                it to the number of threads sharing the client. Defaults to 10.
+            pool_block (bool): Wait for a free connection when the pool is
+                exhausted instead of opening a throwaway one. Defaults to False.
+            tcp_keepalive (int): Enable TCP keep-alive probes on pooled
+                connections after this many idle seconds. Defaults to None.
+            session (requests.Session): Externally managed session to send
+                requests with, the pool options are ignored. Defaults to None.
+            adapter (requests.adapters.HTTPAdapter): Transport adapter to mount
+                on the client's session, share one between clients to share
+                its pool. It's left open when the client is closed.
+                Defaults to None.
+            retry (RetryPolicy): Policy to retry transient errors (429, 502, 503,
+                connection errors...) with. Defaults to None (don't retry).
+            rate_limiter (RateLimiter): Limiter to pace requests with, share it
+                between clients to share its budget. Defaults to None.
+            cache (EntityCache): Cache for single entity fetches, invalidated by
+                the client's own writes. Defaults to None.
+            badge_name_index (BadgeNameIndex): Index to keep badge names in when
+                unique_badge_names is enabled, e.g. a SQLiteBadgeNameIndex that
+                persists between processes. Defaults to an in-memory index.
+            lazy_badge_names (bool): Load an issuer's badges into the index the
+                first time one of its badge names isn't found, instead of
+                requiring load_badge_names beforehand. Defaults to False.
+            badge_name_miss_ttl (float): Seconds after loading an issuer's badges
+                during which names missing from the index are reported missing
+                instead of loading the issuer again with lazy_badge_names.
+                Defaults to 30.
+            json_codec (JSONCodec): Codec to encode request and decode response
+                bodies with. Defaults to orjson if it's installed, the standard
+                library json module otherwise.
+            recipient_index (RecipientIndex): Index of each badgeclass's
+                recipients, loaded the first time the badgeclass is issued, to
+                refuse issuing it twice to a recipient. Defaults to None.
+            request_hooks (list): Callables called with a
+                :class:`~badgrclient.metrics.RequestEvent` after every request,
+                e.g. a MetricsAggregator or PrometheusMetrics. Defaults to None.
+            tracer (opentelemetry.trace.Tracer): Tracer to record spans of model
+                operations, token requests and API requests with. Defaults to
+                None (no tracing).
+            token_store (TokenStore): Store to share access tokens with other
+                clients, e.g. a FileTokenStore shared between processes. A
+                stored token that is still valid is reused instead of logging
+                in, and refreshes are done by one client at a time. A stored
+                token the server rejects is deleted and the request sent again
+                once after authenticating. Defaults to None.
 
         Note:
             Enabling unique_badge_names declares that badge names can be used as a unique
@@ -67,22 +178,58 @@ class BadgrClient:
             If unique_badge_names is set to True call
             :func:`~badgrclient.badgrclient.BadgrClient.load_badge_names` to load badges
             of a particular issuer into the index or only badges you create will get
-            registered in the client's badge name index
+            registered in the client's badge name index, unless lazy_badge_names
+            is enabled
 
         """
-        self.session = requests.session()
+        self._pool_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "tcp_keepalive": tcp_keepalive,
+            "adapter": adapter,
+        }
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session()
         self.header = {}
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.json_codec = json_codec or default_codec()
+        self.recipient_index = recipient_index
+        self.request_hooks = list(request_hooks or [])
+        self.tracer = tracer
+        self.token_store = token_store
+        # Key of the token in the token store, set on login
+        self._token_key = None
         self.refresh_token = refresh_token
         self.token_expires_at = None
         self.scope = scope
         self.client_id = client_id
         self.base_url = base_url
         self.unique_badge_names = unique_badge_names
+        # Serializes token refreshes between threads sharing this client
+        self._token_lock = threading.Lock()
+        self.auto_refresh = auto_refresh
+        self.refresh_skew = refresh_skew
+        self._refresh_timer = None
+        # Set by close, so a renewal in flight doesn't schedule another one
+        self._closed = False
+        self._refresh_lock = threading.Lock()
+        # Lifetime of the current token in seconds, when it was received
+        self._token_lifetime = None
 
         if self.unique_badge_names:
-            # Make a dictonary to keep track of badgenames and entity IDs
-            # for each issuer
-            self.badge_names = {}
+            # Keep track of badgenames and entity IDs for each issuer
+            self.badge_names = badge_name_index or BadgeNameIndex()
+
+        self.lazy_badge_names = lazy_badge_names
+        self.badge_name_miss_ttl = badge_name_miss_ttl
+        # Number of lazy loads per issuer, and a lock per issuer so concurrent
+        # misses share a single load
+        self._badge_loads = {}
+        self._badge_load_locks = {}
+        self._badge_load_locks_lock = threading.Lock()
 
         if token:
             if not refresh_token:
@@ -93,10 +240,133 @@ class BadgrClient:
                 )
             self.header = {"Authorization": "Bearer {}".format(token)}
         else:
+            self._login(username, password)
+
+    def _create_session(self):
+        """Create the HTTP session used to call the API with the pool options"""
+        import requests
+        from .transport import PoolAdapter, keepalive_socket_options
+
+        session = requests.session()
+        options = self._pool_options
+        adapter = options["adapter"]
+
+        if adapter is None:
+            socket_options = None
+            if options["tcp_keepalive"]:
+                socket_options = keepalive_socket_options(options["tcp_keepalive"])
+
+            adapter = PoolAdapter(
+                socket_options=socket_options,
+                pool_connections=options["pool_connections"],
+                pool_maxsize=options["pool_maxsize"],
+                pool_block=options["pool_block"],
+            )
+
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+    def close(self):
+        """Stop background token renewal and close the session if it's owned
+        by this instance
+        """
+        with self._refresh_lock:
+            self._closed = True
+            self._cancel_refresh()
+
+        if self._owns_session:
+            self._unmount_adapter()
+            self.session.close()
+
+    def _unmount_adapter(self):
+        """Unmount an adapter passed to the client before closing its session,
+        closing it would drop the pool of the other clients sharing it
+        """
+        adapter = self._pool_options["adapter"]
+        if adapter is None:
+            return
+
+        for prefix, mounted in list(self.session.adapters.items()):
+            if mounted is adapter:
+                del self.session.adapters[prefix]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _login(self, username: str, password: str):
+        """Authenticate with username and password on client creation
+
+        Args:
+            username (str): Badgr username
+            password (str): Badgr password
+        """
+        if self.token_store is None:
             self._get_auth_token(username, password)
+            return
+
+        username, password = self._login_credentials(username, password)
+        if self._load_stored_token():
+            return
+
+        with self.token_store.lock(self._token_key):
+            # Another client may have logged in while we were waiting
+            if not self._load_stored_token():
+                self._get_auth_token(username, password)
+
+    def _login_credentials(self, username: str, password: str) -> tuple:
+        """Resolve the credentials of a login with a token store, and the key
+        its token is stored under
+
+        Returns:
+            tuple: The username and password
+        """
+        if username is None and password is None:
+            username, password = env_credentials()
+
+        self._token_key = token_key(self.base_url, self.client_id, username, self.scope)
+
+        return username, password
+
+    def _load_stored_token(self, skew: float = 0) -> bool:
+        """Use the token of the token store if it's valid for at least skew
+        seconds. Otherwise take its refresh token, the latest one issued to
+        any client.
+
+        Returns:
+            bool: Whether the stored token is used
+        """
+        if self.token_store is None or self._token_key is None:
+            return False
+
+        token = self.token_store.get(self._token_key)
+        if not token:
+            return False
+
+        if not self.token_store.valid(token, skew):
+            self.refresh_token = token.get("refresh_token") or self.refresh_token
+            return False
+
+        self._use_token(
+            token["access_token"],
+            token.get("refresh_token"),
+            datetime.datetime.fromtimestamp(token["expires_at"]),
+        )
+
+        return True
 
     def _call_api(
-        self, endpoint, method="GET", params=None, data=None, auth=True
+        self,
+        endpoint,
+        method="GET",
+        params=None,
+        data=None,
+        auth=True,
+        idempotent=False,
     ) -> dict:
         """Method used to call the API.
         It returns the raw JSON returned by the API or raises an exception
@@ -110,57 +380,376 @@ class BadgrClient:
             params: the params to specify to a GET request
             data: the data to send to a POST request
             auth: Wether authorization is required
+            idempotent: Wether the request can be retried whatever its method
+        """
+        req = self._request(endpoint, method, params, data, auth, idempotent)
+
+        response = self._get_json(req)
+
+        return response
+
+    def _request(
+        self,
+        endpoint,
+        method="GET",
+        params=None,
+        data=None,
+        auth=True,
+        idempotent=False,
+        headers=None,
+    ) -> "requests.Response":
+        """Send a request to the API and return the raw response, retrying
+        transient errors as allowed by the retry policy,
+        see :func:`~badgrclient.badgrclient.BadgrClient._call_api`
+
+        Args:
+            endpoint: the endpoint to call, or an absolute url (e.g. a next page link)
+            headers: extra headers to send
+        """
+        if not self._instrumented():
+            return self._send(
+                None, endpoint, method, params, data, auth, idempotent, headers
+            )
+
+        event = RequestEvent(method, endpoint)
+
+        with start_span(self, "{} {}".format(method, event.endpoint)) as span:
+            try:
+                req = self._send(
+                    event, endpoint, method, params, data, auth, idempotent, headers
+                )
+            except Exception as err:
+                self._emit(event, span, error=err)
+                raise
+
+            self._emit(event, span, req)
+
+        return req
+
+    def _send(
+        self, event, endpoint, method, params, data, auth, idempotent, headers
+    ) -> "requests.Response":
+        """Send a request, retrying it as allowed by the retry policy,
+        see :func:`~badgrclient.badgrclient.BadgrClient._request`
+
+        Args:
+            event (RequestEvent): Event recording the request for request_hooks
+                and the tracer, None if there are neither
+        """
+        import requests
+
+        attempt = 0
+        reauthenticated = False
+        body, headers = self._encode_body(data, headers)
+        if event is not None:
+            event.bytes_sent = len(body) if body else 0
+
+        while True:
+            if auth and self._token_expired():
+                self._refresh_auth_token()
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, endpoint)
+
+            req, error = None, None
+            try:
+                req = self.session.request(
+                    method=method,
+                    url=self._get_url(endpoint),
+                    params=params,
+                    headers=self._get_headers(auth, headers),
+                    data=body,
+                    verify=True,
+                )
+            except (requests.ConnectionError, requests.Timeout) as err:
+                if self.retry is None:
+                    raise
+                error = err
+
+            if auth and not reauthenticated and self._token_rejected(req):
+                reauthenticated = True
+                continue
+
+            delay = None
+            if self.retry is not None:
+                delay = self.retry.get_retry_delay(
+                    method, attempt, idempotent, req, error
+                )
+
+            if delay is None:
+                if error is not None:
+                    raise error
+                return req
+
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+            Logger.warning(
+                "Retrying {} {} in {:.2f}s (retry {})".format(
+                    method, endpoint, delay, attempt
+                )
+            )
+            time.sleep(delay)
+
+    def _instrumented(self) -> bool:
+        """Whether requests are recorded, by request_hooks or a tracer"""
+        return bool(self.request_hooks) or self.tracer is not None
+
+    def _emit(
+        self, event: RequestEvent, span=None, response=None, error: Exception = None
+    ):
+        """Complete a request's event, add it to its span and pass it to
+        the request_hooks
+        """
+        if not self.request_hooks and span is None:
+            return
+
+        event.finish(response, error, self._ttfb(response))
+
+        if span is not None:
+            span.set_attributes(event.span_attributes())
+
+        for hook in self.request_hooks:
+            try:
+                hook(event)
+            except Exception as err:
+                # Instrumentation must not break requests
+                Logger.error("Request hook {} failed: {}".format(hook, err))
+
+    @staticmethod
+    def _ttfb(response):
+        """Seconds until the response headers were received"""
+        if response is None:
+            return None
+
+        return response.elapsed.total_seconds()
+
+    def _get_url(self, endpoint: str) -> str:
+        """Get the url of an endpoint, absolute urls are returned as is"""
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
+
+        return self.base_url + endpoint
+
+    def _iter_pages(
+        self, endpoint, params=None, page_size: int = 100, prefetch: int = 0
+    ) -> Iterator[list]:
+        """Call a list endpoint page by page, following the cursor in
+        the Link header of each response
+
+        Args:
+            endpoint: the endpoint to call
+            params: the query params of the first page
+            page_size (int): Number of entities per page
+            prefetch (int): Number of pages to fetch in the background ahead of
+                the caller. Defaults to 0 (fetch a page when it's needed)
+        """
+        pages = self._fetch_pages(endpoint, params, page_size)
+
+        if prefetch:
+            return prefetch_pages(pages, prefetch)
+
+        return pages
+
+    def _fetch_pages(self, endpoint, params, page_size: int) -> Iterator[list]:
+        """Generate the pages of a list endpoint,
+        see :func:`~badgrclient.badgrclient.BadgrClient._iter_pages`
+        """
+        params = dict(params or {}, num=page_size)
+
+        while endpoint:
+            req = self._request(endpoint, params=params)
+            response = self._get_json(req)
+
+            yield response["result"]
+
+            # The next link already carries the query params
+            endpoint = self._next_page_url(req)
+            params = None
+
+    @staticmethod
+    def _next_page_url(req):
+        """Get the url of the next page from the Link header of a response"""
+        next_link = req.links.get("next")
+
+        return next_link["url"] if next_link else None
+
+    def _iter_models(
+        self, endpoint, params=None, page_size: int = 100, prefetch: int = 0
+    ) -> Iterator[Union[BadgeClass, Assertion, Issuer]]:
+        """Iterate over the models of a list endpoint, deserializing a page
+        at a time
+
+        Args:
+            endpoint: the endpoint to call
+            params: the query params of the first page
+            page_size (int): Number of entities per page
+            prefetch (int): Number of pages to fetch ahead in the background
+        """
+        for page in self._iter_pages(endpoint, params, page_size, prefetch):
+            yield from self._deserialize(page)
+
+    def _encode_body(self, data, headers: dict = None):
+        """Encode the JSON body of a request with the client's codec
+
+        Args:
+            data: The body to encode, None if the request has none
+            headers (dict): Additional headers for this request
+
+        Returns:
+            tuple: The encoded body and the headers to send it with
+        """
+        if data is None:
+            return None, headers
+
+        if has_image_file(data):
+            body = JSONStream(data, self.json_codec)
+            headers = dict(headers or {}, **JSON_HEADERS)
+            headers["Content-Length"] = str(len(body))
+
+            return body, headers
+
+        return self.json_codec.dumps(data), dict(headers or {}, **JSON_HEADERS)
+
+    def _get_headers(self, auth: bool = True, extra: dict = None) -> dict:
+        """Get the headers to send with a request
+
+        Args:
+            auth (bool): Wether authorization is required
+            extra (dict): Additional headers for this request
+        """
+        header = dict(self.header, **(extra or {}))
+
+        if not auth:
+            header.pop("Authorization", None)
+
+        return header
+
+    def _token_expired(self, skew: int = 0) -> bool:
+        """Check if the current token has expired
+
+        Args:
+            skew (int): Consider the token expired this many seconds early
         """
-        if auth and self.token_expires_at:
-            if self.token_expires_at < datetime.datetime.now():
+        return bool(
+            self.token_expires_at
+            and self.token_expires_at - datetime.timedelta(seconds=skew)
+            < datetime.datetime.now()
+        )
+
+    def _token_rejected(self, response) -> bool:
+        """Whether the server rejected a token shared through the token store,
+        e.g. revoked by another client. The token is then deleted from the store,
+        unless it was replaced meanwhile, and the request should be sent again
+        after authenticating once more.
+        """
+        if response is None or response.status_code != 401:
+            return False
+
+        if self.token_store is None or self._token_key is None:
+            return False
+
+        token = self.token_store.get(self._token_key)
+        if token and self.header == {"Authorization": "Bearer " + token["access_token"]}:
+            self.token_store.delete(self._token_key)
+
+        self.token_expires_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+
+        return True
+
+    def _refresh_auth_token(self, skew: int = 0):
+        """Refresh the expired token. Only one thread refreshes at a time,
+        the others wait for it and reuse the refreshed token
+
+        Args:
+            skew (int): Refresh if the token expires within this many seconds
+        """
+        with self._token_lock:
+            # Another thread refreshed the token while we were waiting
+            if not self._token_expired(skew):
+                return
+
+            if self.token_store is None or self._token_key is None:
                 self._get_auth_token()
+                return
+
+            with self.token_store.lock(self._token_key):
+                # Another client or process may have refreshed it already
+                if not self._load_stored_token(skew):
+                    self._get_auth_token()
 
-        url = self.base_url + endpoint
-        header = self.header
+    def _auto_refresh_skew(self) -> float:
+        """Seconds before expiry at which auto_refresh renews the token. Capped
+        at half the token's lifetime, or a token living less than refresh_skew
+        would be renewed again as soon as it's received.
+        """
+        if self._token_lifetime is None:
+            return self.refresh_skew
 
-        if not auth and "Authorization" in header:
-            header.pop("Authorization")
+        return min(self.refresh_skew, self._token_lifetime / 2)
 
-        req = self.session.request(
-            method=method,
-            url=url,
-            params=params,
-            headers=self.header,
-            json=data,
-            verify=True,
+    def _refresh_delay(self) -> float:
+        """Seconds until auto_refresh should renew the token"""
+        renew_at = self.token_expires_at - datetime.timedelta(
+            seconds=self._auto_refresh_skew()
         )
 
-        response = self._get_json(req)
+        return max((renew_at - datetime.datetime.now()).total_seconds(), 0)
 
-        return response
+    def _schedule_refresh(self):
+        """Schedule the background renewal of the current token, unless the
+        client was closed
+        """
+        with self._refresh_lock:
+            if self._closed:
+                return
 
-    @staticmethod
-    def _get_json(req):
+            self._cancel_refresh()
+
+            # Only keep a weak reference so the timer doesn't keep the client alive
+            timer = threading.Timer(
+                self._refresh_delay(), _background_refresh, args=(weakref.ref(self),)
+            )
+            timer.daemon = True
+            timer.start()
+            self._refresh_timer = timer
+
+    def _cancel_refresh(self):
+        """Cancel the scheduled background renewal, if any"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    def _get_json(self, req):
         """
-        Get json from response
+        Get json from response, decoded from the raw body with the client's codec
         """
         response = None
         try:
-            response = req.json()
+            response = self.json_codec.loads(req.content)
         except Exception as err:
             Logger.debug(req.text)
-            raise APIError("Error while decoding JSON: {0}".format(err))
+            raise APIError(
+                "Error while decoding JSON: {0}".format(err), req.status_code
+            )
 
         if req.status_code >= 300:
             Logger.error(response)
             if "error" in response:
-                raise APIError(response["error"])
+                raise APIError(response["error"], req.status_code)
 
         if "status" in response:
             if not response["status"]["success"]:
                 Logger.error(response)
                 if "description" in response["status"]:
-                    raise APIError(response["status"]["description"])
+                    raise APIError(
+                        response["status"]["description"], req.status_code
+                    )
 
         return response
 
-    def _get_auth_token(self, username=getenv('BADGR_USERNAME'),
-                        password=getenv('BADGR_PASSWORD')):
+    @traced
+    def _get_auth_token(self, username=None, password=None):
         """Fetches token and sets header for api calls. Uses refresh_token
         if username and password isn't provided
 
@@ -168,10 +757,28 @@ class BadgrClient:
             username (string): Badgr username
             password (string): Badgr password
         Note:
-            By-default reads .env file for BADGR_USERNAME and BADGR_PASSWORD
+            Defaults to the BADGR_USERNAME and BADGR_PASSWORD environment
+            variables, read on every call. Call :func:`~badgrclient.env.load_env`
+            first to load them from a .env file.
         """
+        if username is None and password is None:
+            username, password = env_credentials()
+
         now = datetime.datetime.now()
+        payload = self._token_payload(username, password)
+
+        req = self.session.post(self.base_url + "/o/token", data=payload)
+
+        self._set_token(self._get_json(req), now)
 
+    def _token_payload(self, username=None, password=None) -> dict:
+        """Build the payload for the token endpoint. Uses refresh_token
+        if username and password isn't provided
+
+        Args:
+            username (string): Badgr username
+            password (string): Badgr password
+        """
         payload = {
             "client_id": self.client_id,
         }
@@ -188,50 +795,141 @@ class BadgrClient:
             payload["grant_type"] = "refresh_token"
             self.refresh_token = None
 
-        req = requests.post(self.base_url + "/o/token", data=payload)
+        return payload
 
-        response = self._get_json(req)
+    def _set_token(self, response: dict, requested_at: datetime.datetime):
+        """Store the token from a token endpoint response
+
+        Args:
+            response (dict): Token endpoint response
+            requested_at (datetime): When the token was requested
+        """
+        expires_at = requested_at + datetime.timedelta(seconds=response["expires_in"])
+        self._use_token(response["access_token"], response["refresh_token"], expires_at)
+
+        if self.token_store is not None and self._token_key is not None:
+            self.token_store.set(
+                self._token_key,
+                {
+                    "access_token": response["access_token"],
+                    "refresh_token": response["refresh_token"],
+                    "expires_at": expires_at.timestamp(),
+                },
+            )
 
-        self.token_expires_at = now + datetime.timedelta(
-            seconds=response["expires_in"]
+    def _use_token(
+        self, access_token: str, refresh_token: str, expires_at: datetime.datetime
+    ):
+        """Authenticate the next requests with a token"""
+        self.token_expires_at = expires_at
+        self._token_lifetime = max(
+            (expires_at - datetime.datetime.now()).total_seconds(), 0
         )
-        self.refresh_token = response["refresh_token"]
-        self.header = {"Authorization": "Bearer " + response["access_token"]}
+        self.refresh_token = refresh_token
+        self.header = {"Authorization": "Bearer " + access_token}
 
-    def _deserialize(
-        self, result: list
-    ) -> List[Union[BadgeClass, Assertion, Issuer]]:
+        if self.auto_refresh:
+            self._schedule_refresh()
+
+    def _deserialize(self, result: list) -> LazyResult:
         """
-            Get the appropriate model instances list from result list
+            Get the appropriate model instances list from result list, models
+            are only built when accessed
 
         Args:
             result: The result in the payload
         """
-        return_value = []
-
-        for i in result:
-            entityType = i["entityType"]
-            if MODELS[entityType]:
-                return_value.append(MODELS[entityType](self).set_data(i))
-            else:
-                return_value.append(i)
+        return LazyResult(self, result)
 
-        return return_value
-
-    def _fetch_id_or_self(self, endpoint, eid):
+    def _fetch_id_or_self(self, endpoint, eid, entity_type=None):
         """Appends entityId to endpoint if provided and calls it
 
         Args:
             endpoint (string): Endpoint to call
             eid ([type]): entityId
+            entity_type (string, optional): entityType of the entity, to look it
+                up in the cache
         """
         if eid:
             ep = endpoint + "/{}".format(eid)
-            response = self._call_api(ep)
+            result = self._fetch_result(ep, entity_type, eid)
         else:
-            response = self._call_api(endpoint)
+            result = self._call_api(endpoint)["result"]
+
+        return self._deserialize(result)
+
+    def _fetch_result(self, endpoint, entity_type=None, eid=None) -> list:
+        """Call endpoint and get its result list. Single entities are served
+        from the cache when it's enabled for their entity_type
+
+        Args:
+            endpoint (string): Endpoint of a single entity
+            entity_type (string, optional): entityType of the entity
+            eid (string, optional): entityId of the entity
+        """
+        cache = self.cache
+        if cache is None or not cache.caches(entity_type):
+            return self._call_api(endpoint)["result"]
 
-        return self._deserialize(response["result"])
+        body = cache.get(entity_type, eid)
+        if body is not None:
+            return self._cached_result(body)
+
+        req = self._request(
+            endpoint, headers=cache.get_validators(entity_type, eid)
+        )
+        if req.status_code == 304:
+            body = cache.revalidate(entity_type, eid)
+            if body is not None:
+                return self._cached_result(body)
+
+            # Evicted since we sent the validators
+            req = self._request(endpoint)
+
+        return self._cache_result(req, entity_type, eid)
+
+    def _cache_result(self, req, entity_type: str, eid: str) -> list:
+        """Get the result list of a single entity response and cache its body
+        along with its validators
+        """
+        result = self._get_json(req)["result"]
+
+        if result:
+            self.cache.set(
+                entity_type,
+                eid,
+                req.content,
+                req.headers.get("ETag"),
+                req.headers.get("Last-Modified"),
+            )
+
+        return result
+
+    def _cached_result(self, body: bytes) -> list:
+        """Decode the result list of a cached response body, so every hit gets
+        its own data
+        """
+        return self.json_codec.loads(body)["result"]
+
+    def _invalidate(self, entity_type: str, eid: str):
+        """Drop an entity from the cache after it was written to
+
+        Args:
+            entity_type (string): entityType of the entity
+            eid (string): entityId of the entity
+        """
+        if self.cache is not None and eid:
+            self.cache.invalidate(entity_type, eid)
+
+    def _save_badge_names(self, badges: Sequence[BadgeClass]):
+        """
+        Add badges to their issuers list
+
+        Args:
+            badges (list): Badges to save
+        """
+        for badge in badges:
+            self._save_badge_name(badge)
 
     def _save_badge_name(self, badge: BadgeClass):
         """
@@ -240,6 +938,18 @@ class BadgrClient:
         Args:
             badge (BadgeClass): Badge to save
         """
+        entry = self._badge_name_entry(badge)
+
+        if entry:
+            self.badge_names.add(*entry)
+
+    @staticmethod
+    def _badge_name_entry(badge: BadgeClass):
+        """Get the (issuer_eid, badge_name, eid) of a badge to index
+
+        Args:
+            badge (BadgeClass): Badge to index
+        """
         eid = badge.entityId
         badge_name = badge.data.get("name", None)
         issuer_eid = badge.data.get("issuer", None)
@@ -251,27 +961,62 @@ class BadgrClient:
                     badge
                 )
             )
-            return
+            return None
+
+        return issuer_eid, badge_name, eid
+
+    def _replace_badge_names(self, issuer_eid: str, badges: Sequence[BadgeClass]):
+        """
+        Replace an issuer's list with its badges
+
+        Args:
+            issuer_eid (str): eid of the issuer
+            badges (list): All the badges of the issuer
+        """
+        names = {}
+        for badge in badges:
+            entry = self._badge_name_entry(badge)
+            if entry:
+                names[entry[1]] = entry[2]
 
-        if not self.badge_names.get(issuer_eid, None):
-            self.badge_names[issuer_eid] = {}
+        self.badge_names.replace(issuer_eid, names)
 
-        self.badge_names[issuer_eid][badge_name] = eid
+    def _badge_names_fresh(self, issuer_eid: str, max_age: float = None) -> bool:
+        """Check if an issuer was loaded in the index less than max_age seconds ago"""
+        if max_age is None:
+            return False
 
-    def load_badge_names(self, issuer_eid: str):
+        loaded_at = self.badge_names.loaded_at(issuer_eid)
+
+        return loaded_at is not None and time.time() - loaded_at < max_age
+
+    def load_badge_names(self, issuer_eid: str, max_age: float = None):
         """
         (Re)loads the badge name index for an issuer
 
         Args:
             issuer_eid (str): eid of the issuer
+            max_age (float, optional): Skip the reload if the issuer was loaded
+                in the index less than max_age seconds ago. Defaults to None
+                (always reload).
+
+        Note:
+            With a persistent badge_name_index, pass max_age so processes reuse
+            the index loaded by a previous one instead of fetching every
+            badgeclass of the issuer at startup.
         """
-        issuer = Issuer(self, issuer_eid)
-        issuers_badges = issuer.fetch_badgeclasses(
-            load_badge_names=False
-        )  # We will load it ourselves
+        if self._badge_names_fresh(issuer_eid, max_age):
+            return
 
-        for badge in issuers_badges:
-            self._save_badge_name(badge)
+        attributes = {"badgr.entity_type": "Issuer", "badgr.entity_id": issuer_eid}
+
+        with start_span(self, "BadgrClient.load_badge_names", attributes):
+            issuer = Issuer(self, issuer_eid)
+            issuers_badges = issuer.fetch_badgeclasses(
+                load_badge_names=False
+            )  # We will load it ourselves
+
+            self._replace_badge_names(issuer_eid, issuers_badges)
 
     def get_eid_from_badge_name(self, badge_name: str, issuer_eid: str):
         """Get eid from badge name and it's issuer eid.
@@ -283,60 +1028,90 @@ class BadgrClient:
         Note:
             For this to work you need to have unique_badge_names enabled
         """
+        if self.lazy_badge_names:
+            return self.resolve_badge_name(badge_name, issuer_eid)
+
+        return self._indexed_badge_eid(badge_name, issuer_eid)
+
+    def _indexed_badge_eid(self, badge_name: str, issuer_eid: str):
+        """Get eid from badge name and it's issuer eid if it's in the index"""
         if not (badge_name or issuer_eid):
             return None
 
         if not self.unique_badge_names:
             return None
 
-        badge_names = self.badge_names
+        return self.badge_names.get(issuer_eid, badge_name) or None
 
-        if badge_names.get(issuer_eid, False) and badge_names[issuer_eid].get(
-            badge_name, False
-        ):
-            return badge_names[issuer_eid][badge_name]
+    def resolve_badge_name(self, badge_name: str, issuer_eid: str):
+        """Get eid from badge name and it's issuer eid, loading the issuer's
+        badges into the index if the name isn't found.
 
-        return None
+        Concurrent misses for the same issuer share a single load, and an
+        issuer loaded less than badge_name_miss_ttl seconds ago isn't loaded
+        again, its misses are answered from the index.
+
+        Args:
+            badge_name (string): Name of badge.
+            issuer_eid (string): entityId of the the issuer badge belongs to
+        """
+        eid = self._indexed_badge_eid(badge_name, issuer_eid)
+        if eid or not self._should_resolve(badge_name, issuer_eid):
+            return eid
+
+        loads = self._badge_loads.get(issuer_eid, 0)
+        with self._badge_load_lock(issuer_eid):
+            # Skip the load if another thread did it while we waited
+            if self._badge_loads.get(issuer_eid, 0) == loads:
+                self.load_badge_names(issuer_eid)
+                self._badge_loads[issuer_eid] = loads + 1
+
+        return self._indexed_badge_eid(badge_name, issuer_eid)
+
+    def _badge_load_lock(self, issuer_eid: str) -> threading.Lock:
+        """Get the lock serializing lazy loads of an issuer's badges"""
+        with self._badge_load_locks_lock:
+            lock = self._badge_load_locks.get(issuer_eid)
+            if lock is None:
+                lock = self._badge_load_locks[issuer_eid] = threading.Lock()
+
+        return lock
+
+    def _should_resolve(self, badge_name: str, issuer_eid: str) -> bool:
+        """Check if a badge name missing from the index should be looked up"""
+        if not (self.unique_badge_names and badge_name and issuer_eid):
+            return False
+
+        return not self._badge_names_fresh(issuer_eid, self.badge_name_miss_ttl)
 
     @staticmethod
-    def encode_image(file_path: str):
+    def encode_image(file_path: str, stream: bool = False):
         """
         Encode file to base64 data-uri string
 
         Args:
             file_path (str): the path to file
+            stream (bool, optional): Return an
+                :class:`~badgrclient.image.ImageFile` instead, which is encoded
+                from disk while the request is sent so the image is never held
+                in memory. Defaults to False.
 
         Raises:
             BadgrClientError: Image format not supported
         """
-        extension = file_path.split(".")[-1]
-        mime_type = IMAGE_MIME_TYPES[extension]
-
-        if not mime_type:
-            raise BadgrClientError(
-                "Image format {} not \
-                supported".format(
-                    extension
-                )
-            )
         try:
-            with open(file_path, "rb") as img_f:
-                encoded_string = "data:{};base64,{}".format(
-                    mime_type,
-                    base64.b64encode(img_f.read()).decode("utf8"),
-                )
+            image = ImageFile(file_path)
+            return image if stream else image.data_uri()
         except FileNotFoundError:
             return None
 
-        return encoded_string
-
     def fetch_tokens(self):
         """Get a list of access tokens for authenticated user"""
 
         response = self._call_api("/v2/auth/tokens")
         return response.result
 
-    def fetch_assertion(self, eid=None) -> List[Assertion]:
+    def fetch_assertion(self, eid=None) -> Sequence[Assertion]:
         """
         Get Assertion of the specified entityId, if eid is not provided
         then get a list of Assertions in authenticated user's backpack
@@ -344,17 +1119,41 @@ class BadgrClient:
         Args:
             eid (string, optional): entityId of the entity to fetch. Defaults to None.
         """
-
         if eid:
-            ep = Assertion.ENDPOINT + "/{}".format(eid)
+            result = self._fetch_result(
+                self._assertion_ep(eid), Assertion.ENTITY_TYPE, eid
+            )
         else:
-            ep = "/v2/backpack/assertions"
+            result = self._call_api(self._assertion_ep())["result"]
+
+        return self._deserialize(result)
+
+    @staticmethod
+    def _assertion_ep(eid=None) -> str:
+        """Get the assertion endpoint for eid or the backpack endpoint"""
+        if eid:
+            return Assertion.ENDPOINT + "/{}".format(eid)
 
-        response = self._call_api(ep)
+        return "/v2/backpack/assertions"
 
-        return self._deserialize(response["result"])
+    def iter_backpack_assertions(
+        self, page_size: int = 100, prefetch: int = 0
+    ) -> Iterator[Assertion]:
+        """
+        Iterate over the Assertions in authenticated user's backpack, fetching
+        them page by page
+
+        Args:
+            page_size (int, optional): Number of assertions per request.
+                Defaults to 100.
+            prefetch (int, optional): Number of pages to fetch in the background
+                while the current one is processed. Defaults to 0.
+        """
+        return self._iter_models(
+            self._assertion_ep(), page_size=page_size, prefetch=prefetch
+        )
 
-    def fetch_badgeclass(self, eid=None) -> List[BadgeClass]:
+    def fetch_badgeclass(self, eid=None) -> Sequence[BadgeClass]:
         """
         Get BadgeClass of the specified entityId, if eid is not provided
         then get a list of BadgeClasses for authenticated user
@@ -363,9 +1162,11 @@ class BadgrClient:
             eid (string, optional): entityId of the entity to fetch. Defaults to None.
         """
 
-        return self._fetch_id_or_self(BadgeClass.ENDPOINT, eid)
+        return self._fetch_id_or_self(
+            BadgeClass.ENDPOINT, eid, BadgeClass.ENTITY_TYPE
+        )
 
-    def fetch_issuer(self, eid=None) -> List[Issuer]:
+    def fetch_issuer(self, eid=None) -> Sequence[Issuer]:
         """
         Get Issuer of the specified entityId, if eid is not provided
         then get a list of Issuers for authenticated user
@@ -373,7 +1174,7 @@ class BadgrClient:
         Args:
             eid (string, optional): entityId of the entity to fetch. Defaults to None.
         """
-        return self._fetch_id_or_self(Issuer.ENDPOINT, eid)
+        return self._fetch_id_or_self(Issuer.ENDPOINT, eid, Issuer.ENTITY_TYPE)
 
     def fetch_collection(self, eid=None):
         """
@@ -396,13 +1197,245 @@ class BadgrClient:
 
         Raises:
             BadgrClientError: Email/password not provided.
+
+        Note:
+            Use :func:`~badgrclient.badgrclient.BadgrClient.revoke_many` to revoke
+            a large number of assertions
         """
+        payload = self._revoke_payload(ids, reason)
+
+        # Revoking an assertion twice is harmless so the POST can be retried
+        response = self._call_api(
+            "/v2/assertions/revoke", "POST", data=payload, idempotent=True
+        )
+
+        for eid in ids:
+            self._invalidate(Assertion.ENTITY_TYPE, eid)
+
+        self._discard_revoked(ids, response)
+
+        return response
+
+    @staticmethod
+    def _revoke_payload(ids: List[str], reason: str) -> list:
+        """Build the payload used to revoke assertions"""
         payload = []
 
         for eid in ids:
             payload.append({"entityId": eid, "revocationReason": reason})
 
-        return self._call_api("/v2/assertions/revoke", "POST", data=payload)
+        return payload
+
+    def _claim_recipient(self, badge_eid: str, recipient_email: str):
+        """Check that a recipient doesn't have a badge yet before issuing it, if
+        the client has a recipient_index
+
+        Raises:
+            DuplicateAssertionError: The recipient already has the badge
+        """
+        index = self.recipient_index
+        if index is None:
+            return
+
+        if not index.loaded(badge_eid):
+            with index.load_lock(badge_eid):
+                if not index.loaded(badge_eid):
+                    badge = self.MODELS["BadgeClass"](self, badge_eid)
+                    index.load(badge_eid, badge.iter_assertions())
+
+        self._check_claim(badge_eid, recipient_email)
+
+    def _check_claim(self, badge_eid: str, recipient_email: str):
+        claimed, eid = self.recipient_index.claim(badge_eid, recipient_email)
+
+        if not claimed:
+            raise DuplicateAssertionError(
+                "{} already has badge {}".format(recipient_email, badge_eid), eid
+            )
+
+    def _release_recipient(self, badge_eid: str, recipient_email: str):
+        """Release a recipient claimed before an issuance that failed"""
+        if self.recipient_index is not None:
+            self.recipient_index.release(badge_eid, recipient_email)
+
+    def _add_recipient(self, badge_eid: str, recipient_email: str, eid: str):
+        """Register an assertion the client created in the recipient_index"""
+        if self.recipient_index is not None:
+            self.recipient_index.add(badge_eid, recipient_email, eid)
+
+    def _discard_recipient(self, eid: str, data: dict):
+        """Remove a revoked assertion from the recipient_index, by its entityId
+        and, if its data was fetched, by its recipient
+        """
+        if self.recipient_index is None:
+            return
+
+        self.recipient_index.discard_assertion(eid)
+
+        identity = recipient_identity(data or {})
+        if identity and data.get("badgeclass"):
+            self.recipient_index.discard(data["badgeclass"], identity)
+
+    def _discard_revoked(self, ids: List[str], response):
+        """Remove the assertions a bulk revoke revoked from the recipient_index"""
+        if self.recipient_index is None:
+            return
+
+        for result in revoke_results(ids, response).values():
+            if result.revoked:
+                self.recipient_index.discard_assertion(result.entityId)
+
+    @traced
+    def revoke_many(
+        self,
+        ids: Iterable[str],
+        reason="Revoked by badgerclient",
+        chunk_size: int = 100,
+        concurrency: int = 4,
+    ) -> List[RevokeResult]:
+        """Revoke many assertions, in chunks sent concurrently
+
+        A chunk the server rejects (a 4xx error) is split in halves which are
+        sent again on their own, so an id it rejects only fails itself. Other
+        errors (connection errors, timeouts, 5xx once the retry policy gave up)
+        fail the whole chunk without sending it again.
+
+        Args:
+            ids (iterable): entityIds of the assertions to revoke
+            reason (string): Revocation reason, defaults to 'Revoked by badgerclient'
+            chunk_size (int, optional): Maximum number of ids per request.
+                Defaults to 100.
+            concurrency (int, optional): Maximum number of requests in flight.
+                Defaults to 4.
+
+        Returns:
+            List[RevokeResult]: A result per id, in the same order
+        """
+        ids = list(ids)
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = {
+                executor.submit(self.revoke_assertions, chunk, reason): chunk
+                for chunk in chunks(ids, chunk_size)
+            }
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        results.update(revoke_results(chunk, future.result()))
+                    except Exception as err:
+                        if len(chunk) == 1 or not is_rejection(err):
+                            results.update(revoke_errors(chunk, err))
+                            continue
+
+                        for half in chunks(chunk, (len(chunk) + 1) // 2):
+                            future = executor.submit(self.revoke_assertions, half, reason)
+                            pending[future] = half
+
+        return [results[eid] for eid in ids]
+
+    @traced
+    def issue_many(
+        self,
+        recipients: Iterable[Tuple[str, Union[str, dict]]],
+        concurrency: int = 8,
+        journal: IssuanceJournal = None,
+        **kwargs
+    ) -> List[IssueResult]:
+        """Issue badges to many recipients, pipelining the requests over
+        a pool of threads
+
+        Args:
+            recipients (iterable): (badge_eid, recipient) pairs, recipient is an
+                email or a dict of
+                :func:`~badgrclient.badgrmodels.Assertion.create` arguments
+            concurrency (int, optional): Maximum number of requests in flight.
+                Defaults to 8.
+            journal (IssuanceJournal, optional): Journal to record the run in and
+                resume it from, recipients it already issued to are skipped.
+                Defaults to None.
+            **kwargs: Assertion.create arguments shared by all recipients
+
+        Returns:
+            List[IssueResult]: A result per recipient, in the same order
+        """
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(
+                executor.map(
+                    lambda pair: self._issue_one(*pair, kwargs, journal), recipients
+                )
+            )
+
+    def _issue_one(
+        self, badge_eid: str, recipient, defaults: dict, journal=None
+    ) -> IssueResult:
+        """Issue a badge to a single recipient of issue_many and report the outcome"""
+        kwargs = issue_kwargs(recipient, defaults)
+        email = kwargs.get("recipient_email")
+
+        try:
+            if journal is not None:
+                eid = journal.issued(badge_eid, email)
+                if eid is None and journal.in_doubt(badge_eid, email):
+                    eid = self._find_issued(badge_eid, email)
+                    if eid:
+                        journal.record_issued(badge_eid, email, eid)
+
+                if eid:
+                    return self._resumed_result(badge_eid, recipient, eid)
+
+                journal.record_intent(badge_eid, email)
+
+            assertion = self.MODELS["Assertion"](self).create(
+                badge_eid=badge_eid, **kwargs
+            )
+        except Exception as err:
+            return self._issue_error(badge_eid, recipient, err, journal)
+
+        if journal is not None:
+            journal.record_issued(badge_eid, email, assertion.entityId)
+
+        return IssueResult(badge_eid, recipient, assertion)
+
+    def _find_issued(self, badge_eid: str, recipient_email: str):
+        """Look up an unrevoked assertion of a badge to a recipient, to check if
+        an interrupted request created it
+
+        Returns:
+            str: entityId of the assertion, None if there is none
+        """
+        badge = self.MODELS["BadgeClass"](self, badge_eid)
+
+        return self._unrevoked_eid(badge.fetch_assertions(recipient=recipient_email))
+
+    @staticmethod
+    def _unrevoked_eid(assertions: Sequence[Assertion]):
+        for assertion in assertions:
+            if not assertion.data.get("revoked"):
+                return assertion.entityId
+
+        return None
+
+    def _resumed_result(self, badge_eid: str, recipient, eid: str) -> IssueResult:
+        """Result of a recipient issued to by a previous run"""
+        assertion = self.MODELS["Assertion"](self, eid)
+
+        return IssueResult(badge_eid, recipient, assertion, resumed=True)
+
+    @staticmethod
+    def _issue_error(badge_eid: str, recipient, err, journal=None) -> IssueResult:
+        """Log and journal an error of issue_many"""
+        Logger.error("Couldn't issue {} to {}: {}".format(badge_eid, recipient, err))
+
+        if journal is not None:
+            email = issue_kwargs(recipient, {}).get("recipient_email")
+            journal.record_error(badge_eid, email, err)
+
+        return IssueResult(badge_eid, recipient, error=err)
 
     def _v1_create_user(
         self,
@@ -414,6 +1447,31 @@ class BadgrClient:
         agreed_terms_service: bool = True,
     ):
 
+        payload = self._v1_user_payload(
+            first_name,
+            last_name,
+            email,
+            password,
+            marketing_opt_in,
+            agreed_terms_service,
+        )
+
+        response = self._call_api(
+            "/v1/user/profile", "POST", data=payload, auth=False
+        )
+
+        return response
+
+    @staticmethod
+    def _v1_user_payload(
+        first_name,
+        last_name,
+        email,
+        password,
+        marketing_opt_in,
+        agreed_terms_service,
+    ) -> dict:
+        """Validate and build the payload used to create a user"""
         if not email:
             raise BadgrClientError("Email is required to make an account")
 
@@ -429,8 +1487,4 @@ class BadgrClient:
             "agreed_terms_service": agreed_terms_service,
         }
 
-        response = self._call_api(
-            "/v1/user/profile", "POST", data=payload, auth=False
-        )
-
-        return response
+        return payload
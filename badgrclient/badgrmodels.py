@@ -1,8 +1,10 @@
 from abc import ABC
 from datetime import datetime
+from .compact import COMPACT_TYPES
 from .exceptions import BadgrClientError
 import logging
-from typing import List, cast
+from typing import Iterator, Sequence, cast
+from .tracing import traced
 from .util import eid_required
 
 Logger = logging.getLogger("badgrclient")
@@ -32,9 +34,20 @@ class Base(ABC):
 
         return self
 
+    def compact(self, extras=()):
+        """Get a memory compact, read-only copy of this entity, see
+        :mod:`~badgrclient.compact`
+
+        Args:
+            extras (iterable, optional): Names of other fields to keep besides
+                the typed ones. Defaults to none.
+        """
+        return COMPACT_TYPES[self.ENTITY_TYPE].from_data(self.data, extras)
+
     def get_entity_ep(self) -> str:
         return self.ENDPOINT + "/{}".format(self.entityId)
 
+    @traced
     @eid_required
     def delete(self) -> dict:
         """Delete entity
@@ -44,9 +57,11 @@ class Base(ABC):
         """
         ep = self.get_entity_ep()
         response = self.client._call_api(ep, "DELETE")
+        self._invalidate()
 
         return response
 
+    @traced
     @eid_required
     def update(self) -> dict:
         """Update entity
@@ -56,19 +71,34 @@ class Base(ABC):
         """
         ep = self.get_entity_ep()
         response = self.client._call_api(ep, "PUT", data=self.data)
+        self._invalidate()
         # Fetch again to update self
-        self.fetch(self.get_entity_ep())
+        self.fetch()
         return response
 
+    @traced
     @eid_required
     def fetch(self):
         """Fetch entity from entityId"""
         ep = self.get_entity_ep()
-        response = self.client._call_api(ep)
+        result = self.client._fetch_result(ep, self.ENTITY_TYPE, self.entityId)
 
-        result = response["result"][0]
+        self.set_data(result[0])
 
-        self.set_data(result)
+    def _set_result(self, response: dict):
+        """Populate self from the first entity of a write's response
+
+        Args:
+            response (dict): Response dict
+        """
+        self.set_data(response["result"][0])
+        self._invalidate()
+
+        return self
+
+    def _invalidate(self):
+        """Drop this entity from the client's cache after a write"""
+        self.client._invalidate(self.ENTITY_TYPE, self.entityId)
 
     def __repr__(self):
         return "{}({})".format(self.__class__.__name__, self.entityId)
@@ -77,7 +107,9 @@ class Base(ABC):
 class Assertion(Base):
 
     ENDPOINT = "/v2/assertions"
+    ENTITY_TYPE = "Assertion"
 
+    @traced
     def create(
         self,
         recipient_email,
@@ -109,11 +141,49 @@ class Assertion(Base):
 
         Raises:
             BadgrClientError: Couldn't get eid/ Eid not provided
+            DuplicateAssertionError: The recipient already has this badge, if the
+                client has a recipient_index
 
         Note:
             You can indentify the badge either by providing eid or if unique_badge_names
             is enabled in your client then by providing issuer_eid and badge_name
         """
+        badge_eid, ep, payload = self._create_request(
+            recipient_email,
+            badge_eid,
+            issuer_eid,
+            badge_name,
+            narrative,
+            evidence,
+            expires,
+            issued_on,
+            notify,
+        )
+
+        self.client._claim_recipient(badge_eid, recipient_email)
+        try:
+            response = self.client._call_api(ep, "POST", data=payload)
+        except Exception:
+            self.client._release_recipient(badge_eid, recipient_email)
+            raise
+
+        return self._on_create(badge_eid, recipient_email, response)
+
+    def _create_request(
+        self,
+        recipient_email,
+        badge_eid,
+        issuer_eid,
+        badge_name,
+        narrative,
+        evidence,
+        expires,
+        issued_on,
+        notify,
+    ):
+        """Build the endpoint and payload used to create an assertion,
+        see :func:`~badgrclient.badgrmodels.Assertion.create`
+        """
         # TODO: add other types of recipient identifiers
         payload = {
             "recipient": {
@@ -135,20 +205,23 @@ class Assertion(Base):
 
         if not badge_eid:
             error_msg = "Couldn't get badge_eid. If unique_badge_names is enabled \
-                you might need to call BadgrClient.load_badge_names(issuer)"
+                you might need to call BadgrClient.load_badge_names(issuer) or \
+                enable lazy_badge_names"
             Logger.error(error_msg)
             raise BadgrClientError(error_msg)
 
-        response = self.client._call_api(
-            BadgeClass.ENDPOINT + "/{}/assertions".format(badge_eid),
-            "POST",
-            data=payload,
-        )
+        ep = BadgeClass.ENDPOINT + "/{}/assertions".format(badge_eid)
 
-        self.set_data(response["result"][0])
+        return badge_eid, ep, payload
+
+    def _on_create(self, badge_eid: str, recipient_email: str, response: dict):
+        """Populate self from the create response and register the recipient"""
+        self._set_result(response)
+        self.client._add_recipient(badge_eid, recipient_email, self.entityId)
 
         return self
 
+    @traced
     @eid_required
     def revoke(self, reason) -> dict:
         """Revoke this assertion
@@ -161,6 +234,8 @@ class Assertion(Base):
         """
         ep = Assertion.ENDPOINT + "/{}".format(self.entityId)
         response = self.client._call_api(ep, "DELETE")
+        self._invalidate()
+        self.client._discard_recipient(self.entityId, self.data)
 
         return response
 
@@ -168,6 +243,7 @@ class Assertion(Base):
 class BadgeClass(Base):
 
     ENDPOINT = "/v2/badgeclasses"
+    ENTITY_TYPE = "BadgeClass"
 
     def __init__(
         self,
@@ -190,6 +266,7 @@ class BadgeClass(Base):
         if entityId:
             self.entityId = entityId
 
+    @traced
     def create(
         self,
         name,
@@ -207,6 +284,8 @@ class BadgeClass(Base):
         Args:
             name (string): Name of the badge
             image (string): base64 encoded png/svg image
+                or an ImageFile to stream, see
+                :func:`~badgrclient.badgrclient.BadgrClient.encode_image`
             description (String): Short description of the badge
             issuer_eid (bool): entityId of issuer to use to issue the badge
             criteria_text (string, optional): The criteria of earning the badge
@@ -232,6 +311,39 @@ class BadgeClass(Base):
             BadgrClientError: Badgeclass name is not unique (if unique_badge_names is
                 enabled)
         """
+        payload = self._create_payload(
+            name,
+            image,
+            description,
+            issuer_eid,
+            criteria_text,
+            criteria_url,
+            alignments,
+            tags,
+            expires,
+        )
+
+        response = self.client._call_api(
+            BadgeClass.ENDPOINT, "POST", data=payload
+        )
+
+        return self._on_create(response)
+
+    def _create_payload(
+        self,
+        name,
+        image,
+        description,
+        issuer_eid,
+        criteria_text,
+        criteria_url,
+        alignments,
+        tags,
+        expires,
+    ) -> dict:
+        """Validate and build the payload used to create a badgeclass,
+        see :func:`~badgrclient.badgrmodels.BadgeClass.create`
+        """
         if not (criteria_text or criteria_url):
             raise BadgrClientError(
                 "At least one of criteria_text and \
@@ -265,21 +377,22 @@ class BadgeClass(Base):
                 Logger.error(error_msg)
                 raise BadgrClientError(error_msg)
 
-        response = self.client._call_api(
-            BadgeClass.ENDPOINT, "POST", data=payload
-        )
+        return payload
 
-        self.set_data(response["result"][0])
+    def _on_create(self, response: dict) -> "BadgeClass":
+        """Populate self from the create response and register the badge name"""
+        self._set_result(response)
 
-        if unique_badge_names:
+        if self.client.unique_badge_names:
             self.client._save_badge_name(self)
 
         return self
 
+    @traced
     @eid_required
     def fetch_assertions(
         self, recipient=None, num=None, query=None
-    ) -> List[Assertion]:
+    ) -> Sequence[Assertion]:
         """
         Get a list of Assertions for this badgeclass
 
@@ -289,6 +402,34 @@ class BadgeClass(Base):
                 of results
             query (dict, optional): Query params
         """
+        ep, query = self._assertions_request(recipient, query)
+        response = self.client._call_api(ep, params=query)
+        result = cast(
+            Sequence[Assertion], self.client._deserialize(response["result"])
+        )
+        return result
+
+    @eid_required
+    def iter_assertions(
+        self, recipient=None, page_size: int = 100, query=None, prefetch: int = 0
+    ) -> Iterator[Assertion]:
+        """
+        Iterate over the Assertions of this badgeclass, fetching them page by page
+
+        Args:
+            recipient (string, optional): Filter by recipient
+            page_size (int, optional): Number of assertions per request.
+                Defaults to 100.
+            query (dict, optional): Query params
+            prefetch (int, optional): Number of pages to fetch in the background
+                while the current one is processed. Defaults to 0.
+        """
+        ep, query = self._assertions_request(recipient, query)
+
+        return self.client._iter_models(ep, query, page_size, prefetch)
+
+    def _assertions_request(self, recipient=None, query=None):
+        """Build the endpoint and query used to list this badgeclass's assertions"""
         ep = BadgeClass.ENDPOINT + "/{}/assertions".format(self.entityId)
         if recipient:
             if not query:
@@ -296,12 +437,9 @@ class BadgeClass(Base):
 
             query["recipient"] = recipient
 
-        response = self.client._call_api(ep, params=query)
-        result = cast(
-            List[Assertion], self.client._deserialize(response["result"])
-        )
-        return result
+        return ep, query
 
+    @traced
     @eid_required
     def issue(
         self,
@@ -337,12 +475,40 @@ class BadgeClass(Base):
 
         return new_assertion
 
+    @traced
+    @eid_required
+    def issue_many(
+        self, recipients: list, concurrency: int = 8, journal=None, **kwargs
+    ) -> list:
+        """Issue this badge to many recipients concurrently
+
+        Args:
+            recipients (list): Recipient emails or dicts of
+                :func:`~badgrclient.badgrmodels.Assertion.create` arguments
+            concurrency (int, optional): Maximum number of requests in flight.
+                Defaults to 8.
+            journal (IssuanceJournal, optional): Journal to record the run in and
+                resume it from. Defaults to None.
+            **kwargs: Assertion.create arguments shared by all recipients
+
+        Returns:
+            List[IssueResult]: A result per recipient, in the same order
+        """
+        return self.client.issue_many(
+            [(self.entityId, recipient) for recipient in recipients],
+            concurrency,
+            journal,
+            **kwargs
+        )
+
 
 class Issuer(Base):
 
     V1_ENDPOINT = "/v1/issuer/issuers/{slug}/staff"
     ENDPOINT = "/v2/issuers"
+    ENTITY_TYPE = "Issuer"
 
+    @traced
     def create(self, name, description, email, url, image=None) -> "Issuer":
         """Create a new Issuer
 
@@ -353,6 +519,8 @@ class Issuer(Base):
             of your verified addresses.
             url (string): Website URL
             image (string): bade64 encoded string (data-uri)
+                or an ImageFile to stream, see
+                :func:`~badgrclient.badgrclient.BadgrClient.encode_image`
         """
         payload = {
             "name": name,
@@ -363,12 +531,12 @@ class Issuer(Base):
         }
 
         response = self.client._call_api(Issuer.ENDPOINT, "POST", data=payload)
-        self.set_data(response["result"][0])
 
-        return self
+        return self._set_result(response)
 
+    @traced
     @eid_required
-    def fetch_assertions(self, query=None) -> List[Assertion]:
+    def fetch_assertions(self, query=None) -> Sequence[Assertion]:
         """Get list of assertions for this issuer
         Args:
             query (dict, optional): Query params
@@ -376,15 +544,39 @@ class Issuer(Base):
         ep = Issuer.ENDPOINT + "/{}/assertions".format(self.entityId)
         response = self.client._call_api(ep, params=query)
         result = cast(
-            List[Assertion], self.client._deserialize(response["result"])
+            Sequence[Assertion], self.client._deserialize(response["result"])
         )
 
         return result
 
+    @eid_required
+    def iter_assertions(
+        self, query=None, page_size: int = 100, prefetch: int = 0
+    ) -> Iterator[Assertion]:
+        """Iterate over the assertions of this issuer, fetching them page by page
+
+        Args:
+            query (dict, optional): Query params
+            page_size (int, optional): Number of assertions per request.
+                Defaults to 100.
+            prefetch (int, optional): Number of pages to fetch in the background
+                while the current one is processed. Defaults to 0.
+
+        Note:
+            With prefetch, pages are fetched by a background thread which stays
+            at most prefetch pages ahead of the caller. Pagination is cursor
+            based so pages are still requested one after another, but their
+            latency overlaps with the caller's processing.
+        """
+        ep = Issuer.ENDPOINT + "/{}/assertions".format(self.entityId)
+
+        return self.client._iter_models(ep, query, page_size, prefetch)
+
+    @traced
     @eid_required
     def fetch_badgeclasses(
         self, load_badge_names: bool = True, query=None
-    ) -> List[BadgeClass]:
+    ) -> Sequence[BadgeClass]:
         """Get a list of BadgeClasses for this issuer
 
         Args:
@@ -393,12 +585,45 @@ class Issuer(Base):
             query (dict, optional):  Query params. Defaults to None.
 
         Returns:
-            List[BadgeClass]: [description]
+            Sequence[BadgeClass]: [description]
         """
         ep = Issuer.ENDPOINT + "/{}/badgeclasses".format(self.entityId)
         response = self.client._call_api(ep, params=query)
+
+        return self._on_fetch_badgeclasses(response, load_badge_names)
+
+    @eid_required
+    def iter_badgeclasses(
+        self,
+        load_badge_names: bool = True,
+        query=None,
+        page_size: int = 100,
+        prefetch: int = 0,
+    ) -> Iterator[BadgeClass]:
+        """Iterate over the BadgeClasses of this issuer, fetching them page by page
+
+        Args:
+            load_badge_names (bool, optional): Should the fetched data be used
+                to load badge names if unique_badge_names is True. Defaults to True.
+            query (dict, optional):  Query params. Defaults to None.
+            page_size (int, optional): Number of badgeclasses per request.
+                Defaults to 100.
+            prefetch (int, optional): Number of pages to fetch in the background
+                while the current one is processed. Defaults to 0.
+        """
+        ep = Issuer.ENDPOINT + "/{}/badgeclasses".format(self.entityId)
+
+        for page in self.client._iter_pages(ep, query, page_size, prefetch):
+            yield from self._on_fetch_badgeclasses(
+                {"result": page}, load_badge_names
+            )
+
+    def _on_fetch_badgeclasses(
+        self, response: dict, load_badge_names: bool
+    ) -> Sequence[BadgeClass]:
+        """Deserialize badgeclasses and register their names if required"""
         result = cast(
-            List[BadgeClass], self.client._deserialize(response["result"])
+            Sequence[BadgeClass], self.client._deserialize(response["result"])
         )
 
         if load_badge_names and self.client.unique_badge_names:
@@ -407,6 +632,7 @@ class Issuer(Base):
 
         return result
 
+    @traced
     @eid_required
     def create_badgeclass(
         self,
@@ -424,6 +650,8 @@ class Issuer(Base):
         Args:
             name (string): Name of the badge
             image (string): base64 encoded png/svg image (data-uri string)
+                or an ImageFile to stream, see
+                :func:`~badgrclient.badgrclient.BadgrClient.encode_image`
             description (String): Short description of the badge
             criteria_text (string, optional): The criteria of earning the badge
             criteria_url (string, optional): Link of the criteria to earn
@@ -459,6 +687,7 @@ class Issuer(Base):
 
         return badge_class
 
+    @traced
     @eid_required
     def edit_staff(self, action: str, email: str, role: str) -> dict:
         """Edit the staff list of this issuer
@@ -473,6 +702,20 @@ class Issuer(Base):
             BadgrClientError: Action must be one of 'owner', 'editor', or 'staff'
         """
 
+        payload = self._staff_payload(action, email, role)
+
+        response = self.client._call_api(
+            Issuer.V1_ENDPOINT.format(slug=self.entityId), "POST", data=payload
+        )
+
+        self._invalidate()
+        self.fetch()
+
+        return response
+
+    @staticmethod
+    def _staff_payload(action: str, email: str, role: str) -> dict:
+        """Validate and build the payload used to edit the staff list"""
         if action not in ["add", "modify", "remove"]:
             raise BadgrClientError(
                 "Action must be one of 'add', 'modify' or 'remove'"
@@ -483,12 +726,4 @@ class Issuer(Base):
                 "Action must be one of 'owner', 'editor', or 'staff'"
             )
 
-        payload = {"action": action, "email": email, "role": role}
-
-        response = self.client._call_api(
-            Issuer.V1_ENDPOINT.format(slug=self.entityId), "POST", data=payload
-        )
-
-        self.fetch(self.get_entity_ep())
-
-        return response
+        return {"action": action, "email": email, "role": role}
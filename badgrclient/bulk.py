@@ -0,0 +1,121 @@
+import logging
+from typing import Dict, List, Union
+from .exceptions import APIError
+
+Logger = logging.getLogger("badgrclient")
+
+
+class IssueResult:
+    def __init__(
+        self, badge_eid: str, recipient, assertion=None, error=None, resumed=False
+    ):
+        """Outcome of issuing a badge to a single recipient
+
+        Args:
+            badge_eid (str): entityId of the badgeclass that was issued
+            recipient (str or dict): The recipient as passed to issue_many
+            assertion (Assertion, optional): The created assertion
+            error (Exception, optional): The error raised while issuing
+            resumed (bool, optional): Whether the assertion was issued by a
+                previous run, according to the journal. Only its entityId
+                is set then.
+        """
+        self.badge_eid = badge_eid
+        self.recipient = recipient
+        self.assertion = assertion
+        self.error = error
+        self.resumed = resumed
+
+    @property
+    def ok(self) -> bool:
+        """Whether the assertion was created"""
+        return self.error is None
+
+    def __repr__(self):
+        outcome = self.assertion if self.ok else repr(self.error)
+        return "IssueResult({}, {})".format(self.recipient, outcome)
+
+
+class RevokeResult:
+    def __init__(self, eid: str, revoked: bool = False, reason=None, error=None):
+        """Outcome of revoking a single assertion
+
+        Args:
+            eid (str): entityId of the assertion
+            revoked (bool, optional): Whether the server revoked it
+            reason (str, optional): Why the server didn't revoke it
+            error (Exception, optional): The error raised while revoking it
+        """
+        self.entityId = eid
+        self.revoked = revoked
+        self.reason = reason
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the assertion was revoked"""
+        return self.revoked and self.error is None
+
+    def __repr__(self):
+        outcome = "revoked" if self.ok else repr(self.error or self.reason)
+        return "RevokeResult({}, {})".format(self.entityId, outcome)
+
+
+def chunks(items: list, size: int) -> List[list]:
+    """Split items in lists of at most size items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def revoke_results(chunk: List[str], response) -> Dict[str, RevokeResult]:
+    """Get the result of each id of a chunk from the bulk revoke response
+
+    Args:
+        chunk (list): entityIds sent in the request
+        response (dict): The API response, ids it doesn't report on were revoked
+    """
+    results = {eid: RevokeResult(eid, revoked=True) for eid in chunk}
+    rows = response.get("result") if isinstance(response, dict) else None
+
+    for row in rows or []:
+        eid = row.get("entityId") if isinstance(row, dict) else None
+        if eid in results:
+            results[eid] = RevokeResult(
+                eid, revoked=row.get("revoked", True), reason=row.get("reason")
+            )
+
+    return results
+
+
+def revoke_errors(chunk: List[str], err: Exception) -> Dict[str, RevokeResult]:
+    """Fail every id of a chunk whose request failed"""
+    Logger.error("Couldn't revoke {}: {}".format(", ".join(chunk), err))
+
+    return {eid: RevokeResult(eid, error=err) for eid in chunk}
+
+
+def is_rejection(err: Exception) -> bool:
+    """Whether the server rejected a bulk request because of its content, so
+    that sending its items separately can succeed. Connection errors, server
+    errors, throttling and authentication errors would fail them all again.
+    """
+    return (
+        isinstance(err, APIError)
+        and err.status_code is not None
+        and err.status_code < 500
+        and err.status_code not in (401, 403, 408, 429)
+    )
+
+
+def issue_kwargs(recipient: Union[str, dict], defaults: dict) -> dict:
+    """Build the keyword arguments of Assertion.create for a recipient
+
+    Args:
+        recipient (str or dict): Recipient email or a dict of
+            :func:`~badgrclient.badgrmodels.Assertion.create` arguments which
+            must contain recipient_email
+        defaults (dict): Arguments shared by all recipients
+    """
+    if isinstance(recipient, str):
+        return dict(defaults, recipient_email=recipient)
+
+    return dict(defaults, **recipient)
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Entry:
+
+    __slots__ = ("body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, body: bytes, etag: str = None, last_modified: str = None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+
+
+class EntityCache:
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_size: int = 1024,
+        entity_types=("BadgeClass", "Issuer"),
+    ):
+        """In-memory LRU cache of single entities keyed by (entityType, entityId).
+        Safe to share between threads and clients talking to the same server.
+
+        Entities are kept as the raw body of their response, which the client
+        decodes on every hit. Callers get fresh data they may edit without
+        the cost of copying it, and a hit costs a decode of the body.
+
+        Expired entities are kept with their ETag/Last-Modified validators so
+        the client can revalidate them with a conditional request. A 304
+        response serves the cached body again without downloading it. Use
+        ttl=0 to revalidate on every fetch.
+
+        Args:
+            ttl (float, optional): Seconds an entity is served from the cache.
+                Defaults to 300.
+            max_size (int, optional): Maximum number of cached entities, the least
+                recently used ones are evicted first. Defaults to 1024.
+            entity_types (tuple, optional): entityTypes to cache.
+                Defaults to BadgeClass and Issuer.
+
+        Note:
+            Hits, misses, revalidations (304 responses) and evictions are
+            counted in :attr:`~badgrclient.cache.EntityCache.stats`
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entity_types = frozenset(entity_types)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidations": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def caches(self, entity_type: str) -> bool:
+        """Whether entities of entity_type are cached"""
+        return entity_type in self.entity_types
+
+    def get(self, entity_type: str, eid: str):
+        """Get the response body of a fresh cached entity
+
+        Args:
+            entity_type (str): entityType of the entity
+            eid (str): entityId of the entity
+
+        Returns:
+            bytes: The response body, or None if it isn't cached or has expired
+        """
+        key = (entity_type, eid)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or time.monotonic() - entry.stored_at > self.ttl:
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+
+        return entry.body
+
+    def get_validators(self, entity_type: str, eid: str) -> dict:
+        """Get the conditional request headers to revalidate a cached entity
+
+        Args:
+            entity_type (str): entityType of the entity
+            eid (str): entityId of the entity
+
+        Returns:
+            dict: If-None-Match/If-Modified-Since headers, empty if the entity
+                isn't cached or the server didn't send validators
+        """
+        with self._lock:
+            entry = self._entries.get((entity_type, eid))
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def revalidate(self, entity_type: str, eid: str):
+        """Mark a cached entity fresh again after a 304 response
+
+        Args:
+            entity_type (str): entityType of the entity
+            eid (str): entityId of the entity
+
+        Returns:
+            bytes: The response body, or None if it was evicted meanwhile
+        """
+        key = (entity_type, eid)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            entry.stored_at = time.monotonic()
+            self._entries.move_to_end(key)
+            self.stats["revalidations"] += 1
+
+        return entry.body
+
+    def set(
+        self,
+        entity_type: str,
+        eid: str,
+        body: bytes,
+        etag: str = None,
+        last_modified: str = None,
+    ):
+        """Cache the response of an entity
+
+        Args:
+            entity_type (str): entityType of the entity
+            eid (str): entityId of the entity
+            body (bytes): The raw response body, it's never modified
+            etag (str, optional): ETag header of the response
+            last_modified (str, optional): Last-Modified header of the response
+        """
+        key = (entity_type, eid)
+        entry = _Entry(body, etag, last_modified)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, entity_type: str, eid: str):
+        """Drop an entity from the cache
+
+        Args:
+            entity_type (str): entityType of the entity
+            eid (str): entityId of the entity
+        """
+        with self._lock:
+            self._entries.pop((entity_type, eid), None)
+
+    def clear(self):
+        """Drop every entity from the cache"""
+        with self._lock:
+            self._entries.clear()
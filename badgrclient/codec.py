@@ -0,0 +1,47 @@
+import json
+
+# Headers of requests with a JSON body
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class JSONCodec:
+
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        """Encode a request body
+
+        Args:
+            obj: The JSON serializable body
+        """
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes):
+        """Decode a response body
+
+        Args:
+            data (bytes): The raw response body
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+
+    name = "orjson"
+
+    def __init__(self):
+        """Codec using orjson, which encodes to and decodes from bytes directly"""
+        import orjson
+
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+def default_codec() -> JSONCodec:
+    """Get the fastest available codec, orjson if it's installed or the
+    standard library json module otherwise
+    """
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        return JSONCodec()
@@ -0,0 +1,121 @@
+import sys
+from typing import Iterable, Optional
+
+
+class _Compact:
+
+    __slots__ = ("entityId", "extras")
+
+    # entityType of the represented entity
+    ENTITY_TYPE = None
+
+    # Typed fields, besides entityId, read from the entity data
+    FIELDS = ()
+
+    # Fields whose values repeat across entities (e.g. the issuer's entityId),
+    # they are interned so entities share them
+    SHARED = ()
+
+    def __init__(self, entityId: str, extras: Optional[dict] = None, **fields):
+        """Read-only, memory compact representation of an entity, without a
+        reference to a client. Build it with
+        :func:`~badgrclient.compact._Compact.from_data`
+
+        Args:
+            entityId (str): entityId of the entity
+            extras (dict, optional): Other raw fields that were kept.
+                Defaults to None.
+        """
+        self.entityId = entityId
+        self.extras = extras or None
+        for field in self.FIELDS:
+            setattr(self, field, fields.get(field))
+
+    @classmethod
+    def from_data(cls, data: dict, extras: Iterable[str] = ()):
+        """Build the compact representation of an entity's data
+
+        Args:
+            data (dict): The entity data as returned by the API
+            extras (iterable, optional): Names of other fields to keep.
+                Defaults to none.
+        """
+        return cls(
+            data.get("entityId"),
+            {field: data[field] for field in extras if field in data},
+            **cls._read_fields(data)
+        )
+
+    @classmethod
+    def _read_fields(cls, data: dict) -> dict:
+        fields = {field: data.get(field) for field in cls.FIELDS}
+
+        for field in cls.SHARED:
+            if isinstance(fields[field], str):
+                fields[field] = sys.intern(fields[field])
+
+        return fields
+
+    def get(self, field: str, default=None):
+        """Get a typed field or one of the extras"""
+        if field in self.FIELDS or field == "entityId":
+            return getattr(self, field)
+
+        return (self.extras or {}).get(field, default)
+
+    def to_model(self, client):
+        """Get a model bound to client for this entity, call fetch on it to
+        load its full data
+
+        Args:
+            client (BadgrClient): The client to bind the model to
+        """
+        return client.MODELS[self.ENTITY_TYPE](client, self.entityId)
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self.entityId)
+
+
+class CompactAssertion(_Compact):
+
+    __slots__ = ("recipient", "issuedOn", "revoked", "badgeclass", "issuer")
+
+    ENTITY_TYPE = "Assertion"
+    FIELDS = __slots__
+    SHARED = ("badgeclass", "issuer")
+
+    @classmethod
+    def _read_fields(cls, data: dict) -> dict:
+        fields = super()._read_fields(data)
+        # Only keep the recipient identity, e.g. the email
+        recipient = data.get("recipient")
+        fields["recipient"] = (
+            recipient.get("identity") if isinstance(recipient, dict) else recipient
+        )
+        fields["revoked"] = bool(data.get("revoked"))
+
+        return fields
+
+
+class CompactBadgeClass(_Compact):
+
+    __slots__ = ("name", "issuer")
+
+    ENTITY_TYPE = "BadgeClass"
+    FIELDS = __slots__
+    SHARED = ("issuer",)
+
+
+class CompactIssuer(_Compact):
+
+    __slots__ = ("name",)
+
+    ENTITY_TYPE = "Issuer"
+    FIELDS = __slots__
+
+
+# Compact representations, keyed by entityType
+COMPACT_TYPES = {
+    compact.ENTITY_TYPE: compact
+    for compact in (CompactAssertion, CompactBadgeClass, CompactIssuer)
+}
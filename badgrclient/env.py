@@ -0,0 +1,28 @@
+from os import getenv
+from os.path import dirname, join
+
+# The .env file the client used to load on import
+DEFAULT_DOTENV_PATH = join(dirname(__file__), ".env")
+
+
+def load_env(dotenv_path: str = None, override: bool = False):
+    """Load environment variables, e.g. BADGR_USERNAME and BADGR_PASSWORD, from
+    a .env file. The client doesn't load one on import anymore, call this once
+    before creating clients if you rely on it.
+
+    Args:
+        dotenv_path (str, optional): Path of the .env file. Defaults to the .env
+            file in the badgrclient package directory.
+        override (bool, optional): Override variables that are already set.
+            Defaults to False.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path or DEFAULT_DOTENV_PATH, override=override)
+
+
+def env_credentials() -> tuple:
+    """Get the (username, password) from the BADGR_USERNAME and BADGR_PASSWORD
+    environment variables as they are now
+    """
+    return getenv("BADGR_USERNAME"), getenv("BADGR_PASSWORD")
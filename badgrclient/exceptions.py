@@ -1,6 +1,16 @@
 class APIError(Exception):
-    pass
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        # Status code of the response, None if none was received
+        self.status_code = status_code
 
 
 class BadgrClientError(Exception):
     pass
+
+
+class DuplicateAssertionError(BadgrClientError):
+    def __init__(self, message: str, assertion_eid: str = None):
+        super().__init__(message)
+        # entityId of the existing assertion, None if it's still being created
+        self.assertion_eid = assertion_eid
@@ -0,0 +1,409 @@
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# Routes as (method, path pattern, handler name)
+ROUTES = [
+    ("POST", r"/o/token", "token"),
+    ("GET", r"/v2/issuers", "list_issuers"),
+    ("POST", r"/v2/issuers", "create_issuer"),
+    ("GET", r"/v2/issuers/(?P<eid>[^/]+)", "get_issuer"),
+    ("GET", r"/v2/issuers/(?P<eid>[^/]+)/badgeclasses", "list_issuer_badgeclasses"),
+    ("POST", r"/v2/issuers/(?P<eid>[^/]+)/badgeclasses", "create_badgeclass"),
+    ("GET", r"/v2/issuers/(?P<eid>[^/]+)/assertions", "list_issuer_assertions"),
+    ("GET", r"/v2/badgeclasses", "list_badgeclasses"),
+    ("POST", r"/v2/badgeclasses", "create_badgeclass"),
+    ("GET", r"/v2/badgeclasses/(?P<eid>[^/]+)", "get_badgeclass"),
+    ("PUT", r"/v2/badgeclasses/(?P<eid>[^/]+)", "update_badgeclass"),
+    ("DELETE", r"/v2/badgeclasses/(?P<eid>[^/]+)", "delete_badgeclass"),
+    ("GET", r"/v2/badgeclasses/(?P<eid>[^/]+)/assertions", "list_badge_assertions"),
+    ("POST", r"/v2/badgeclasses/(?P<eid>[^/]+)/assertions", "create_assertion"),
+    ("POST", r"/v2/assertions/revoke", "revoke_assertions"),
+    ("GET", r"/v2/assertions/(?P<eid>[^/]+)", "get_assertion"),
+    ("DELETE", r"/v2/assertions/(?P<eid>[^/]+)", "delete_assertion"),
+]
+
+
+def _new_eid() -> str:
+    return uuid.uuid4().hex[:22]
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _NotFound(Exception):
+    pass
+
+
+class FakeBadgrServer:
+    def __init__(
+        self,
+        latency: float = 0,
+        error_rate: float = 0,
+        max_page_size: int = None,
+        seed: int = None,
+    ):
+        """In-process fake badgr-server serving the token, issuer, badgeclass
+        and assertion endpoints from memory over real HTTP, for end-to-end
+        tests and benchmarks of the client.
+
+        Args:
+            latency (float, optional): Seconds added to every response.
+                Defaults to 0.
+            error_rate (float, optional): Fraction of API requests answered
+                with a 503, token requests never fail. Defaults to 0.
+            max_page_size (int, optional): Maximum number of entities per list
+                response, the rest is linked with a Link: rel="next" header.
+                Defaults to None (as many as the num query param asks for).
+            seed (int, optional): Seed of the error randomness. Defaults to None.
+
+        Note:
+            Use it as a context manager, or call start and stop::
+
+                with FakeBadgrServer() as server:
+                    client = BadgrClient('user', 'pass', 'client', base_url=server.url)
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_page_size = max_page_size
+        self.issuers = {}
+        self.badgeclasses = {}
+        self.assertions = {}
+        # Number of requests received, keyed by handler name
+        self.requests = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes = [
+            (method, re.compile(pattern + "$"), name)
+            for method, pattern, name in ROUTES
+        ]
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base url of the running server"""
+        host, port = self._httpd.server_address[:2]
+
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        """Start serving on a free local port in a background thread"""
+        server = self
+
+        class Handler(_Handler):
+            fake = server
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        # Poll often so that stop returns quickly
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """Stop the server"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Seeding
+
+    def add_issuer(self, name: str = "Fake Issuer", **data) -> dict:
+        """Add an issuer, returns its data"""
+        return self._store(
+            self.issuers,
+            dict(
+                {"entityType": "Issuer", "name": name, "createdAt": _now()},
+                **data
+            ),
+        )
+
+    def add_badgeclass(self, issuer_eid: str, name: str = "Fake Badge", **data):
+        """Add a badgeclass to an issuer, returns its data"""
+        return self._store(
+            self.badgeclasses,
+            dict(
+                {
+                    "entityType": "BadgeClass",
+                    "issuer": issuer_eid,
+                    "name": name,
+                    "image": "{}/media/{}.png".format("http://fake", _new_eid()),
+                    "createdAt": _now(),
+                },
+                **data
+            ),
+        )
+
+    def add_assertions(self, badge_eid: str, count: int) -> list:
+        """Add count assertions of a badgeclass, returns their data"""
+        return [
+            self._add_assertion(badge_eid, "user{}@example.com".format(i), {})
+            for i in range(count)
+        ]
+
+    def _store(self, table: dict, data: dict) -> dict:
+        data.setdefault("entityId", _new_eid())
+
+        with self._lock:
+            table[data["entityId"]] = data
+
+        return data
+
+    def _add_assertion(self, badge_eid: str, email: str, body: dict) -> dict:
+        badge = self._get(self.badgeclasses, badge_eid)
+
+        return self._store(
+            self.assertions,
+            {
+                "entityType": "Assertion",
+                "badgeclass": badge_eid,
+                "issuer": badge["issuer"],
+                "image": "http://fake/media/assertion.png",
+                "recipient": {
+                    "identity": email,
+                    "type": "email",
+                    "hashed": False,
+                    "plaintextIdentity": email,
+                },
+                "issuedOn": body.get("issuedOn") or _now(),
+                "narrative": body.get("narrative"),
+                "evidence": body.get("evidence") or [],
+                "expires": body.get("expires"),
+                "revoked": False,
+                "revocationReason": None,
+            },
+        )
+
+    @staticmethod
+    def _get(table: dict, eid: str) -> dict:
+        if eid not in table:
+            raise _NotFound(eid)
+
+        return table[eid]
+
+    # Request handling
+
+    def handle(self, method: str, url: str, body: bytes, content_type: str = None):
+        """Answer a request
+
+        Returns:
+            tuple: The status, response body and extra headers
+        """
+        if self.latency:
+            time.sleep(self.latency)
+
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(parts.path)
+            if route_method != method or not match:
+                continue
+
+            with self._lock:
+                self.requests[name] = self.requests.get(name, 0) + 1
+                failed = name != "token" and self._random.random() < self.error_rate
+
+            if failed:
+                return 503, {"error": "Service unavailable"}, {}
+
+            data = self._parse_body(body, content_type)
+            try:
+                handler = getattr(self, "_" + name)
+                return handler(parts.path, query, data, **match.groupdict())
+            except _NotFound as err:
+                return 404, {"error": "Not found: {}".format(err)}, {}
+
+        return 404, {"error": "No route for {} {}".format(method, parts.path)}, {}
+
+    @staticmethod
+    def _parse_body(body: bytes, content_type: str = None):
+        if not body:
+            return None
+
+        if content_type and content_type.startswith("application/x-www-form"):
+            return {key: values[-1] for key, values in parse_qs(body.decode()).items()}
+
+        return json.loads(body)
+
+    @staticmethod
+    def _result(result: list, status: int = 200, headers: dict = None):
+        body = {
+            "status": {"success": True, "description": "ok"},
+            "result": result,
+        }
+
+        return status, body, headers or {}
+
+    def _page(self, path: str, query: dict, entities: list):
+        """Paginate a list response with the num and cursor query params"""
+        size = int(query.get("num") or 0) or len(entities)
+        if self.max_page_size:
+            size = min(size, self.max_page_size)
+
+        start = int(query.get("cursor") or 0)
+        end = start + size
+        headers = {}
+
+        if end < len(entities):
+            next_query = dict(query, cursor=end, num=size)
+            headers["Link"] = '<{}{}?{}>; rel="next"'.format(
+                self.url, path, urlencode(next_query)
+            )
+
+        return self._result(entities[start:end], headers=headers)
+
+    def _token(self, path, query, data):
+        body = {
+            "access_token": _new_eid(),
+            "token_type": "Bearer",
+            "expires_in": 86400,
+            "refresh_token": _new_eid(),
+            "scope": "rw:profile rw:issuer rw:backpack",
+        }
+
+        return 200, body, {}
+
+    def _list_issuers(self, path, query, data):
+        return self._page(path, query, list(self.issuers.values()))
+
+    def _create_issuer(self, path, query, data):
+        return self._result([self.add_issuer(**data)], 201)
+
+    def _get_issuer(self, path, query, data, eid):
+        return self._result([self._get(self.issuers, eid)])
+
+    def _list_issuer_badgeclasses(self, path, query, data, eid):
+        self._get(self.issuers, eid)
+        badges = [b for b in self.badgeclasses.values() if b["issuer"] == eid]
+
+        return self._page(path, query, badges)
+
+    def _create_badgeclass(self, path, query, data, eid=None):
+        data = dict(data)
+        issuer_eid = eid or data.pop("issuer")
+        self._get(self.issuers, issuer_eid)
+
+        return self._result([self.add_badgeclass(issuer_eid, **data)], 201)
+
+    def _list_issuer_assertions(self, path, query, data, eid):
+        self._get(self.issuers, eid)
+        assertions = [a for a in self.assertions.values() if a["issuer"] == eid]
+
+        return self._page(path, query, assertions)
+
+    def _list_badgeclasses(self, path, query, data):
+        return self._page(path, query, list(self.badgeclasses.values()))
+
+    def _get_badgeclass(self, path, query, data, eid):
+        return self._result([self._get(self.badgeclasses, eid)])
+
+    def _update_badgeclass(self, path, query, data, eid):
+        badge = self._get(self.badgeclasses, eid)
+        with self._lock:
+            badge.update(data, entityId=eid)
+
+        return self._result([badge])
+
+    def _delete_badgeclass(self, path, query, data, eid):
+        self._get(self.badgeclasses, eid)
+        with self._lock:
+            del self.badgeclasses[eid]
+
+        return self._result([])
+
+    def _list_badge_assertions(self, path, query, data, eid):
+        self._get(self.badgeclasses, eid)
+        recipient = query.get("recipient")
+        assertions = [
+            a
+            for a in self.assertions.values()
+            if a["badgeclass"] == eid
+            and (recipient is None or a["recipient"]["identity"] == recipient)
+        ]
+
+        return self._page(path, query, assertions)
+
+    def _create_assertion(self, path, query, data, eid):
+        email = data["recipient"]["identity"]
+
+        return self._result([self._add_assertion(eid, email, data)], 201)
+
+    def _revoke_assertions(self, path, query, data):
+        results = []
+
+        for row in data:
+            assertion = self.assertions.get(row["entityId"])
+            if assertion is None:
+                results.append(
+                    {"entityId": row["entityId"], "revoked": False, "reason": "Not found"}
+                )
+                continue
+
+            with self._lock:
+                assertion["revoked"] = True
+                assertion["revocationReason"] = row.get("revocationReason")
+            results.append({"entityId": row["entityId"], "revoked": True})
+
+        return self._result(results)
+
+    def _get_assertion(self, path, query, data, eid):
+        return self._result([self._get(self.assertions, eid)])
+
+    def _delete_assertion(self, path, query, data, eid):
+        assertion = self._get(self.assertions, eid)
+        with self._lock:
+            assertion["revoked"] = True
+
+        return self._result([])
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    # Keep connections alive like badgr-server behind a proxy
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, don't delay the body
+    disable_nagle_algorithm = True
+
+    # Set on the subclass created for each server
+    fake = None
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        status, payload, headers = self.fake.handle(
+            self.command, self.path, body, self.headers.get("Content-Type")
+        )
+        content = json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        # Keep test and benchmark output clean
+        pass
@@ -0,0 +1,132 @@
+import binascii
+import os
+import uuid
+from typing import AsyncIterator, Iterator
+from .exceptions import BadgrClientError
+
+IMAGE_MIME_TYPES = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+}
+
+# Bytes of the file encoded at a time, a multiple of 3 so that chunks encode
+# without base64 padding
+CHUNK_SIZE = 3 * 64 * 1024
+
+
+class ImageFile:
+    def __init__(self, file_path: str, chunk_size: int = CHUNK_SIZE):
+        """An image on disk to send as a base64 data-uri, encoded chunk by chunk
+        while the request body is sent instead of being held in memory. Pass
+        it as the image of a model's create method, see
+        :func:`~badgrclient.badgrclient.BadgrClient.encode_image`
+
+        Args:
+            file_path (str): Path of the png or svg image
+            chunk_size (int, optional): Bytes of the file read at a time,
+                rounded down to a multiple of 3. Defaults to 192KiB.
+
+        Raises:
+            BadgrClientError: Image format not supported
+            FileNotFoundError: The file doesn't exist
+        """
+        extension = file_path.split(".")[-1]
+        mime_type = IMAGE_MIME_TYPES.get(extension)
+
+        if not mime_type:
+            raise BadgrClientError("Image format {} not supported".format(extension))
+
+        self.file_path = file_path
+        self.chunk_size = max(chunk_size // 3, 1) * 3
+        self.prefix = "data:{};base64,".format(mime_type).encode("ascii")
+        self.size = os.path.getsize(file_path)
+
+    def __len__(self):
+        """Length of the data-uri"""
+        return len(self.prefix) + (self.size + 2) // 3 * 4
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Generate the data-uri in chunks, reading the file as it goes"""
+        yield self.prefix
+
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+
+        with open(self.file_path, "rb") as img_f:
+            while True:
+                read = img_f.readinto(buffer)
+                if not read:
+                    break
+
+                yield binascii.b2a_base64(view[:read], newline=False)
+
+    def data_uri(self) -> str:
+        """Encode the whole data-uri string. The chunks are encoded into a single
+        buffer of the final size, so only the encoded image and the returned
+        string are held in memory, never the raw file.
+        """
+        encoded = bytearray(len(self))
+        offset = 0
+
+        for chunk in self:
+            encoded[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+
+        return encoded.decode("ascii")
+
+    def __repr__(self):
+        return "ImageFile({})".format(self.file_path)
+
+
+class JSONStream:
+    def __init__(self, data: dict, codec):
+        """JSON request body streaming the ImageFile values of data from disk.
+        It has a length, so the request is sent with a Content-Length rather
+        than chunked, and can be iterated again to retry it.
+
+        Args:
+            data (dict): The body, ImageFiles are only looked up in its values
+            codec (JSONCodec): Codec to encode the rest of the body with
+        """
+        images = {}
+        placeholders = {}
+
+        for key, value in data.items():
+            if isinstance(value, ImageFile):
+                placeholder = "badgrclient-image-{}".format(uuid.uuid4().hex)
+                images[placeholder] = value
+                placeholders[key] = placeholder
+
+        encoded = codec.dumps(dict(data, **placeholders))
+
+        # Split the encoded body around the placeholders, quotes kept
+        self._parts = []
+        for placeholder, image in images.items():
+            marker = placeholder.encode("ascii")
+            before, encoded = encoded.split(marker, 1)
+            self._parts.extend((before, image))
+        self._parts.append(encoded)
+
+    def __len__(self):
+        return sum(len(part) for part in self._parts)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for part in self._parts:
+            if isinstance(part, ImageFile):
+                yield from part
+            else:
+                yield part
+
+    async def aiter(self) -> AsyncIterator[bytes]:
+        """Generate the body for httpx's AsyncClient. The file is read in the
+        event loop, a chunk at a time.
+        """
+        for chunk in self:
+            yield chunk
+
+
+def has_image_file(data) -> bool:
+    """Whether a request body has ImageFile values to stream"""
+    return isinstance(data, dict) and any(
+        isinstance(value, ImageFile) for value in data.values()
+    )
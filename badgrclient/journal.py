@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import threading
+from .exceptions import APIError
+
+Logger = logging.getLogger("badgrclient")
+
+
+class IssuanceJournal:
+    def __init__(self, path: str, fsync: bool = False):
+        """Append-only journal of bulk issuance, to resume an interrupted
+        :func:`~badgrclient.badgrclient.BadgrClient.issue_many` run without
+        issuing duplicate assertions. Pass the same journal to the run restarting
+        the job.
+
+        An intent is written before each assertion is created and its outcome
+        once the request completes, one JSON object per line. On restart,
+        recipients with a recorded assertion are skipped and only those whose
+        request was in flight are looked up on the server.
+
+        Args:
+            path (str): Path of the journal file, created if it doesn't exist
+            fsync (bool, optional): Flush every record to disk, slower but
+                survives an OS crash. Defaults to False.
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # Assertions entityId by (badgeclass, recipient)
+        self._issued = {}
+        # Intents without an outcome, their assertion may exist
+        self._in_doubt = set()
+        self._replay()
+        self._file = open(path, "a", encoding="utf-8")
+        self._end_torn_line()
+
+    def _replay(self):
+        """Rebuild the state of the journal from its file"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line may be partial after a crash
+                    Logger.debug("Skipping journal line: {}".format(line))
+                    continue
+
+                self._apply(record)
+
+    def _end_torn_line(self):
+        """Terminate a partial last line left by a crash, or the next record
+        would be appended to it and skipped by the next replay
+        """
+        if not os.path.getsize(self.path):
+            return
+
+        with open(self.path, "rb") as journal:
+            journal.seek(-1, os.SEEK_END)
+            torn = journal.read(1) != b"\n"
+
+        if torn:
+            self._file.write("\n")
+            self._file.flush()
+
+    def _apply(self, record: dict):
+        key = (record["badgeclass"], record["recipient"])
+        event = record["event"]
+
+        if event == "intent":
+            self._in_doubt.add(key)
+        elif event == "issued":
+            self._in_doubt.discard(key)
+            self._issued[key] = record["assertion"]
+        elif event == "failed":
+            self._in_doubt.discard(key)
+
+    def _append(self, record: dict):
+        line = json.dumps(record) + "\n"
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+            self._apply(record)
+
+    def issued(self, badge_eid: str, recipient: str):
+        """Get the assertion recorded for a recipient
+
+        Args:
+            badge_eid (str): entityId of the badgeclass
+            recipient (str): Recipient email
+
+        Returns:
+            str: entityId of the assertion, None if none was recorded
+        """
+        return self._issued.get((badge_eid, recipient))
+
+    def in_doubt(self, badge_eid: str, recipient: str) -> bool:
+        """Whether a recipient's request was interrupted, the assertion may or
+        may not have been created
+        """
+        return (badge_eid, recipient) in self._in_doubt
+
+    def record_intent(self, badge_eid: str, recipient: str):
+        """Record that an assertion is about to be created"""
+        self._append(
+            {"event": "intent", "badgeclass": badge_eid, "recipient": recipient}
+        )
+
+    def record_issued(self, badge_eid: str, recipient: str, assertion_eid: str):
+        """Record the assertion created for a recipient"""
+        self._append(
+            {
+                "event": "issued",
+                "badgeclass": badge_eid,
+                "recipient": recipient,
+                "assertion": assertion_eid,
+            }
+        )
+
+    def record_error(self, badge_eid: str, recipient: str, error: Exception):
+        """Record that creating an assertion failed. Only errors returned by
+        the API are recorded, after other errors (e.g. timeouts) the assertion
+        may have been created so the intent stays in doubt.
+        """
+        if not isinstance(error, APIError):
+            return
+
+        self._append(
+            {
+                "event": "failed",
+                "badgeclass": badge_eid,
+                "recipient": recipient,
+                "error": str(error),
+            }
+        )
+
+    def close(self):
+        """Close the journal file"""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
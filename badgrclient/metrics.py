@@ -0,0 +1,241 @@
+import re
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from .exceptions import BadgrClientError
+
+# Path segments followed by an entityId
+_EID_SEGMENT = re.compile(
+    r"/(issuers|badgeclasses|assertions|collections)/(?!revoke(?:/|$))[^/]+"
+)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Get the endpoint of a request with entityIds replaced by {eid}, to group
+    requests by endpoint, e.g. /v2/badgeclasses/{eid}/assertions
+
+    Args:
+        endpoint (str): Endpoint or absolute url (e.g. a next page link)
+    """
+    path = urlsplit(endpoint).path
+
+    return _EID_SEGMENT.sub(r"/\1/{eid}", path)
+
+
+class RequestEvent:
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "status",
+        "bytes_sent",
+        "bytes_received",
+        "ttfb",
+        "duration",
+        "retries",
+        "error",
+        "_started",
+    )
+
+    def __init__(self, method: str, endpoint: str):
+        """Measurements of an API request, passed to the client's request_hooks
+        once it completes
+
+        Attributes:
+            method (str): HTTP method
+            endpoint (str): Endpoint template, see
+                :func:`~badgrclient.metrics.endpoint_template`
+            status (int): Status code of the last response, None if none was
+                received
+            bytes_sent (int): Size of the request body
+            bytes_received (int): Size of the last response body
+            ttfb (float): Seconds until the headers of the last response were
+                received, None if the transport doesn't report it
+            duration (float): Seconds spent on the request, retries included
+            retries (int): Number of retries
+            error (Exception): The error raised by the request, if any
+        """
+        self.method = method
+        self.endpoint = endpoint_template(endpoint)
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.ttfb = None
+        self.duration = None
+        self.retries = 0
+        self.error = None
+        self._started = time.perf_counter()
+
+    def finish(self, response=None, error: Exception = None, ttfb: float = None):
+        """Record the outcome of the request
+
+        Args:
+            response (requests.Response or httpx.Response, optional): The last
+                response received
+            error (Exception, optional): The error raised by the request
+            ttfb (float, optional): Seconds until the response headers
+        """
+        self.duration = time.perf_counter() - self._started
+        self.error = error
+        self.ttfb = ttfb
+
+        if response is not None:
+            self.status = response.status_code
+            self.bytes_received = len(response.content)
+
+    def span_attributes(self) -> dict:
+        """Get the attributes of the request's tracing span"""
+        attributes = {
+            "http.method": self.method,
+            "badgr.endpoint": self.endpoint,
+            "badgr.payload_size": self.bytes_sent,
+            "badgr.response_size": self.bytes_received,
+            "badgr.retries": self.retries,
+        }
+        if self.status is not None:
+            attributes["http.status_code"] = self.status
+
+        return attributes
+
+    def __repr__(self):
+        return "RequestEvent({} {} {} {:.3f}s)".format(
+            self.method, self.endpoint, self.status, self.duration or 0
+        )
+
+
+class MetricsAggregator:
+    def __init__(self, max_samples: int = 1024):
+        """In-process request hook keeping the latest durations of each endpoint
+        to compute percentiles. Safe to share between threads and clients.
+
+        Args:
+            max_samples (int, optional): Durations kept per endpoint.
+                Defaults to 1024.
+        """
+        self.max_samples = max_samples
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        key = "{} {}".format(event.method, event.endpoint)
+
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+                self._counts[key] = {"count": 0, "errors": 0, "retries": 0}
+
+            samples.append(event.duration)
+            counts = self._counts[key]
+            counts["count"] += 1
+            counts["retries"] += event.retries
+            if event.error is not None or (event.status or 0) >= 400:
+                counts["errors"] += 1
+
+    def percentile(self, key: str, q: float):
+        """Get a percentile of the durations of an endpoint
+
+        Args:
+            key (str): Method and endpoint template, e.g. 'GET /v2/issuers/{eid}'
+            q (float): The percentile, between 0 and 100
+
+        Returns:
+            float: The duration in seconds, None if there are no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+
+        if not samples:
+            return None
+
+        # Nearest rank
+        rank = max(0, int(round(q / 100 * len(samples))) - 1)
+
+        return samples[min(rank, len(samples) - 1)]
+
+    def summary(self) -> dict:
+        """Get the count, errors, retries, p50 and p99 of every endpoint, keyed
+        by method and endpoint template
+        """
+        with self._lock:
+            keys = list(self._samples)
+
+        summary = {}
+        for key in keys:
+            with self._lock:
+                stats = dict(self._counts[key])
+
+            stats["p50"] = self.percentile(key, 50)
+            stats["p99"] = self.percentile(key, 99)
+            summary[key] = stats
+
+        return summary
+
+
+class PrometheusMetrics:
+    def __init__(self, registry=None, namespace: str = "badgrclient", buckets=None):
+        """Request hook exporting request metrics to prometheus_client
+
+        Exports the badgrclient_request_duration_seconds histogram and the
+        badgrclient_request_retries_total, badgrclient_request_sent_bytes_total
+        and badgrclient_request_received_bytes_total counters, labelled by
+        method, endpoint template and status.
+
+        Args:
+            registry (CollectorRegistry, optional): Registry to register the
+                metrics in. Defaults to the global registry.
+            namespace (str, optional): Prefix of the metric names.
+                Defaults to 'badgrclient'.
+            buckets (list, optional): Histogram buckets, in seconds. Defaults
+                to the prometheus_client defaults.
+
+        Note:
+            Requires prometheus_client, install it with
+            ``pip install prometheus_client``
+        """
+        try:
+            import prometheus_client
+        except ImportError:
+            raise BadgrClientError(
+                "PrometheusMetrics requires prometheus_client, install it with "
+                "pip install prometheus_client"
+            )
+
+        labels = ("method", "endpoint", "status")
+        options = {"namespace": namespace}
+        if registry is not None:
+            options["registry"] = registry
+
+        histogram_options = dict(options)
+        if buckets is not None:
+            histogram_options["buckets"] = buckets
+
+        self.duration = prometheus_client.Histogram(
+            "request_duration_seconds",
+            "Duration of badgr API requests, retries included",
+            labels,
+            **histogram_options
+        )
+        self.retries = prometheus_client.Counter(
+            "request_retries", "Retries of badgr API requests", labels, **options
+        )
+        self.sent_bytes = prometheus_client.Counter(
+            "request_sent_bytes", "Bytes sent in request bodies", labels, **options
+        )
+        self.received_bytes = prometheus_client.Counter(
+            "request_received_bytes",
+            "Bytes received in response bodies",
+            labels,
+            **options
+        )
+
+    def __call__(self, event: RequestEvent):
+        status = str(event.status) if event.status else type(event.error).__name__
+        labels = (event.method, event.endpoint, status)
+
+        self.duration.labels(*labels).observe(event.duration)
+        self.retries.labels(*labels).inc(event.retries)
+        self.sent_bytes.labels(*labels).inc(event.bytes_sent)
+        self.received_bytes.labels(*labels).inc(event.bytes_received)
@@ -0,0 +1,177 @@
+import sqlite3
+import threading
+import time
+
+
+class BadgeNameIndex:
+    def __init__(self):
+        """In-memory index of badge names to entityIds, per issuer. This is the
+        index used by clients with unique_badge_names enabled by default.
+        """
+        self._names = {}
+        self._loaded_at = {}
+        self._lock = threading.Lock()
+
+    def get(self, issuer_eid: str, badge_name: str):
+        """Get the entityId of a badge
+
+        Args:
+            issuer_eid (str): entityId of the issuer
+            badge_name (str): Name of the badge
+
+        Returns:
+            str: entityId of the badge, None if it isn't indexed
+        """
+        return self._names.get(issuer_eid, {}).get(badge_name)
+
+    def add(self, issuer_eid: str, badge_name: str, eid: str):
+        """Add a single badge to the index
+
+        Args:
+            issuer_eid (str): entityId of the issuer
+            badge_name (str): Name of the badge
+            eid (str): entityId of the badge
+        """
+        with self._lock:
+            self._names.setdefault(issuer_eid, {})[badge_name] = eid
+
+    def replace(self, issuer_eid: str, names: dict):
+        """Replace the badges of an issuer after it was (re)loaded
+
+        Args:
+            issuer_eid (str): entityId of the issuer
+            names (dict): Names of all the issuer's badges mapped to their entityId
+        """
+        with self._lock:
+            self._names[issuer_eid] = dict(names)
+            self._loaded_at[issuer_eid] = time.time()
+
+    def loaded_at(self, issuer_eid: str):
+        """Get when an issuer was last fully loaded
+
+        Args:
+            issuer_eid (str): entityId of the issuer
+
+        Returns:
+            float: Timestamp of the last load, None if it was never loaded
+        """
+        return self._loaded_at.get(issuer_eid)
+
+
+class SQLiteBadgeNameIndex(BadgeNameIndex):
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS badge_names (
+        issuer TEXT NOT NULL,
+        name TEXT NOT NULL,
+        eid TEXT NOT NULL,
+        PRIMARY KEY (issuer, name)
+    );
+    CREATE TABLE IF NOT EXISTS issuers (
+        issuer TEXT PRIMARY KEY,
+        loaded_at REAL NOT NULL,
+        version INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, path: str):
+        """Badge name index persisted in a SQLite database, so short-lived
+        processes can resolve badge names without loading every issuer's
+        badgeclasses first. The database is opened on first use.
+
+        Args:
+            path (str): Path of the database file, shared by every process
+                using the index
+        """
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create its tables on first use"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+
+        return self._conn
+
+    def _fetchone(self, query: str, args: tuple):
+        with self._lock:
+            return self._connect().execute(query, args).fetchone()
+
+    def get(self, issuer_eid: str, badge_name: str):
+        row = self._fetchone(
+            "SELECT eid FROM badge_names WHERE issuer = ? AND name = ?",
+            (issuer_eid, badge_name),
+        )
+
+        return row[0] if row else None
+
+    def add(self, issuer_eid: str, badge_name: str, eid: str):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO badge_names VALUES (?, ?, ?)",
+                (issuer_eid, badge_name, eid),
+            )
+
+    def replace(self, issuer_eid: str, names: dict):
+        """Replace the badges of an issuer after it was (re)loaded. Only the
+        rows that changed are written, in a single transaction.
+
+        Args:
+            issuer_eid (str): entityId of the issuer
+            names (dict): Names of all the issuer's badges mapped to their entityId
+        """
+        with self._lock, self._connect() as conn:
+            indexed = dict(
+                conn.execute(
+                    "SELECT name, eid FROM badge_names WHERE issuer = ?",
+                    (issuer_eid,),
+                )
+            )
+
+            conn.executemany(
+                "DELETE FROM badge_names WHERE issuer = ? AND name = ?",
+                [(issuer_eid, name) for name in indexed if name not in names],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO badge_names VALUES (?, ?, ?)",
+                [
+                    (issuer_eid, name, eid)
+                    for name, eid in names.items()
+                    if indexed.get(name) != eid
+                ],
+            )
+            conn.execute(
+                """INSERT INTO issuers VALUES (?, ?, 1)
+                ON CONFLICT (issuer) DO UPDATE SET
+                    loaded_at = excluded.loaded_at, version = version + 1""",
+                (issuer_eid, time.time()),
+            )
+
+    def loaded_at(self, issuer_eid: str):
+        row = self._fetchone(
+            "SELECT loaded_at FROM issuers WHERE issuer = ?", (issuer_eid,)
+        )
+
+        return row[0] if row else None
+
+    def version(self, issuer_eid: str) -> int:
+        """Get how many times an issuer was loaded into the index
+
+        Args:
+            issuer_eid (str): entityId of the issuer
+        """
+        row = self._fetchone(
+            "SELECT version FROM issuers WHERE issuer = ?", (issuer_eid,)
+        )
+
+        return row[0] if row else 0
+
+    def close(self):
+        """Close the database, it's reopened if the index is used again"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
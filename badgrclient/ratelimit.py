@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict
+
+READ_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+def classify_method(method: str, endpoint: str) -> str:
+    """Default budget classifier, 'read' for safe methods and 'write' otherwise"""
+    return "read" if method.upper() in READ_METHODS else "write"
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = None):
+        """Token bucket allowing rate requests per second on average and bursts
+        of up to burst requests. Safe to share between threads and tasks.
+
+        Args:
+            rate (float): Tokens added to the bucket per second
+            burst (int, optional): Capacity of the bucket. Defaults to rate
+                (at least 1).
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Take tokens from the bucket
+
+        Callers that find the bucket empty still take their tokens, putting it
+        in debt, so waiting callers are served in order without retrying.
+
+        Args:
+            tokens (int, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds to wait before the tokens can be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = None,
+        budgets: Dict[str, TokenBucket] = None,
+        classify: Callable[[str, str], str] = classify_method,
+    ):
+        """Client side rate limiter, share one instance between the clients that
+        use the same OAuth client so they share its budget
+
+        Args:
+            rate (float, optional): Overall requests per second. Defaults to None
+                (only use budgets).
+            burst (int, optional): Overall burst size. Defaults to rate.
+            budgets (dict, optional): Additional buckets per class of request,
+                e.g. ``{"write": TokenBucket(2)}``. Classes without a bucket are
+                only limited by the overall rate. Defaults to None.
+            classify (callable, optional): Maps (method, endpoint) to the class
+                of the request. Defaults to 'read' for GET/HEAD/OPTIONS and
+                'write' for everything else.
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.budgets = budgets or {}
+        self.classify = classify
+
+    def reserve(self, method: str, endpoint: str) -> float:
+        """Take a token for a request from every bucket that applies to it
+
+        Args:
+            method (str): HTTP method of the request
+            endpoint (str): Endpoint of the request
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        delay = 0.0
+
+        if self.bucket is not None:
+            delay = self.bucket.reserve()
+
+        budget = self.budgets.get(self.classify(method, endpoint))
+        if budget is not None:
+            delay = max(delay, budget.reserve())
+
+        return delay
+
+    def acquire(self, method: str, endpoint: str):
+        """Block the calling thread until the request is allowed"""
+        delay = self.reserve(method, endpoint)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, method: str, endpoint: str):
+        """Wait without blocking the event loop until the request is allowed"""
+        delay = self.reserve(method, endpoint)
+        if delay:
+            await asyncio.sleep(delay)
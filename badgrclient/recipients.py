@@ -0,0 +1,143 @@
+import threading
+from typing import Iterable
+
+# Marks a recipient whose assertion is being created
+_PENDING = object()
+
+
+def normalize_identity(identity: str) -> str:
+    """Normalize a recipient identity (e.g. an email) for comparisons"""
+    return identity.strip().lower()
+
+
+def recipient_identity(data: dict):
+    """Get the plaintext recipient identity of an assertion's data, None if
+    only its hash is known
+    """
+    recipient = data.get("recipient") or {}
+    identity = recipient.get("plaintextIdentity")
+
+    if identity is None and not recipient.get("hashed"):
+        identity = recipient.get("identity")
+
+    return identity
+
+
+class RecipientIndex:
+    def __init__(self):
+        """In-memory index of the recipients of each badgeclass, to refuse
+        issuing a badge twice to the same recipient without looking it up on
+        the server every time. Safe to share between threads.
+
+        A badgeclass's assertions are loaded the first time it's issued, after
+        that only assertions created or revoked by the client update the index.
+
+        Note:
+            Assertions with a hashed recipient identity can't be indexed, unless
+            the server also returns the plaintextIdentity
+        """
+        # Assertion entityIds keyed by normalized recipient, per badgeclass
+        self._recipients = {}
+        # Badgeclass and normalized recipient keyed by assertion entityId
+        self._assertions = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def loaded(self, badge_eid: str) -> bool:
+        """Whether the assertions of a badgeclass were loaded"""
+        return badge_eid in self._loaded
+
+    def load_lock(self, badge_eid: str) -> threading.Lock:
+        """Get the lock serializing loads of a badgeclass's assertions"""
+        with self._lock:
+            lock = self._load_locks.get(badge_eid)
+            if lock is None:
+                lock = self._load_locks[badge_eid] = threading.Lock()
+
+        return lock
+
+    def load(self, badge_eid: str, assertions: Iterable):
+        """Index the existing assertions of a badgeclass
+
+        Args:
+            badge_eid (str): entityId of the badgeclass
+            assertions (iterable): All its assertions, revoked ones are skipped
+        """
+        recipients = {}
+
+        for assertion in assertions:
+            identity = recipient_identity(assertion.data)
+            if identity and not assertion.data.get("revoked"):
+                recipients[normalize_identity(identity)] = assertion.entityId
+
+        with self._lock:
+            # Keep what was claimed or added meanwhile
+            recipients.update(self._recipients.get(badge_eid, {}))
+            self._recipients[badge_eid] = recipients
+
+            for key, eid in recipients.items():
+                if eid is not _PENDING:
+                    self._assertions[eid] = (badge_eid, key)
+            self._loaded.add(badge_eid)
+
+    def claim(self, badge_eid: str, identity: str):
+        """Check that a recipient wasn't issued a badge yet and reserve it until
+        its assertion is added or released
+
+        Args:
+            badge_eid (str): entityId of the badgeclass
+            identity (str): Recipient identity
+
+        Returns:
+            tuple: (True, None) if the recipient was claimed, (False, entityId)
+                if it already has an assertion. The entityId is None if the
+                assertion is still being created.
+        """
+        key = normalize_identity(identity)
+
+        with self._lock:
+            recipients = self._recipients.setdefault(badge_eid, {})
+            eid = recipients.get(key)
+            if eid is not None:
+                return False, None if eid is _PENDING else eid
+
+            recipients[key] = _PENDING
+
+        return True, None
+
+    def release(self, badge_eid: str, identity: str):
+        """Release a claimed recipient after its assertion couldn't be created"""
+        key = normalize_identity(identity)
+
+        with self._lock:
+            recipients = self._recipients.get(badge_eid, {})
+            if recipients.get(key) is _PENDING:
+                del recipients[key]
+
+    def add(self, badge_eid: str, identity: str, eid: str):
+        """Record the assertion of a recipient"""
+        key = normalize_identity(identity)
+
+        with self._lock:
+            self._recipients.setdefault(badge_eid, {})[key] = eid
+            self._assertions[eid] = (badge_eid, key)
+
+    def discard(self, badge_eid: str, identity: str):
+        """Forget the assertion of a recipient, e.g. after it was revoked"""
+        with self._lock:
+            eid = self._recipients.get(badge_eid, {}).pop(
+                normalize_identity(identity), None
+            )
+            self._assertions.pop(eid, None)
+
+    def discard_assertion(self, eid: str):
+        """Forget an assertion by its entityId, e.g. after it was revoked by id.
+        Does nothing if it isn't indexed.
+        """
+        with self._lock:
+            badge_eid, key = self._assertions.pop(eid, (None, None))
+            recipients = self._recipients.get(badge_eid, {})
+
+            if recipients.get(key) == eid:
+                del recipients[key]
@@ -0,0 +1,99 @@
+from collections.abc import Sequence
+from typing import List
+from .compact import COMPACT_TYPES
+
+
+class LazyResult(Sequence):
+    def __init__(self, client, rows: list):
+        """Read-only list of API results that keeps the raw JSON rows and only
+        builds model instances for the rows that are accessed. Each row's model
+        is built once, so edits to it are kept. Adding it to a list or another
+        LazyResult gives a list, use list() on it to append or sort in place.
+
+        len() and slicing don't build any models, use
+        :func:`~badgrclient.results.LazyResult.project` to read a few fields of
+        every row without building them either.
+
+        Args:
+            client (BadgrClient): The client the models are bound to
+            rows (list): The result rows from the payload
+        """
+        self.client = client
+        self.rows = rows
+        self._models = [None] * len(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyResult(self.client, self.rows[index])
+
+        model = self._models[index]
+        if model is None:
+            model = self._models[index] = self._materialize(self.rows[index])
+
+        return model
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyResult)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __add__(self, other):
+        if isinstance(other, (list, LazyResult)):
+            return list(self) + list(other)
+
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + list(self)
+
+        return NotImplemented
+
+    def __repr__(self):
+        return "[{}]".format(
+            ", ".join(
+                "{}({})".format(row.get("entityType"), row.get("entityId"))
+                for row in self.rows
+            )
+        )
+
+    def _materialize(self, row: dict):
+        """Build the model of a row, rows of unknown entityTypes are kept as is"""
+        model = self.client.MODELS.get(row.get("entityType"))
+
+        return model(self.client).set_data(row) if model else row
+
+    def compact(self, extras=()) -> list:
+        """Get memory compact, read-only copies of every row without building
+        models, to keep large listings in memory. See :mod:`~badgrclient.compact`
+
+        Args:
+            extras (iterable, optional): Names of other fields to keep besides
+                the typed ones. Defaults to none.
+
+        Returns:
+            list: CompactAssertion, CompactBadgeClass or CompactIssuer per row,
+                rows of unknown entityTypes are kept as is
+        """
+        result = []
+
+        for row in self.rows:
+            compact = COMPACT_TYPES.get(row.get("entityType"))
+            result.append(compact.from_data(row, extras) if compact else row)
+
+        return result
+
+    def project(self, *fields: str) -> List[dict]:
+        """Read only some fields of every row, without building models
+
+        Args:
+            *fields (str): The fields to keep, missing ones are set to None
+
+        Returns:
+            list: One dict per row with just the requested fields
+        """
+        return [{field: row.get(field) for field in fields} for row in self.rows]
@@ -0,0 +1,150 @@
+import datetime
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        respect_retry_after: bool = True,
+        jitter: bool = True,
+    ):
+        """Retry policy for transient API and connection errors
+
+        Args:
+            total (int, optional): Maximum number of retries of a request.
+                Defaults to 3.
+            backoff_factor (float, optional): Base of the exponential backoff,
+                the nth retry waits up to backoff_factor * 2 ** n seconds.
+                Defaults to 0.5.
+            max_backoff (float, optional): Maximum backoff in seconds, also the
+                longest Retry-After waited for. Defaults to 30.
+            status_forcelist (tuple, optional): Status codes to retry.
+                Defaults to (429, 502, 503, 504).
+            allowed_methods (tuple, optional): Idempotent methods that are always
+                retried. Other methods are only retried when the request is
+                marked idempotent. Defaults to GET, HEAD, OPTIONS, PUT and DELETE.
+            respect_retry_after (bool, optional): Wait as long as the Retry-After
+                header asks to. A response asking to wait longer than
+                max_backoff isn't retried, it's returned to the caller.
+                Defaults to True.
+            jitter (bool, optional): Randomize the backoff ("full jitter") so
+                clients don't retry in lockstep. Defaults to True.
+
+        Note:
+            Retry counts are recorded in
+            :attr:`~badgrclient.retry.RetryPolicy.stats`
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = frozenset(m.upper() for m in allowed_methods)
+        self.respect_retry_after = respect_retry_after
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the retry counters"""
+        with self._lock:
+            self.stats = {
+                # Number of retries sent
+                "retries": 0,
+                # Number of requests that failed after exhausting their retries
+                "exhausted": 0,
+                # Number of retries by status code, or exception name
+                "reasons": {},
+            }
+
+    def get_retry_delay(
+        self, method: str, attempt: int, idempotent=False, response=None, error=None
+    ):
+        """Get the seconds to wait before retrying a request, or None if it
+        shouldn't be retried
+
+        Args:
+            method (str): HTTP method of the request
+            attempt (int): Number of retries already sent for this request
+            idempotent (bool): Whether the request can safely be sent again
+                whatever its method
+            response (optional): The response that was received
+            error (Exception, optional): The connection error that was raised
+        """
+        if error is not None:
+            reason = type(error).__name__
+        elif response.status_code in self.status_forcelist:
+            reason = response.status_code
+        else:
+            return None
+
+        if not (idempotent or method.upper() in self.allowed_methods):
+            return None
+
+        if attempt >= self.total:
+            self._record("exhausted")
+            return None
+
+        retry_after = None
+        if response is not None and self.respect_retry_after:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+        # Don't block the caller for as long as the server likes
+        if retry_after is not None and retry_after > self.max_backoff:
+            return None
+
+        self._record("retries", reason)
+
+        if retry_after is not None:
+            return retry_after
+
+        return self.get_backoff(attempt)
+
+    def get_backoff(self, attempt: int) -> float:
+        """Get the exponential backoff before retry number attempt + 1"""
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+
+        if self.jitter:
+            return random.uniform(0, backoff)
+
+        return backoff
+
+    def _record(self, counter: str, reason=None):
+        with self._lock:
+            self.stats[counter] += 1
+            if reason is not None:
+                reasons = self.stats["reasons"]
+                reasons[reason] = reasons.get(reason, 0) + 1
+
+
+def parse_retry_after(value: str):
+    """Parse a Retry-After header into seconds to wait
+
+    Args:
+        value (str): Delay in seconds or an HTTP date
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    return max((retry_at - now).total_seconds(), 0)
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from .exceptions import BadgrClientError
+
+
+def token_key(base_url: str, client_id: str, username: str, scope: str) -> str:
+    """Get the key tokens are stored under, tokens are only shared between
+    clients of the same server, OAuth client, user and scope
+    """
+    return json.dumps([base_url, client_id, username, scope])
+
+
+class TokenStore:
+    def __init__(self):
+        """In-memory store of access tokens, share it between the clients of a
+        process so only the first one logs in. Safe to share between threads.
+
+        Tokens are dicts with the access_token, refresh_token and expires_at,
+        a timestamp.
+        """
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key: str):
+        """Get a stored token
+
+        Args:
+            key (str): The key of the token, see
+                :func:`~badgrclient.tokenstore.token_key`
+
+        Returns:
+            dict: The token, None if there is none
+        """
+        return self._tokens.get(key)
+
+    def set(self, key: str, token: dict):
+        """Store a token
+
+        Args:
+            key (str): The key of the token
+            token (dict): The access_token, refresh_token and expires_at
+        """
+        with self._lock:
+            self._tokens[key] = dict(token)
+
+    def delete(self, key: str):
+        """Forget a token, e.g. after it was rejected"""
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    @contextmanager
+    def lock(self, key: str):
+        """Hold the lock of a key while logging in or refreshing its token, so
+        only one client does it and the others reuse the new token
+        """
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+
+        with lock:
+            yield
+
+    @staticmethod
+    def valid(token: dict, skew: float = 0) -> bool:
+        """Whether a token is still valid for at least skew seconds"""
+        return bool(token) and token["expires_at"] - skew > time.time()
+
+
+class FileTokenStore(TokenStore):
+    def __init__(self, path: str):
+        """Store of access tokens in a JSON file, shared between processes
+        (e.g. the workers of a prefork server or cron jobs). Logins and refreshes
+        hold an exclusive lock on path + '.lock', so a single process renews a
+        token and the others pick it up.
+
+        Args:
+            path (str): Path of the token file, created if it doesn't exist
+
+        Note:
+            The file holds access and refresh tokens, it's created readable by
+            its owner only. Locking requires fcntl, so a POSIX system.
+        """
+        super().__init__()
+        self.path = path
+        self.lock_path = path + ".lock"
+        # Lock file descriptor held by the current thread, if any
+        self._held = threading.local()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as token_file:
+                return json.load(token_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # Written by something else, start over
+            return {}
+
+    def _write(self, tokens: dict):
+        # Replace the file at once so readers never see a partial write
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as token_file:
+            json.dump(tokens, token_file)
+
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str):
+        return self._read().get(key)
+
+    def set(self, key: str, token: dict):
+        with self._file_lock():
+            tokens = self._read()
+            tokens[key] = dict(token)
+            self._write(tokens)
+
+    def delete(self, key: str):
+        with self._file_lock():
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._write(tokens)
+
+    @contextmanager
+    def lock(self, key: str):
+        with super().lock(key), self._file_lock():
+            yield
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the lock file. The file is opened by each
+        thread, so the lock also excludes the other threads of this process.
+        Reentrant, e.g. to store a token while holding a key's lock.
+        """
+        if getattr(self._held, "fd", None) is not None:
+            yield
+            return
+
+        try:
+            import fcntl
+        except ImportError:
+            raise BadgrClientError("FileTokenStore requires fcntl (a POSIX system)")
+
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._held.fd = fd
+            yield
+        finally:
+            self._held.fd = None
+            # Closing the file releases the lock
+            os.close(fd)
@@ -0,0 +1,85 @@
+import functools
+import inspect
+from contextlib import nullcontext
+
+# Entered instead of a span when no tracer is configured
+_NO_SPAN = nullcontext()
+
+
+def start_span(client, name: str, attributes: dict = None):
+    """Start a span with the client's tracer, nested in the current one
+
+    Args:
+        client (BadgrClient): The client whose tracer to use
+        name (str): Name of the span
+        attributes (dict, optional): Attributes of the span
+
+    Returns:
+        A context manager giving the span, or None if the client has no tracer
+    """
+    tracer = _tracer(client)
+    if tracer is None:
+        return _NO_SPAN
+
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def _entity_attributes(obj) -> dict:
+    """Span attributes of a model, or of a client (empty)"""
+    attributes = {}
+
+    entity_type = getattr(obj, "ENTITY_TYPE", None)
+    if entity_type:
+        attributes["badgr.entity_type"] = entity_type
+
+    if getattr(obj, "entityId", None):
+        attributes["badgr.entity_id"] = obj.entityId
+
+    return attributes
+
+
+def _tracer(obj):
+    """Get the tracer of a client, or of the client of a model"""
+    return getattr(getattr(obj, "client", obj), "tracer", None)
+
+
+def traced(func):
+    """Decorate a model or client method to run it in a span named after the
+    class and method (e.g. BadgeClass.issue), with the entity type and entityId
+    of the model as attributes. Without a tracer the only overhead is one
+    attribute lookup.
+
+    Note:
+        The tracer is duck-typed on OpenTelemetry's ``Tracer``, only its
+        ``start_as_current_span(name, attributes=...)`` method is used
+
+    """
+
+    def span(self):
+        name = "{}.{}".format(type(self).__name__, func.__name__)
+        return _tracer(self).start_as_current_span(
+            name, attributes=_entity_attributes(self)
+        )
+
+    # Look through decorators like eid_required for coroutine functions
+    if inspect.iscoroutinefunction(inspect.unwrap(func)):
+
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if _tracer(self) is None:
+                return await func(self, *args, **kwargs)
+
+            with span(self):
+                return await func(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _tracer(self) is None:
+            return func(self, *args, **kwargs)
+
+        with span(self):
+            return func(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,45 @@
+import socket
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def keepalive_socket_options(idle: int) -> list:
+    """Socket options enabling TCP keep-alive probes on pooled connections
+
+    Args:
+        idle (int): Seconds a connection stays idle before probes are sent
+    """
+    options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+
+    # Not every platform lets us tune the probe timings
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle))
+
+    return options
+
+
+class PoolAdapter(HTTPAdapter):
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(self, socket_options: list = None, **kwargs):
+        """HTTPAdapter that can set socket options on its pooled connections
+
+        Args:
+            socket_options (list, optional): Options passed to urllib3 for every
+                new connection. Defaults to urllib3's defaults.
+            **kwargs: Passed to requests.adapters.HTTPAdapter
+        """
+        # Set before HTTPAdapter.__init__ calls init_poolmanager
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+
+        super().init_poolmanager(*args, **kwargs)
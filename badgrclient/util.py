@@ -1,4 +1,10 @@
 import functools
+import queue
+import threading
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+# Marks the end of a prefetched iterable
+_DONE = object()
 
 
 def eid_required(func):
@@ -10,3 +16,86 @@ def eid_required(func):
             raise Exception("entityId is required for this operation")
 
     return check_id
+
+
+def prefetch(iterable: Iterable, depth: int) -> Iterator:
+    """Consume iterable in a background thread, keeping up to depth items
+    ready ahead of the caller
+
+    Args:
+        iterable (iterable): The iterable to consume, e.g. a page generator
+        depth (int): Maximum number of items to read ahead
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        # Give up once the caller stopped iterating
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as err:
+            put((_DONE, err))
+        else:
+            put((_DONE, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    try:
+        while True:
+            item, err = items.get()
+            if item is _DONE:
+                if err:
+                    raise err
+                return
+
+            yield item
+    finally:
+        stop.set()
+
+
+async def aprefetch(iterable: AsyncIterable, depth: int) -> AsyncIterator:
+    """Consume an async iterable in a background task, keeping up to depth
+    items ready ahead of the caller
+
+    Args:
+        iterable (async iterable): The iterable to consume
+        depth (int): Maximum number of items to read ahead
+    """
+    import asyncio
+
+    items = asyncio.Queue(maxsize=depth)
+
+    async def produce():
+        try:
+            async for item in iterable:
+                await items.put((item, None))
+        except Exception as err:
+            await items.put((_DONE, err))
+        else:
+            await items.put((_DONE, None))
+
+    task = asyncio.get_running_loop().create_task(produce())
+
+    try:
+        while True:
+            item, err = await items.get()
+            if item is _DONE:
+                if err:
+                    raise err
+                return
+
+            yield item
+    finally:
+        task.cancel()
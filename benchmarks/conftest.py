@@ -0,0 +1,23 @@
+import pytest
+from badgrclient import BadgrClient
+from badgrclient.fakeserver import FakeBadgrServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeBadgrServer() as server:
+        issuer = server.add_issuer()
+        badge = server.add_badgeclass(issuer["entityId"])
+        server.add_assertions(badge["entityId"], 1000)
+        server.issuer_eid = issuer["entityId"]
+        server.badge_eid = badge["entityId"]
+
+        yield server
+
+
+@pytest.fixture(scope="module")
+def client(server):
+    with BadgrClient("user", "pass", "client", base_url=server.url) as client:
+        client._get_auth_token()
+
+        yield client
@@ -0,0 +1,53 @@
+import json
+import tracemalloc
+import pytest
+
+
+@pytest.fixture(scope="module")
+def payload(server):
+    """Raw JSON of a page of 1000 assertions"""
+    result = list(server.assertions.values())
+
+    return json.dumps({"status": {"success": True}, "result": result}).encode()
+
+
+def load_models(client, payload):
+    return list(client._deserialize(client.json_codec.loads(payload)["result"]))
+
+
+def load_compact(client, payload):
+    return client._deserialize(client.json_codec.loads(payload)["result"]).compact()
+
+
+def test_deserialize(benchmark, client, payload):
+    models = benchmark(load_models, client, payload)
+
+    assert len(models) == 1000
+
+
+def test_deserialize_compact(benchmark, client, payload):
+    compact = benchmark(load_compact, client, payload)
+
+    assert len(compact) == 1000
+
+
+@pytest.mark.parametrize("load", [load_models, load_compact], ids=["model", "compact"])
+def test_memory_per_model(benchmark, client, payload, load):
+    """Bytes allocated per entity still alive after loading them, recorded in
+    the extra_info of the report
+    """
+
+    def measure():
+        tracemalloc.start()
+        try:
+            entities = load(client, payload)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return size / len(entities)
+
+    per_model = benchmark.pedantic(measure, rounds=3)
+
+    benchmark.extra_info["bytes_per_model"] = round(per_model)
+    assert per_model > 0
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+
+def import_client():
+    subprocess.run(
+        [sys.executable, "-c", "from badgrclient import BadgrClient"], check=True
+    )
+
+
+def test_import_time(benchmark):
+    """Time of a fresh interpreter importing the client, the interpreter's own
+    startup included
+    """
+    benchmark.pedantic(import_client, rounds=10)
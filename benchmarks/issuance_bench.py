@@ -0,0 +1,27 @@
+import itertools
+from badgrclient import BadgeClass
+
+_emails = ("bench{}@example.com".format(i) for i in itertools.count())
+
+
+def test_single_issuance(benchmark, client, server):
+    badge = BadgeClass(client, server.badge_eid)
+
+    assertion = benchmark(lambda: badge.issue(next(_emails), notify=False))
+
+    assert assertion.entityId in server.assertions
+
+
+def test_bulk_issuance(benchmark, client, server):
+    badge = BadgeClass(client, server.badge_eid)
+    count = 200
+
+    def issue():
+        return badge.issue_many(
+            [next(_emails) for _ in range(count)], concurrency=8, notify=False
+        )
+
+    results = benchmark.pedantic(issue, rounds=5)
+
+    assert all(result.ok for result in results)
+    benchmark.extra_info["assertions_per_round"] = count
@@ -0,0 +1,20 @@
+from badgrclient import BadgeClass
+
+
+def test_listing(benchmark, client, server):
+    badge = BadgeClass(client, server.badge_eid)
+
+    assertions = benchmark(lambda: list(badge.iter_assertions(page_size=100)))
+
+    assert len(assertions) >= 1000
+    benchmark.extra_info["assertions_per_round"] = len(assertions)
+
+
+def test_listing_prefetch(benchmark, client, server):
+    badge = BadgeClass(client, server.badge_eid)
+
+    assertions = benchmark(
+        lambda: list(badge.iter_assertions(page_size=100, prefetch=2))
+    )
+
+    assert len(assertions) >= 1000
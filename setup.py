@@ -34,5 +34,10 @@ setuptools.setup(
     ],
     license="GNU General Public License v3.0",
     install_requires=get_requires(),
+    extras_require={
+        "async": ["httpx"],
+        "orjson": ["orjson"],
+        "prometheus": ["prometheus_client"],
+    },
     test_requires=get_requires(test=True),
 )
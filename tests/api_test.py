@@ -1,15 +1,20 @@
+import datetime
 import pytest
+import requests
+import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from badgrclient import BadgrClient, Issuer, BadgeClass, Assertion
-from badgrclient.exceptions import BadgrClientError
+from badgrclient.retry import RetryPolicy, parse_retry_after
+from badgrclient.transport import PoolAdapter
+from badgrclient.exceptions import APIError, BadgrClientError
 from pathlib import Path
+from tests.conftest import TEST_PASSWORD, TEST_USER, TOKEN_URL, get_mock_auth_text
 
 
-TOKEN_URL = "http://localhost:8000/o/token"
 TEST_IMAGE_PATH_PNG = str(Path("tests/test_image.png"))
 TEST_IMAGE_PATH_SVG = str(Path("tests/test_image.svg"))
-TEST_USER = "test"
-TEST_PASSWORD = "test_pass"
 
 
 def get_badgeclass_data(**kwargs):
@@ -37,35 +42,140 @@ def get_badgeclass_data(**kwargs):
     return data
 
 
-def get_mock_auth_text(token: str = "mock_token", expiry: int = 86400):
-    return '{{"access_token": "{}", "expires_in": {}, \
-        "token_type": "Bearer","scope": "rw:profile rw:issuer rw:backpack",\
-        "refresh_token": "mock_refresh_token"}}'.format(
-        token, expiry
-    )
+def test_client_init(client, mocker):
+    """Test client instance is correctly created"""
+
+    assert client.scope == "rw:profile rw:issuer rw:backpack"
+    assert client.refresh_token == "mock_refresh_token"
+    assert client.base_url == "http://localhost:8000"
+    assert client.header == {"Authorization": "Bearer mock_token"}
+
+
+def test_client_pool_options(client_factory):
+    client = client_factory(pool_maxsize=32, pool_block=True, tcp_keepalive=30)
+    adapter = client.session.get_adapter("https://badgr.io")
+    pool_kw = adapter.poolmanager.connection_pool_kw
+
+    assert pool_kw["maxsize"] == 32
+    assert pool_kw["block"] is True
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in pool_kw["socket_options"]
+
+
+def test_client_shared_session(client_factory, requests_mock, mocker):
+    requests_mock.get("http://localhost:8000/v2/issuers", text='{"result": []}')
+    session = requests.Session()
+    mocker.spy(session, "close")
+    mocker.spy(session, "post")
+
+    with client_factory(session=session) as client:
+        client.fetch_issuer()
+
+    assert client.session is session
+    # The token is requested with the session too
+    assert session.post.call_args[0] == (TOKEN_URL,)
+    assert requests_mock.last_request.path == "/v2/issuers"
+    session.close.assert_not_called()
+
+
+def test_client_leaves_shared_adapter_open(client_factory, mocker):
+    adapter = PoolAdapter()
+    mocker.spy(adapter, "close")
+
+    with client_factory(adapter=adapter) as client:
+        assert client.session.get_adapter("https://badgr.io") is adapter
+
+    adapter.close.assert_not_called()
+    # Only unmounted from the closed session
+    assert adapter not in client.session.adapters.values()
 
 
 @pytest.fixture
-def client(requests_mock):
-    requests_mock.post(TOKEN_URL, text=get_mock_auth_text())
+def retry_client(client_factory):
+    return client_factory(retry=RetryPolicy(total=2, backoff_factor=0))
 
-    client = BadgrClient(
-        username=TEST_USER,
-        password=TEST_PASSWORD,
-        client_id="kewl_client",
-        scope="rw:profile rw:issuer rw:backpack",
+
+def test_retry_transient_errors(retry_client, requests_mock):
+    issuers_mock = requests_mock.get(
+        "http://localhost:8000/v2/issuers",
+        [
+            {"status_code": 503, "json": {"error": "Unavailable"}},
+            {
+                "status_code": 429,
+                "json": {"error": "Throttled"},
+                "headers": {"Retry-After": "0"},
+            },
+            {"json": {"result": []}},
+        ],
     )
 
-    return client
+    assert retry_client.fetch_issuer() == []
+    assert issuers_mock.call_count == 3
+    assert retry_client.retry.stats == {
+        "retries": 2,
+        "exhausted": 0,
+        "reasons": {503: 1, 429: 1},
+    }
 
 
-def test_client_init(client, mocker):
-    """Test client instance is correctly created"""
+def test_retry_gives_up(retry_client, requests_mock):
+    issuers_mock = requests_mock.get(
+        "http://localhost:8000/v2/issuers",
+        status_code=502,
+        json={"error": "Bad gateway"},
+    )
 
-    assert client.scope == "rw:profile rw:issuer rw:backpack"
-    assert client.refresh_token == "mock_refresh_token"
-    assert client.base_url == "http://localhost:8000"
-    assert client.header == {"Authorization": "Bearer mock_token"}
+    with pytest.raises(APIError):
+        retry_client.fetch_issuer()
+
+    assert issuers_mock.call_count == 3
+    assert retry_client.retry.stats["exhausted"] == 1
+
+
+def test_retry_gives_up_on_long_retry_after(retry_client, requests_mock, mocker):
+    sleep = mocker.patch("badgrclient.badgrclient.time.sleep")
+    issuers_mock = requests_mock.get(
+        "http://localhost:8000/v2/issuers",
+        status_code=429,
+        json={"error": "Throttled"},
+        headers={"Retry-After": "3600"},
+    )
+
+    with pytest.raises(APIError):
+        retry_client.fetch_issuer()
+
+    assert issuers_mock.call_count == 1
+    sleep.assert_not_called()
+    assert retry_client.retry.stats["retries"] == 0
+
+
+def test_retry_skips_non_idempotent_post(retry_client, requests_mock):
+    create_mock = requests_mock.post(
+        "http://localhost:8000/v2/issuers",
+        status_code=503,
+        json={"error": "Unavailable"},
+    )
+
+    with pytest.raises(APIError):
+        Issuer(retry_client).create("Fedora", "Fedora Issuer", "a@b.c", "x.org")
+
+    assert create_mock.call_count == 1
+
+
+def test_retry_connection_errors(retry_client, requests_mock):
+    requests_mock.get(
+        "http://localhost:8000/v2/issuers",
+        [{"exc": requests.ConnectionError}, {"json": {"result": []}}],
+    )
+
+    assert retry_client.fetch_issuer() == []
+    assert retry_client.retry.stats["reasons"] == {"ConnectionError": 1}
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
 
 
 def test_client_credentials(mocker):
@@ -111,6 +221,102 @@ def test_token_refresh(requests_mock):
     assert client.header == {"Authorization": "Bearer refreshed_token"}
 
 
+def test_token_refresh_single_flight(client, requests_mock):
+    """Test threads sharing a client refresh an expired token only once"""
+
+    def slow_token(request, context):
+        time.sleep(0.1)
+        return get_mock_auth_text(token="refreshed_token")
+
+    token_mock = requests_mock.post(TOKEN_URL, text=slow_token)
+    requests_mock.get(
+        "http://localhost:8000/v2/backpack/assertions", text='{"result": []}'
+    )
+    client.token_expires_at = datetime.datetime.now() - datetime.timedelta(
+        seconds=1
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: client.fetch_assertion(), range(8)))
+
+    assert token_mock.call_count == 1
+    assert client.header == {"Authorization": "Bearer refreshed_token"}
+
+
+def test_token_auto_refresh(requests_mock):
+    """Test token is renewed in the background before it expires"""
+
+    token_mock = requests_mock.post(
+        TOKEN_URL,
+        [
+            {"text": get_mock_auth_text(expiry=0.6)},
+            {"text": get_mock_auth_text(token="refreshed_token")},
+        ],
+    )
+
+    with BadgrClient(
+        username=TEST_USER,
+        password=TEST_PASSWORD,
+        client_id="kewl_client",
+        auto_refresh=True,
+        refresh_skew=0.25,
+    ) as client:
+        time.sleep(0.5)
+
+        assert token_mock.call_count == 2
+        assert client.header == {"Authorization": "Bearer refreshed_token"}
+
+    assert client._refresh_timer is None
+
+
+def test_token_auto_refresh_short_lifetime(requests_mock):
+    """Test a token living less than refresh_skew is renewed at half its
+    lifetime, not over and over as soon as it's received
+    """
+
+    token_mock = requests_mock.post(TOKEN_URL, text=get_mock_auth_text(expiry=0.4))
+
+    with BadgrClient(
+        username=TEST_USER,
+        password=TEST_PASSWORD,
+        client_id="kewl_client",
+        auto_refresh=True,
+        refresh_skew=60,
+    ):
+        time.sleep(0.1)
+        assert token_mock.call_count == 1
+
+        time.sleep(0.2)
+        assert token_mock.call_count == 2
+
+
+def test_token_auto_refresh_stops_on_close(requests_mock):
+    """Test a renewal in flight when the client is closed doesn't schedule
+    another one
+    """
+
+    def token(request, context):
+        if token_mock.call_count == 2:
+            # Closed while the renewal is in flight
+            client.close()
+
+        return get_mock_auth_text(expiry=0.2)
+
+    token_mock = requests_mock.post(TOKEN_URL, text=token)
+
+    client = BadgrClient(
+        username=TEST_USER,
+        password=TEST_PASSWORD,
+        client_id="kewl_client",
+        auto_refresh=True,
+        refresh_skew=60,
+    )
+    time.sleep(0.4)
+
+    assert token_mock.call_count == 2
+    assert client._refresh_timer is None
+
+
 def test_fetch_tokens(client, mocker):
     mocker.patch("badgrclient.BadgrClient._call_api")
     client.fetch_tokens()
@@ -179,7 +385,71 @@ def test_revoke_assertions(client, mocker):
                 "revocationReason": "Revoked by badgerclient",
             },
         ],
+        idempotent=True,
+    )
+
+
+def revoke_response(request, context):
+    ids = [row["entityId"] for row in request.json()]
+    if "bad" in ids:
+        context.status_code = 400
+        return {"error": "Invalid entityId"}
+
+    return {
+        "result": [
+            {"entityId": eid, "revoked": eid != "gone", "reason": "Not found"}
+            for eid in ids
+        ]
+    }
+
+
+def test_revoke_many(client, requests_mock):
+    revoke_mock = requests_mock.post(
+        "http://localhost:8000/v2/assertions/revoke", json=revoke_response
     )
+    ids = ["a", "b", "gone", "d", "bad", "f", "g"]
+
+    results = client.revoke_many(ids, chunk_size=3, concurrency=2)
+
+    assert [r.entityId for r in results] == ids
+    assert [r.ok for r in results] == [True, True, False, True, False, True, True]
+    assert results[2].reason == "Not found"
+    assert isinstance(results[4].error, APIError)
+    # 3 chunks, then the failed one is split until "bad" is on its own
+    sent = sorted(
+        tuple(row["entityId"] for row in r.json()) for r in revoke_mock.request_history
+    )
+    assert sent == sorted(
+        [
+            ("a", "b", "gone"),
+            ("d", "bad", "f"),
+            ("g",),
+            ("d", "bad"),
+            ("f",),
+            ("d",),
+            ("bad",),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [
+        {"status_code": 503, "json": {"error": "Unavailable"}},
+        {"exc": requests.ConnectionError},
+    ],
+)
+def test_revoke_many_unavailable(client, requests_mock, failure):
+    """Test chunks failing for reasons other than their ids aren't split"""
+    revoke_mock = requests_mock.post(
+        "http://localhost:8000/v2/assertions/revoke", **failure
+    )
+    ids = [str(i) for i in range(10)]
+
+    results = client.revoke_many(ids, chunk_size=5)
+
+    assert not any(r.ok for r in results)
+    assert revoke_mock.call_count == 2
 
 
 def test_v1_create_user(client, mocker):
@@ -306,19 +576,11 @@ def test_badgeclass_fetch_assertion(client, mocker):
 
 
 @pytest.fixture
-def unique_badge_client(requests_mock):
-    requests_mock.post(TOKEN_URL, text=get_mock_auth_text())
-
-    client = BadgrClient(
-        username=TEST_USER,
-        password=TEST_PASSWORD,
-        client_id="kewl_client",
-        scope="rw:profile rw:issuer rw:backpack",
-        unique_badge_names=True,
+def unique_badge_client(client_factory):
+    return client_factory(
+        scope="rw:profile rw:issuer rw:backpack", unique_badge_names=True
     )
 
-    return client
-
 
 TEST_BADGES = [
     {"name": "Speak Up!", "entityId": "s0ziri1rZs6cNQVnHw", "issuer": "test"},
@@ -397,3 +659,186 @@ def test_create_badge_class_with_non_unique_name(loaded_badges_client):
             image="idk",
             description="something",
         )
+
+
+def test_lazy_badge_names(client_factory, requests_mock, mocker):
+    badges_mock = requests_mock.get(
+        "http://localhost:8000/v2/issuers/test/badgeclasses",
+        json={"result": [get_badgeclass_data(**data) for data in TEST_BADGES]},
+    )
+    client = client_factory(unique_badge_names=True, lazy_badge_names=True)
+
+    # Every thread misses before any of them loads the issuer
+    barrier = threading.Barrier(4, timeout=5)
+    load_lock = client._badge_load_lock
+
+    def wait_for_misses(issuer_eid):
+        barrier.wait()
+        return load_lock(issuer_eid)
+
+    mocker.patch.object(client, "_badge_load_lock", side_effect=wait_for_misses)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(client.get_eid_from_badge_name, "Speak Up!", "test")
+            for _ in range(4)
+        ]
+        eids = [future.result() for future in futures]
+
+    assert eids == [TEST_BADGES[0]["entityId"]] * 4
+    assert badges_mock.call_count == 1
+
+    # Other names missing from a freshly loaded issuer don't reload it
+    assert client.get_eid_from_badge_name("Nope", "test") is None
+    assert client.get_eid_from_badge_name("Nope again", "test") is None
+    assert badges_mock.call_count == 1
+
+    client.badge_names._loaded_at["test"] -= 31
+    # Lazy loads no longer wait for the other threads
+    mocker.stopall()
+    assert client.get_eid_from_badge_name("Nope", "test") is None
+    assert badges_mock.call_count == 2
+
+
+def test_lazy_badge_names_create(client_factory, requests_mock):
+    badges_mock = requests_mock.get(
+        "http://localhost:8000/v2/issuers/test/badgeclasses",
+        json={"result": [get_badgeclass_data(**data) for data in TEST_BADGES]},
+    )
+    requests_mock.post(
+        "http://localhost:8000/v2/badgeclasses",
+        json=lambda request, context: {
+            "result": [get_badgeclass_data(name=request.json()["name"])]
+        },
+    )
+    client = client_factory(unique_badge_names=True, lazy_badge_names=True)
+
+    for name in ("New 1", "New 2", "New 3"):
+        BadgeClass(client).create(
+            name, "image", "description", "test", criteria_text="Be new"
+        )
+
+    assert badges_mock.call_count == 1
+
+    with pytest.raises(BadgrClientError):
+        BadgeClass(client).create(
+            "Speak Up!", "image", "description", "test", criteria_text="Speak"
+        )
+
+
+def test_badgeclass_issue_many(client, requests_mock):
+    def assertion_response(request, context):
+        identity = request.json()["recipient"]["identity"]
+        if identity == "bad@test.com":
+            context.status_code = 400
+            return {"error": "Invalid recipient"}
+
+        return {
+            "result": [
+                {"entityType": "Assertion", "entityId": identity.split("@")[0]}
+            ]
+        }
+
+    requests_mock.post(
+        "http://localhost:8000/v2/badgeclasses/bc_eid/assertions",
+        json=assertion_response,
+    )
+
+    results = BadgeClass(client, eid="bc_eid").issue_many(
+        ["jane@test.com", {"recipient_email": "bad@test.com"}, "john@test.com"],
+        concurrency=2,
+        notify=False,
+    )
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[0].assertion.entityId == "jane"
+    assert results[1].recipient == {"recipient_email": "bad@test.com"}
+    assert str(results[1].error) == "Invalid recipient"
+    assert all(
+        not request.json()["notify"]
+        for request in requests_mock.request_history
+        if request.path.endswith("/assertions")
+    )
+
+
+ISSUER_ASSERTIONS_URL = "http://localhost:8000/v2/issuers/iss/assertions"
+
+
+def mock_assertion_pages(requests_mock, pages):
+    """Serve pages of assertions linked with cursors in the Link header"""
+
+    def page_response(request, context):
+        index = int(request.qs.get("cursor", ["0"])[0])
+        if index + 1 < len(pages):
+            context.headers["Link"] = '<{}?cursor={}>; rel="next"'.format(
+                ISSUER_ASSERTIONS_URL, index + 1
+            )
+
+        return {
+            "result": [
+                {"entityType": "Assertion", "entityId": eid}
+                for eid in pages[index]
+            ]
+        }
+
+    return requests_mock.get(ISSUER_ASSERTIONS_URL, json=page_response)
+
+
+def test_issuer_iter_assertions(client, requests_mock):
+    pages_mock = mock_assertion_pages(requests_mock, [["a1", "a2"], ["a3"]])
+
+    assertions = Issuer(client, "iss").iter_assertions(
+        query={"recipient": "x@y.com"}, page_size=2
+    )
+
+    assert pages_mock.call_count == 0
+    assert [a.entityId for a in assertions] == ["a1", "a2", "a3"]
+    assert pages_mock.call_count == 2
+    assert pages_mock.request_history[0].qs == {
+        "recipient": ["x@y.com"],
+        "num": ["2"],
+    }
+    assert pages_mock.request_history[1].qs == {"cursor": ["1"]}
+
+
+def test_issuer_iter_badgeclasses_loads_badge_names(
+    unique_badge_client, requests_mock
+):
+    requests_mock.get(
+        "http://localhost:8000/v2/issuers/test/badgeclasses",
+        json={"result": [get_badgeclass_data(**data) for data in TEST_BADGES]},
+    )
+
+    badges = list(Issuer(unique_badge_client, "test").iter_badgeclasses())
+
+    assert len(badges) == 2
+    assert unique_badge_client.get_eid_from_badge_name(
+        "Baby Badgr", "test"
+    ) == TEST_BADGES[1]["entityId"]
+
+
+def test_issuer_iter_assertions_prefetch(client, requests_mock):
+    pages_mock = mock_assertion_pages(
+        requests_mock, [["a1"], ["a2"], ["a3"], ["a4"]]
+    )
+
+    assertions = Issuer(client, "iss").iter_assertions(page_size=1, prefetch=2)
+
+    assert next(assertions).entityId == "a1"
+
+    # The next pages are fetched while the caller still holds the first one
+    deadline = time.time() + 2
+    while pages_mock.call_count < 3 and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert pages_mock.call_count >= 3
+    assert [a.entityId for a in assertions] == ["a2", "a3", "a4"]
+
+
+def test_prefetch_raises_page_errors(client, requests_mock):
+    requests_mock.get(
+        ISSUER_ASSERTIONS_URL, status_code=500, json={"error": "Server error"}
+    )
+
+    with pytest.raises(APIError):
+        list(Issuer(client, "iss").iter_assertions(prefetch=2))
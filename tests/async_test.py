@@ -0,0 +1,411 @@
+import asyncio
+import json
+import httpx
+import pytest
+from badgrclient import (
+    AsyncBadgrClient,
+    AsyncAssertion,
+    AsyncBadgeClass,
+    AsyncIssuer,
+)
+from badgrclient.exceptions import APIError, BadgrClientError, DuplicateAssertionError
+from badgrclient.recipients import RecipientIndex
+from badgrclient.retry import RetryPolicy
+from badgrclient.util import aprefetch
+from tests.conftest import TEST_CLIENT_ID, TEST_PASSWORD, TEST_USER, TOKEN_RESPONSE
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def make_client(calls):
+    def _make_client(routes, **kwargs):
+        def handler(request):
+            calls.append(request)
+            if request.url.path == "/o/token":
+                return httpx.Response(200, json=routes.get("/o/token", TOKEN_RESPONSE))
+
+            body = routes[request.url.path]
+            return httpx.Response(400 if "error" in body else 200, json=body)
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        return AsyncBadgrClient(
+            username=TEST_USER,
+            password=TEST_PASSWORD,
+            client_id=TEST_CLIENT_ID,
+            http_client=http_client,
+            **kwargs
+        )
+
+    return _make_client
+
+
+def test_async_client_defers_login(make_client, calls):
+    client = make_client({})
+
+    assert calls == []
+    assert client.header == {}
+
+
+def test_async_fetch_badgeclass(make_client, calls):
+    client = make_client(
+        {
+            "/v2/badgeclasses/abcd": {
+                "result": [{"entityType": "BadgeClass", "entityId": "abcd"}]
+            }
+        }
+    )
+
+    badge = run(client.fetch_badgeclass("abcd"))[0]
+
+    assert isinstance(badge, AsyncBadgeClass)
+    assert badge.entityId == "abcd"
+    assert [c.url.path for c in calls] == ["/o/token", "/v2/badgeclasses/abcd"]
+    assert calls[1].headers["Authorization"] == "Bearer mock_token"
+
+
+def test_async_badgeclass_issue(make_client, calls):
+    client = make_client(
+        {
+            "/v2/badgeclasses/abcd/assertions": {
+                "result": [{"entityType": "Assertion", "entityId": "as1"}]
+            }
+        }
+    )
+
+    assertion = run(
+        AsyncBadgeClass(client, "abcd").issue("jane@mailg.com", issued_on="dummy")
+    )
+
+    assert isinstance(assertion, AsyncAssertion)
+    assert assertion.entityId == "as1"
+    assert json.loads(calls[-1].content) == {
+        "recipient": {"type": "email", "identity": "jane@mailg.com"},
+        "narrative": None,
+        "evidence": [],
+        "notify": True,
+        "expires": None,
+        "issuedOn": "dummy",
+    }
+
+
+def test_async_load_badge_names(make_client):
+    client = make_client(
+        {
+            "/v2/issuers/test/badgeclasses": {
+                "result": [
+                    {
+                        "entityType": "BadgeClass",
+                        "entityId": "s0ziri1rZs6cNQVnHw",
+                        "name": "Speak Up!",
+                        "issuer": "test",
+                    }
+                ]
+            }
+        },
+        unique_badge_names=True,
+    )
+
+    run(client.load_badge_names("test"))
+
+    assert (
+        client.get_eid_from_badge_name("Speak Up!", "test")
+        == "s0ziri1rZs6cNQVnHw"
+    )
+
+
+def test_async_lazy_badge_names(make_client, calls):
+    client = make_client(
+        {
+            "/v2/issuers/test/badgeclasses": {
+                "result": [
+                    {
+                        "entityType": "BadgeClass",
+                        "entityId": "abcd",
+                        "name": "Speak Up!",
+                        "issuer": "test",
+                    }
+                ]
+            },
+            "/v2/badgeclasses/abcd/assertions": {
+                "result": [{"entityType": "Assertion", "entityId": "as1"}]
+            },
+        },
+        unique_badge_names=True,
+        lazy_badge_names=True,
+    )
+
+    async def issue_both():
+        return await asyncio.gather(
+            *(
+                AsyncAssertion(client).create(
+                    email, badge_name="Speak Up!", issuer_eid="test"
+                )
+                for email in ("jane@mailg.com", "john@mailg.com")
+            )
+        )
+
+    run(issue_both())
+
+    paths = [c.url.path for c in calls]
+    assert paths.count("/v2/issuers/test/badgeclasses") == 1
+    assert paths.count("/v2/badgeclasses/abcd/assertions") == 2
+
+
+def test_async_lazy_badge_names_create(make_client, calls):
+    client = make_client(
+        {
+            "/v2/issuers/test/badgeclasses": {
+                "result": [
+                    {
+                        "entityType": "BadgeClass",
+                        "entityId": "abcd",
+                        "name": "Speak Up!",
+                        "issuer": "test",
+                    }
+                ]
+            },
+            "/v2/badgeclasses": {
+                "result": [
+                    {
+                        "entityType": "BadgeClass",
+                        "entityId": "efgh",
+                        "name": "New",
+                        "issuer": "test",
+                    }
+                ]
+            },
+        },
+        unique_badge_names=True,
+        lazy_badge_names=True,
+    )
+
+    async def create(name):
+        return await AsyncBadgeClass(client).create(
+            name, "image", "description", "test", criteria_text="Be there"
+        )
+
+    run(create("New"))
+    with pytest.raises(BadgrClientError):
+        run(create("Speak Up!"))
+
+    paths = [c.url.path for c in calls]
+    assert paths.count("/v2/issuers/test/badgeclasses") == 1
+
+
+def test_async_revoke_many(make_client, calls):
+    client = make_client({"/v2/assertions/revoke": {"result": []}})
+    # The mock transport can't fail single ids, fail the chunk with "bad" instead
+    revoke_assertions = client.revoke_assertions
+
+    async def failing_revoke(ids, reason):
+        if "bad" in ids:
+            raise APIError("Invalid entityId", 400)
+        return await revoke_assertions(ids, reason)
+
+    client.revoke_assertions = failing_revoke
+
+    results = run(client.revoke_many(["a", "bad", "c", "d", "e"], chunk_size=2))
+
+    assert [r.ok for r in results] == [True, False, True, True, True]
+    assert isinstance(results[1].error, APIError)
+    revoked = sorted(
+        row["entityId"]
+        for c in calls
+        if c.url.path == "/v2/assertions/revoke"
+        for row in json.loads(c.content)
+    )
+    assert revoked == ["a", "c", "d", "e"]
+
+
+def test_async_client_issue_many(make_client, calls):
+    client = make_client(
+        {
+            "/v2/badgeclasses/abcd/assertions": {
+                "result": [{"entityType": "Assertion", "entityId": "as1"}]
+            },
+            "/v2/badgeclasses/efgh/assertions": {"error": "Not found"},
+        }
+    )
+
+    results = run(
+        client.issue_many(
+            [("abcd", "jane@test.com"), ("efgh", "john@test.com")],
+            concurrency=4,
+        )
+    )
+
+    assert results[0].ok and results[0].assertion.entityId == "as1"
+    assert not results[1].ok
+    assert str(results[1].error) == "Not found"
+
+
+def test_async_concurrent_calls_login_once(make_client, calls):
+    client = make_client({"/v2/issuers": {"result": []}})
+
+    async def fetch_all():
+        await asyncio.gather(*(client.fetch_issuer() for _ in range(5)))
+
+    run(fetch_all())
+
+    assert [c.url.path for c in calls].count("/o/token") == 1
+
+
+def test_async_token_auto_refresh(make_client, calls):
+    # Tokens living less than refresh_skew, renewed at half their lifetime
+    token = dict(TOKEN_RESPONSE, expires_in=0.1)
+    client = make_client(
+        {"/v2/issuers": {"result": []}, "/o/token": token}, auto_refresh=True
+    )
+
+    async def fetch_and_wait():
+        await client.fetch_issuer()
+        await asyncio.sleep(0.075)
+        await client.aclose()
+
+    run(fetch_and_wait())
+
+    assert [c.url.path for c in calls].count("/o/token") == 2
+    assert client._refresh_task is None
+
+
+def test_async_issuer_iter_assertions(calls):
+    def handler(request):
+        calls.append(request)
+        if request.url.path == "/o/token":
+            return httpx.Response(200, json=TOKEN_RESPONSE)
+
+        if "cursor" in request.url.params:
+            return httpx.Response(
+                200, json={"result": [{"entityType": "Assertion", "entityId": "a2"}]}
+            )
+
+        return httpx.Response(
+            200,
+            json={"result": [{"entityType": "Assertion", "entityId": "a1"}]},
+            headers={
+                "Link": '<http://localhost:8000/v2/issuers/iss/assertions'
+                '?cursor=c1>; rel="next"'
+            },
+        )
+
+    client = AsyncBadgrClient(
+        TEST_USER,
+        TEST_PASSWORD,
+        TEST_CLIENT_ID,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    async def collect():
+        return [a async for a in AsyncIssuer(client, "iss").iter_assertions()]
+
+    assertions = run(collect())
+
+    assert [a.entityId for a in assertions] == ["a1", "a2"]
+    assert str(calls[-1].url).endswith("/v2/issuers/iss/assertions?cursor=c1")
+
+
+def test_aprefetch_reads_ahead():
+    produced = []
+
+    async def pages():
+        for i in range(4):
+            produced.append(i)
+            yield i
+
+    async def consume():
+        consumed = []
+        async for page in aprefetch(pages(), 2):
+            await asyncio.sleep(0)
+            consumed.append((page, len(produced)))
+        return consumed
+
+    consumed = run(consume())
+
+    assert [page for page, _ in consumed] == [0, 1, 2, 3]
+    # Pages were produced ahead of the consumer
+    assert consumed[0][1] > 1
+
+
+def test_async_retry(calls):
+    responses = [
+        httpx.Response(503, json={"error": "Unavailable"}),
+        httpx.Response(200, json={"result": []}),
+    ]
+
+    def handler(request):
+        calls.append(request)
+        if request.url.path == "/o/token":
+            return httpx.Response(200, json=TOKEN_RESPONSE)
+
+        return responses.pop(0)
+
+    client = AsyncBadgrClient(
+        TEST_USER,
+        TEST_PASSWORD,
+        TEST_CLIENT_ID,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        retry=RetryPolicy(backoff_factor=0),
+    )
+
+    assert run(client.fetch_issuer()) == []
+    assert client.retry.stats["retries"] == 1
+
+
+def test_async_client_sync_close(make_client):
+    client = make_client({})
+
+    with pytest.raises(BadgrClientError, match="aclose"):
+        client.close()
+
+    with pytest.raises(BadgrClientError, match="async with"):
+        with client:
+            pass
+
+    run(client.aclose())
+
+
+def test_async_reissue_after_revoke_by_id():
+    existing = {
+        "entityType": "Assertion",
+        "entityId": "a1",
+        "recipient": {"identity": "jane@example.com", "hashed": False},
+    }
+
+    def handler(request):
+        if request.url.path == "/o/token":
+            return httpx.Response(200, json=TOKEN_RESPONSE)
+        if request.method == "GET":
+            return httpx.Response(200, json={"result": [existing]})
+        if request.method == "DELETE":
+            return httpx.Response(200, json={})
+
+        return httpx.Response(
+            200, json={"result": [{"entityType": "Assertion", "entityId": "a2"}]}
+        )
+
+    client = AsyncBadgrClient(
+        TEST_USER,
+        TEST_PASSWORD,
+        TEST_CLIENT_ID,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        recipient_index=RecipientIndex(),
+    )
+
+    async def reissue():
+        with pytest.raises(DuplicateAssertionError):
+            await AsyncBadgeClass(client, "bc1").issue("jane@example.com")
+
+        await AsyncAssertion(client, "a1").revoke("Mistake")
+
+        return await AsyncBadgeClass(client, "bc1").issue("jane@example.com")
+
+    assert run(reissue()).entityId == "a2"
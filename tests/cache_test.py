@@ -0,0 +1,141 @@
+import pytest
+from badgrclient import BadgeClass
+from badgrclient.cache import EntityCache
+
+BADGECLASS_URL = "http://localhost:8000/v2/badgeclasses/bc1"
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [100.0]
+    mocker.patch("badgrclient.cache.time.monotonic", side_effect=lambda: now[0])
+
+    return now
+
+
+@pytest.fixture
+def cached_client(client_factory):
+    return client_factory(cache=EntityCache())
+
+
+def badgeclass_result(name="Speak Up!"):
+    return {
+        "result": [{"entityType": "BadgeClass", "entityId": "bc1", "name": name}]
+    }
+
+
+def test_cache_ttl(clock):
+    cache = EntityCache(ttl=10)
+    cache.set("Issuer", "i1", b'{"result": []}')
+
+    assert cache.get("Issuer", "i1") == b'{"result": []}'
+
+    clock[0] += 11
+    assert cache.get("Issuer", "i1") is None
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 1,
+        "revalidations": 0,
+        "evictions": 0,
+    }
+
+
+def test_cache_lru_eviction(clock):
+    cache = EntityCache(max_size=2)
+    cache.set("Issuer", "i1", b"1")
+    cache.set("Issuer", "i2", b"2")
+    # i1 becomes the most recently used
+    cache.get("Issuer", "i1")
+    cache.set("Issuer", "i3", b"3")
+
+    assert cache.get("Issuer", "i2") is None
+    assert cache.get("Issuer", "i1") == b"1"
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+
+
+def test_client_hits_decode_fresh_data(cached_client, requests_mock):
+    result = badgeclass_result()
+    result["result"][0]["tags"] = ["irc"]
+    requests_mock.get(BADGECLASS_URL, json=result)
+
+    cached_client.fetch_badgeclass("bc1")[0].data["tags"].append("community")
+    cached_client.fetch_badgeclass("bc1")[0].data["tags"].append("fedora")
+
+    assert cached_client.fetch_badgeclass("bc1")[0].data["tags"] == ["irc"]
+
+
+def test_client_fetch_badgeclass_cached(cached_client, requests_mock):
+    badge_mock = requests_mock.get(BADGECLASS_URL, json=badgeclass_result())
+
+    first = cached_client.fetch_badgeclass("bc1")[0]
+    second = cached_client.fetch_badgeclass("bc1")[0]
+    third = BadgeClass(cached_client, "bc1")
+    third.fetch()
+
+    assert badge_mock.call_count == 1
+    assert first.data == second.data == third.data
+    assert first.data is not second.data
+    assert cached_client.cache.stats["hits"] == 2
+
+
+def test_client_update_invalidates_cache(cached_client, requests_mock):
+    badge_mock = requests_mock.get(
+        BADGECLASS_URL,
+        [{"json": badgeclass_result()}, {"json": badgeclass_result("Renamed")}],
+    )
+    requests_mock.put(BADGECLASS_URL, json=badgeclass_result("Renamed"))
+
+    badge = cached_client.fetch_badgeclass("bc1")[0]
+    badge.data["name"] = "Renamed"
+    badge.update()
+
+    assert badge_mock.call_count == 2
+    assert cached_client.fetch_badgeclass("bc1")[0].data["name"] == "Renamed"
+    assert badge_mock.call_count == 2
+
+
+def test_client_skips_uncached_types(cached_client, requests_mock):
+    assertion_mock = requests_mock.get(
+        "http://localhost:8000/v2/assertions/a1",
+        json={"result": [{"entityType": "Assertion", "entityId": "a1"}]},
+    )
+
+    cached_client.fetch_assertion("a1")
+    cached_client.fetch_assertion("a1")
+
+    assert assertion_mock.call_count == 2
+
+
+def test_client_revalidates_expired_entities(client_factory, requests_mock):
+    badge_mock = requests_mock.get(
+        BADGECLASS_URL,
+        [
+            {
+                "json": badgeclass_result(),
+                "headers": {
+                    "ETag": '"v1"',
+                    "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                },
+            },
+            {"status_code": 304, "text": ""},
+            {"json": badgeclass_result("Renamed"), "headers": {"ETag": '"v2"'}},
+        ],
+    )
+    client = client_factory(cache=EntityCache(ttl=0))
+
+    assert client.fetch_badgeclass("bc1")[0].data["name"] == "Speak Up!"
+    assert client.fetch_badgeclass("bc1")[0].data["name"] == "Speak Up!"
+    assert client.fetch_badgeclass("bc1")[0].data["name"] == "Renamed"
+
+    assert "If-None-Match" not in badge_mock.request_history[0].headers
+    assert badge_mock.request_history[1].headers["If-None-Match"] == '"v1"'
+    assert (
+        badge_mock.request_history[1].headers["If-Modified-Since"]
+        == "Wed, 21 Oct 2015 07:28:00 GMT"
+    )
+    assert badge_mock.request_history[2].headers["If-None-Match"] == '"v1"'
+    assert client.cache.get_validators("BadgeClass", "bc1") == {
+        "If-None-Match": '"v2"'
+    }
+    assert client.cache.stats["revalidations"] == 1
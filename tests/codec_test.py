@@ -0,0 +1,41 @@
+import sys
+import pytest
+from badgrclient.codec import JSONCodec, OrjsonCodec, default_codec
+
+BODY = {"recipient": {"identity": "jane@example.com"}, "name": "Śpeak up!"}
+
+
+@pytest.mark.parametrize("codec", [JSONCodec, OrjsonCodec])
+def test_codec_round_trip(codec):
+    if codec is OrjsonCodec:
+        pytest.importorskip("orjson")
+
+    encoded = codec().dumps(BODY)
+
+    assert isinstance(encoded, bytes)
+    assert codec().loads(encoded) == BODY
+
+
+def test_default_codec_falls_back(mocker):
+    mocker.patch.dict(sys.modules, {"orjson": None})
+
+    assert default_codec().name == "json"
+
+
+def test_client_uses_codec(client_factory, requests_mock, mocker):
+    issuer_mock = requests_mock.post(
+        "http://localhost:8000/v2/issuers", json={"result": []}
+    )
+    codec = JSONCodec()
+    dumps = mocker.spy(codec, "dumps")
+    loads = mocker.spy(codec, "loads")
+
+    client = client_factory(json_codec=codec)
+    response = client._call_api("/v2/issuers", "POST", data=BODY)
+
+    assert response == {"result": []}
+    dumps.assert_called_once_with(BODY)
+    # Decoded from the raw bytes, for the token and the issuer responses
+    assert all(isinstance(c.args[0], bytes) for c in loads.call_args_list)
+    assert issuer_mock.last_request.headers["Content-Type"] == "application/json"
+    assert issuer_mock.last_request.json() == BODY
@@ -0,0 +1,73 @@
+import pytest
+from badgrclient import BadgrClient, Assertion, BadgeClass
+from badgrclient.compact import CompactAssertion, CompactBadgeClass
+
+ASSERTION_DATA = {
+    "entityType": "Assertion",
+    "entityId": "a1",
+    "badgeclass": "bc1",
+    "issuer": "is1",
+    "issuedOn": "2020-08-28T05:34:28Z",
+    "revoked": False,
+    "recipient": {"identity": "jane@example.com", "type": "email"},
+    "image": "data:image/png;base64,...",
+    "narrative": "Spoke up",
+}
+
+
+@pytest.fixture
+def client(mocker):
+    mocker.patch("badgrclient.BadgrClient._get_auth_token")
+
+    return BadgrClient(username="test", password="test", client_id="kewl_client")
+
+
+def test_compact_assertion():
+    compact = CompactAssertion.from_data(ASSERTION_DATA, extras=["narrative"])
+
+    assert not hasattr(compact, "__dict__")
+    assert compact.entityId == "a1"
+    assert compact.recipient == "jane@example.com"
+    assert compact.issuedOn == "2020-08-28T05:34:28Z"
+    assert compact.revoked is False
+    assert compact.badgeclass == "bc1"
+    assert compact.issuer == "is1"
+    assert compact.extras == {"narrative": "Spoke up"}
+    assert compact.get("narrative") == "Spoke up"
+    assert compact.get("image") is None
+
+    with pytest.raises(AttributeError):
+        compact.name = "Speak up!"
+
+
+def test_compact_shares_ids():
+    first = CompactAssertion.from_data(dict(ASSERTION_DATA, badgeclass="".join("bc1")))
+    second = CompactAssertion.from_data(dict(ASSERTION_DATA, badgeclass="".join("bc1")))
+
+    assert first.badgeclass is second.badgeclass
+
+
+def test_model_compact(client):
+    badge = BadgeClass(client).set_data(
+        {"entityType": "BadgeClass", "entityId": "bc1", "name": "Speak up!"}
+    )
+    compact = badge.compact()
+
+    assert isinstance(compact, CompactBadgeClass)
+    assert compact.name == "Speak up!"
+    assert compact.extras is None
+
+    model = compact.to_model(client)
+    assert isinstance(model, BadgeClass)
+    assert model.entityId == "bc1"
+
+
+def test_lazy_result_compact(client, mocker):
+    set_data = mocker.spy(Assertion, "set_data")
+    result = client._deserialize([ASSERTION_DATA, {"entityType": "Unknown"}])
+
+    compact = result.compact()
+
+    assert isinstance(compact[0], CompactAssertion)
+    assert compact[1] == {"entityType": "Unknown"}
+    assert set_data.call_count == 0
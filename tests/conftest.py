@@ -0,0 +1,55 @@
+import json
+import pytest
+from badgrclient import BadgrClient
+
+BASE_URL = "http://localhost:8000"
+TOKEN_URL = BASE_URL + "/o/token"
+TEST_USER = "test"
+TEST_PASSWORD = "test_pass"
+TEST_CLIENT_ID = "kewl_client"
+
+
+def token_response(
+    token: str = "mock_token",
+    expiry: float = 86400,
+    refresh_token: str = "mock_refresh_token",
+) -> dict:
+    return {
+        "access_token": token,
+        "expires_in": expiry,
+        "token_type": "Bearer",
+        "scope": "rw:profile rw:issuer rw:backpack",
+        "refresh_token": refresh_token,
+    }
+
+
+TOKEN_RESPONSE = token_response()
+
+
+def get_mock_auth_text(token: str = "mock_token", expiry: float = 86400):
+    return json.dumps(token_response(token, expiry))
+
+
+@pytest.fixture
+def token_mock(requests_mock):
+    return requests_mock.post(TOKEN_URL, json=TOKEN_RESPONSE)
+
+
+@pytest.fixture
+def client_factory(token_mock):
+    """Build BadgrClients logged in with the mocked token endpoint"""
+
+    def _client_factory(**kwargs):
+        return BadgrClient(
+            username=TEST_USER,
+            password=TEST_PASSWORD,
+            client_id=TEST_CLIENT_ID,
+            **kwargs
+        )
+
+    return _client_factory
+
+
+@pytest.fixture
+def client(client_factory):
+    return client_factory(scope="rw:profile rw:issuer rw:backpack")
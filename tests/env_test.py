@@ -0,0 +1,74 @@
+import asyncio
+import httpx
+import os
+import subprocess
+import sys
+from urllib.parse import parse_qs
+from badgrclient import AsyncBadgrClient, BadgrClient, load_env
+from tests.conftest import TOKEN_RESPONSE
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, badgrclient\n"
+        "from badgrclient import BadgrClient\n"
+        "print(','.join(m for m in ('requests', 'dotenv', 'asyncio', 'httpx')"
+        " if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_env_credentials_read_on_call(token_mock, requests_mock, monkeypatch):
+    monkeypatch.setenv("BADGR_USERNAME", "env_user")
+    monkeypatch.setenv("BADGR_PASSWORD", "env_pass")
+    BadgrClient(None, None, "client")
+
+    monkeypatch.setenv("BADGR_USERNAME", "other_user")
+    BadgrClient(None, None, "client")
+
+    users = [parse_qs(r.text)["username"] for r in requests_mock.request_history]
+    assert users == [["env_user"], ["other_user"]]
+
+
+def test_async_env_credentials_read_on_call(monkeypatch):
+    payloads = []
+
+    def handler(request):
+        payloads.append(parse_qs(request.content.decode()))
+        return httpx.Response(200, json=TOKEN_RESPONSE)
+
+    async def login():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncBadgrClient(
+            None, None, "client", http_client=http_client
+        ) as client:
+            await client._authenticate()
+
+    monkeypatch.setenv("BADGR_USERNAME", "env_user")
+    monkeypatch.setenv("BADGR_PASSWORD", "env_pass")
+    asyncio.run(login())
+
+    monkeypatch.setenv("BADGR_USERNAME", "other_user")
+    asyncio.run(login())
+
+    assert [payload["username"] for payload in payloads] == [
+        ["env_user"],
+        ["other_user"],
+    ]
+    assert payloads[0]["grant_type"] == ["password"]
+
+
+def test_load_env(tmp_path, monkeypatch):
+    # Restored after the test
+    monkeypatch.setenv("BADGR_USERNAME", "")
+    monkeypatch.delenv("BADGR_USERNAME")
+    dotenv = tmp_path / ".env"
+    dotenv.write_text("BADGR_USERNAME=dotenv_user\n")
+
+    load_env(str(dotenv))
+
+    assert os.environ["BADGR_USERNAME"] == "dotenv_user"
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from badgrclient import AsyncBadgrClient, BadgrClient, BadgeClass, Issuer
+from badgrclient.exceptions import APIError
+from badgrclient.fakeserver import FakeBadgrServer
+from badgrclient.retry import RetryPolicy
+
+
+@pytest.fixture
+def server():
+    with FakeBadgrServer(max_page_size=50) as server:
+        yield server
+
+
+def make_client(server, **kwargs):
+    return BadgrClient("user", "pass", "client", base_url=server.url, **kwargs)
+
+
+def test_issue_and_revoke(server):
+    issuer = server.add_issuer()
+    badge_data = server.add_badgeclass(issuer["entityId"], name="Fake Badge")
+
+    with make_client(server) as client:
+        badge = BadgeClass(client, badge_data["entityId"])
+        assertion = badge.issue("someone@example.com")
+
+        assert assertion.data["recipient"]["identity"] == "someone@example.com"
+        assert server.assertions[assertion.entityId]["badgeclass"] == badge.entityId
+
+        results = client.revoke_many([assertion.entityId, "missing"], "Oops")
+
+        assert [result.revoked for result in results] == [True, False]
+        assert server.assertions[assertion.entityId]["revocationReason"] == "Oops"
+
+
+def test_pagination(server):
+    issuer = server.add_issuer()
+    badge_data = server.add_badgeclass(issuer["entityId"])
+    server.add_assertions(badge_data["entityId"], 120)
+
+    with make_client(server) as client:
+        badge = BadgeClass(client, badge_data["entityId"])
+        assertions = list(badge.iter_assertions(page_size=100))
+
+        assert len(assertions) == 120
+        # The server caps pages at 50
+        assert server.requests["list_badge_assertions"] == 3
+
+        badges = Issuer(client, issuer["entityId"]).fetch_badgeclasses()
+        assert [badge.entityId for badge in badges] == [badge_data["entityId"]]
+
+
+def test_errors(server):
+    with make_client(server) as client:
+        with pytest.raises(APIError):
+            client.fetch_assertion("missing")
+
+    server.error_rate = 1
+    retry = RetryPolicy(total=2, backoff_factor=0)
+
+    with make_client(server, retry=retry) as client:
+        with pytest.raises(APIError):
+            client.fetch_issuer()
+
+    # Initial attempt and 2 retries
+    assert server.requests["list_issuers"] == 3
+
+
+def test_async_client(server):
+    issuer = server.add_issuer()
+    badge_data = server.add_badgeclass(issuer["entityId"])
+    server.add_assertions(badge_data["entityId"], 60)
+
+    async def run():
+        async with AsyncBadgrClient(
+            "user", "pass", "client", base_url=server.url
+        ) as client:
+            await client._get_auth_token()
+            badge = client.MODELS["BadgeClass"](client, badge_data["entityId"])
+
+            return [assertion async for assertion in badge.iter_assertions()]
+
+    assert len(asyncio.run(run())) == 60
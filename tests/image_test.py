@@ -0,0 +1,85 @@
+import asyncio
+import base64
+import json
+import os
+import pytest
+from pathlib import Path
+from badgrclient import AsyncBadgrClient, BadgrClient, Issuer
+from badgrclient.codec import JSONCodec
+from badgrclient.exceptions import BadgrClientError
+from badgrclient.fakeserver import FakeBadgrServer
+from badgrclient.image import ImageFile, JSONStream
+
+TEST_IMAGE_PATH_PNG = str(Path("tests/test_image.png"))
+
+
+def data_uri(path):
+    with open(path, "rb") as img_f:
+        return "data:image/png;base64," + base64.b64encode(img_f.read()).decode()
+
+
+@pytest.fixture
+def large_png(tmp_path):
+    path = str(tmp_path / "large.png")
+    with open(path, "wb") as img_f:
+        img_f.write(os.urandom(100 * 1024 + 1))
+
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 1024, 1024 * 1024])
+def test_image_file_chunks(large_png, chunk_size):
+    image = ImageFile(large_png, chunk_size=chunk_size)
+    expected = data_uri(large_png)
+
+    assert image.data_uri() == expected
+    assert b"".join(image).decode() == expected
+    assert len(image) == len(expected)
+
+
+def test_image_file_errors():
+    with pytest.raises(BadgrClientError):
+        ImageFile("tests/test_image.gif")
+
+    with pytest.raises(FileNotFoundError):
+        ImageFile("tests/missing.png")
+
+    assert BadgrClient.encode_image("tests/missing.png", stream=True) is None
+
+
+def test_json_stream(large_png):
+    data = {"name": "Fedora", "image": ImageFile(large_png), "tags": ["irc"]}
+    stream = JSONStream(data, JSONCodec())
+    body = b"".join(stream)
+
+    assert json.loads(body) == dict(data, image=data_uri(large_png))
+    assert len(stream) == len(body)
+    # Retries send the body again
+    assert b"".join(stream) == body
+
+
+def test_stream_issuer_image(large_png):
+    with FakeBadgrServer() as server:
+        with BadgrClient("user", "pass", "client", base_url=server.url) as client:
+            image = client.encode_image(large_png, stream=True)
+            issuer = Issuer(client).create(
+                "Fedora", "Fedora Issuer", "test@fedoraproject.org", "http://a.org", image
+            )
+
+        assert server.issuers[issuer.entityId]["image"] == data_uri(large_png)
+
+
+def test_async_stream_issuer_image(large_png):
+    async def create(url):
+        async with AsyncBadgrClient("user", "pass", "client", base_url=url) as client:
+            image = client.encode_image(large_png, stream=True)
+            issuer = client.MODELS["Issuer"](client)
+
+            return await issuer.create(
+                "Fedora", "Fedora Issuer", "test@fedoraproject.org", "http://a.org", image
+            )
+
+    with FakeBadgrServer() as server:
+        issuer = asyncio.run(create(server.url))
+
+        assert server.issuers[issuer.entityId]["image"] == data_uri(large_png)
@@ -0,0 +1,96 @@
+import pytest
+import requests
+from badgrclient.exceptions import APIError
+from badgrclient.journal import IssuanceJournal
+
+ASSERTIONS_URL = "http://localhost:8000/v2/badgeclasses/bc1/assertions"
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "issuance.jsonl")
+
+
+def test_journal_replay(journal_path):
+    with IssuanceJournal(journal_path) as journal:
+        journal.record_intent("bc1", "jane@example.com")
+        journal.record_issued("bc1", "jane@example.com", "a1")
+        journal.record_intent("bc1", "john@example.com")
+        journal.record_intent("bc1", "joe@example.com")
+        journal.record_error("bc1", "joe@example.com", APIError("Invalid"))
+        journal.record_intent("bc1", "jim@example.com")
+        journal.record_error("bc1", "jim@example.com", requests.Timeout())
+
+    with open(journal_path, "a") as journal_file:
+        journal_file.write('{"event": "iss')
+
+    journal = IssuanceJournal(journal_path)
+
+    assert journal.issued("bc1", "jane@example.com") == "a1"
+    assert not journal.in_doubt("bc1", "jane@example.com")
+    assert journal.in_doubt("bc1", "john@example.com")
+    assert not journal.in_doubt("bc1", "joe@example.com")
+    # The request may have reached the server before timing out
+    assert journal.in_doubt("bc1", "jim@example.com")
+
+
+def test_journal_appends_after_torn_line(journal_path):
+    with IssuanceJournal(journal_path) as journal:
+        journal.record_intent("bc1", "jane@example.com")
+
+    with open(journal_path, "a") as journal_file:
+        journal_file.write('{"event": "iss')
+
+    with IssuanceJournal(journal_path) as journal:
+        journal.record_issued("bc1", "jane@example.com", "a1")
+
+    journal = IssuanceJournal(journal_path)
+
+    assert journal.issued("bc1", "jane@example.com") == "a1"
+    assert not journal.in_doubt("bc1", "jane@example.com")
+
+
+def test_issue_many_resumes(client, requests_mock, journal_path):
+    def create_assertion(request, context):
+        email = request.json()["recipient"]["identity"]
+        if email == "john@example.com":
+            raise requests.ConnectionError("Connection reset")
+        if email == "joe@example.com":
+            context.status_code = 400
+            return {"error": "Invalid recipient"}
+
+        return {"result": [{"entityType": "Assertion", "entityId": email[:4]}]}
+
+    create_mock = requests_mock.post(ASSERTIONS_URL, json=create_assertion)
+    lookup_mock = requests_mock.get(
+        ASSERTIONS_URL,
+        json={
+            "result": [
+                {"entityType": "Assertion", "entityId": "old", "revoked": True},
+                {"entityType": "Assertion", "entityId": "john", "revoked": False},
+            ]
+        },
+    )
+    recipients = ["jane@example.com", "john@example.com", "joe@example.com"]
+
+    with IssuanceJournal(journal_path) as journal:
+        first = client.issue_many(
+            [("bc1", r) for r in recipients], journal=journal, issued_on="dummy"
+        )
+
+    assert [r.ok for r in first] == [True, False, False]
+    assert create_mock.call_count == 3
+
+    # The restarted run only retries joe and looks john's assertion up
+    create_mock.reset()
+    with IssuanceJournal(journal_path) as journal:
+        second = client.issue_many(
+            [("bc1", r) for r in recipients], journal=journal, issued_on="dummy"
+        )
+
+    assert [r.assertion.entityId for r in second[:2]] == ["jane", "john"]
+    assert [r.resumed for r in second] == [True, True, False]
+    retried = [r.json()["recipient"]["identity"] for r in create_mock.request_history]
+    assert retried == ["joe@example.com"]
+    assert lookup_mock.call_count == 1
+    assert lookup_mock.last_request.qs["recipient"] == ["john@example.com"]
@@ -0,0 +1,116 @@
+import pytest
+import requests
+from badgrclient.metrics import MetricsAggregator, RequestEvent, endpoint_template
+from badgrclient.retry import RetryPolicy
+
+
+@pytest.mark.parametrize(
+    "endpoint, expected",
+    [
+        ("/v2/issuers", "/v2/issuers"),
+        ("/v2/badgeclasses/s0ziri1/assertions", "/v2/badgeclasses/{eid}/assertions"),
+        ("/v2/assertions/revoke", "/v2/assertions/revoke"),
+        ("/v1/issuer/issuers/my-issuer/staff", "/v1/issuer/issuers/{eid}/staff"),
+        (
+            "http://localhost:8000/v2/issuers/abc/assertions?cursor=xyz",
+            "/v2/issuers/{eid}/assertions",
+        ),
+    ],
+)
+def test_endpoint_template(endpoint, expected):
+    assert endpoint_template(endpoint) == expected
+
+
+def test_metrics_aggregator():
+    aggregator = MetricsAggregator()
+
+    for duration in range(1, 101):
+        event = RequestEvent("GET", "/v2/issuers/abc")
+        event.finish()
+        event.duration = duration / 100
+        aggregator(event)
+
+    assert aggregator.percentile("GET /v2/issuers/{eid}", 50) == 0.5
+    assert aggregator.percentile("GET /v2/issuers/{eid}", 99) == 0.99
+    assert aggregator.percentile("GET /v2/nothing", 99) is None
+
+    failed = RequestEvent("GET", "/v2/issuers/abc")
+    failed.finish(error=requests.Timeout())
+    failed.retries = 2
+    aggregator(failed)
+
+    summary = aggregator.summary()["GET /v2/issuers/{eid}"]
+    assert (summary["count"], summary["errors"], summary["retries"]) == (101, 1, 2)
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def hooked_client(client_factory, events):
+    def failing_hook(event):
+        raise ValueError("Broken hook")
+
+    return client_factory(
+        retry=RetryPolicy(total=2, backoff_factor=0),
+        request_hooks=[failing_hook, events.append],
+    )
+
+
+def test_client_emits_request_events(hooked_client, requests_mock, events):
+    requests_mock.get(
+        "http://localhost:8000/v2/badgeclasses/bc1",
+        [
+            {"status_code": 503, "json": {"error": "Unavailable"}},
+            {"json": {"result": [{"entityType": "BadgeClass", "entityId": "bc1"}]}},
+        ],
+    )
+    requests_mock.post(
+        "http://localhost:8000/v2/issuers", exc=requests.ConnectionError
+    )
+
+    hooked_client.fetch_badgeclass("bc1")
+    with pytest.raises(requests.ConnectionError):
+        hooked_client._call_api("/v2/issuers", "POST", data={"name": "Fedora"})
+
+    fetch, create = events
+    assert (fetch.method, fetch.endpoint, fetch.status) == (
+        "GET",
+        "/v2/badgeclasses/{eid}",
+        200,
+    )
+    assert fetch.retries == 1
+    assert fetch.bytes_received > 0
+    assert fetch.duration >= fetch.ttfb >= 0
+    assert (create.method, create.status, create.retries) == ("POST", None, 0)
+    assert create.bytes_sent == len(b'{"name":"Fedora"}')
+    assert isinstance(create.error, requests.ConnectionError)
+
+
+def test_prometheus_metrics(hooked_client, requests_mock):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from badgrclient.metrics import PrometheusMetrics
+
+    registry = prometheus_client.CollectorRegistry()
+    hooked_client.request_hooks.append(PrometheusMetrics(registry=registry))
+    requests_mock.get("http://localhost:8000/v2/issuers", json={"result": []})
+
+    hooked_client.fetch_issuer()
+
+    assert (
+        registry.get_sample_value(
+            "badgrclient_request_duration_seconds_count",
+            {"method": "GET", "endpoint": "/v2/issuers", "status": "200"},
+        )
+        == 1
+    )
+
+
+def test_uninstrumented_client_skips_events(client, requests_mock, mocker):
+    request_event = mocker.patch("badgrclient.badgrclient.RequestEvent")
+    requests_mock.get("http://localhost:8000/v2/issuers", json={"result": []})
+
+    assert client.fetch_issuer() == []
+    request_event.assert_not_called()
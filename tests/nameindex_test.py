@@ -0,0 +1,88 @@
+import pytest
+from badgrclient import BadgeClass
+from badgrclient.nameindex import BadgeNameIndex, SQLiteBadgeNameIndex
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "badge_names.db")
+
+
+@pytest.fixture
+def make_client(client_factory, requests_mock):
+    def _make_client(index, badges):
+        badge_mock = requests_mock.get(
+            "http://localhost:8000/v2/issuers/test/badgeclasses",
+            json={
+                "result": [
+                    dict(entityType="BadgeClass", issuer="test", **badge)
+                    for badge in badges
+                ]
+            },
+        )
+        client = client_factory(unique_badge_names=True, badge_name_index=index)
+
+        return client, badge_mock
+
+    return _make_client
+
+
+def test_memory_index():
+    index = BadgeNameIndex()
+    index.add("test", "Speak Up!", "bc1")
+    assert index.get("test", "Speak Up!") == "bc1"
+    assert index.loaded_at("test") is None
+
+    index.replace("test", {"Baby Badgr": "bc2"})
+    assert index.get("test", "Speak Up!") is None
+    assert index.get("test", "Baby Badgr") == "bc2"
+    assert index.loaded_at("test") is not None
+
+
+def test_sqlite_index_persists(index_path):
+    index = SQLiteBadgeNameIndex(index_path)
+    index.replace("test", {"Speak Up!": "bc1", "Baby Badgr": "bc2"})
+    index.add("test", "Fedora", "bc3")
+    index.close()
+
+    reopened = SQLiteBadgeNameIndex(index_path)
+    assert reopened.get("test", "Speak Up!") == "bc1"
+    assert reopened.get("test", "Fedora") == "bc3"
+    assert reopened.get("other", "Speak Up!") is None
+    assert reopened.version("test") == 1
+
+
+def test_sqlite_index_replace(index_path):
+    index = SQLiteBadgeNameIndex(index_path)
+    index.replace("test", {"Speak Up!": "bc1", "Baby Badgr": "bc2"})
+    index.replace("test", {"Speak Up!": "bc4", "Fedora": "bc3"})
+
+    assert index.get("test", "Speak Up!") == "bc4"
+    assert index.get("test", "Baby Badgr") is None
+    assert index.get("test", "Fedora") == "bc3"
+    assert index.version("test") == 2
+    assert index.version("other") == 0
+
+
+def test_client_reuses_persisted_index(make_client, index_path):
+    badges = [{"name": "Speak Up!", "entityId": "bc1"}]
+    client, badge_mock = make_client(SQLiteBadgeNameIndex(index_path), badges)
+    client.load_badge_names("test", max_age=3600)
+    client.badge_names.close()
+
+    # A new process starting with the same index doesn't reload the issuer
+    client, badge_mock = make_client(SQLiteBadgeNameIndex(index_path), badges)
+    client.load_badge_names("test", max_age=3600)
+
+    assert badge_mock.call_count == 0
+    assert client.get_eid_from_badge_name("Speak Up!", "test") == "bc1"
+
+    created = BadgeClass(client).set_data(
+        {"entityId": "bc2", "name": "Baby Badgr", "issuer": "test"}
+    )
+    client._save_badge_name(created)
+    assert client.get_eid_from_badge_name("Baby Badgr", "test") == "bc2"
+
+    client.load_badge_names("test")
+    assert badge_mock.call_count == 1
+    assert client.get_eid_from_badge_name("Baby Badgr", "test") is None
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from badgrclient.ratelimit import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [100.0]
+    mocker.patch("badgrclient.ratelimit.time.monotonic", side_effect=lambda: now[0])
+
+    return now
+
+
+def test_token_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+
+    # Refills at rate tokens per second, up to the burst size
+    clock[0] += 10
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_token_bucket_shared_between_threads(clock):
+    bucket = TokenBucket(rate=10, burst=1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        delays = list(executor.map(lambda _: bucket.reserve(), range(8)))
+
+    # Every caller got its own slot
+    assert sorted(delays) == pytest.approx([i / 10 for i in range(8)])
+
+
+def test_rate_limiter_budgets(clock):
+    limiter = RateLimiter(budgets={"write": TokenBucket(rate=1, burst=1)})
+
+    assert limiter.reserve("POST", "/v2/issuers") == 0
+    assert limiter.reserve("POST", "/v2/issuers") == pytest.approx(1)
+    # Reads aren't limited
+    assert limiter.reserve("GET", "/v2/issuers") == 0
+
+
+def test_rate_limiter_async(clock, mocker):
+    sleep = mocker.patch("badgrclient.ratelimit.asyncio.sleep")
+    limiter = RateLimiter(rate=2, burst=1)
+
+    async def acquire_all():
+        await asyncio.gather(
+            *(limiter.acquire_async("GET", "/v2/issuers") for _ in range(3))
+        )
+
+    asyncio.run(acquire_all())
+
+    assert sorted(c.args[0] for c in sleep.call_args_list) == pytest.approx(
+        [0.5, 1]
+    )
+
+
+def test_client_respects_rate_limiter(client_factory, requests_mock, mocker):
+    requests_mock.get("http://localhost:8000/v2/issuers", json={"result": []})
+    limiter = RateLimiter(rate=5)
+    acquire = mocker.spy(limiter, "acquire")
+
+    client = client_factory(rate_limiter=limiter)
+    client.fetch_issuer()
+
+    acquire.assert_called_once_with("GET", "/v2/issuers")
@@ -0,0 +1,178 @@
+import pytest
+from badgrclient import Assertion
+from badgrclient.exceptions import DuplicateAssertionError
+from badgrclient.recipients import RecipientIndex
+
+ASSERTIONS_URL = "http://localhost:8000/v2/badgeclasses/bc1/assertions"
+
+
+def assertion(eid, identity, **kwargs):
+    return Assertion(None).set_data(
+        dict(entityId=eid, recipient={"identity": identity, "hashed": False}, **kwargs)
+    )
+
+
+def test_recipient_index():
+    index = RecipientIndex()
+    index.load(
+        "bc1",
+        [
+            assertion("a1", " Jane@Example.com"),
+            assertion("a2", "john@example.com", revoked=True),
+            Assertion(None).set_data(
+                {
+                    "entityId": "a3",
+                    "recipient": {"identity": "sha256$abc", "hashed": True},
+                }
+            ),
+        ],
+    )
+
+    assert index.loaded("bc1")
+    assert not index.loaded("bc2")
+    assert index.claim("bc1", "jane@example.com") == (False, "a1")
+    assert index.claim("bc1", "john@example.com") == (True, None)
+    # Claimed until its assertion is added or released
+    assert index.claim("bc1", "JOHN@example.com") == (False, None)
+
+    index.release("bc1", "john@example.com")
+    assert index.claim("bc1", "john@example.com") == (True, None)
+    index.add("bc1", "john@example.com", "a4")
+    assert index.claim("bc1", "john@example.com") == (False, "a4")
+
+    index.discard("bc1", "john@example.com")
+    assert index.claim("bc1", "john@example.com") == (True, None)
+
+    index.discard_assertion("a1")
+    index.discard_assertion("missing")
+    assert index.claim("bc1", "jane@example.com") == (True, None)
+
+
+@pytest.fixture
+def client(client_factory):
+    return client_factory(recipient_index=RecipientIndex())
+
+
+def test_client_refuses_duplicates(client, requests_mock):
+    lookup_mock = requests_mock.get(
+        ASSERTIONS_URL,
+        json={
+            "result": [
+                {
+                    "entityType": "Assertion",
+                    "entityId": "a1",
+                    "recipient": {"identity": "jane@example.com", "hashed": False},
+                }
+            ]
+        },
+    )
+    create_mock = requests_mock.post(
+        ASSERTIONS_URL,
+        json={"result": [{"entityType": "Assertion", "entityId": "a2"}]},
+    )
+
+    results = client.issue_many(
+        [
+            ("bc1", "Jane@example.com"),
+            ("bc1", "john@example.com"),
+            ("bc1", "john@example.com"),
+        ],
+        concurrency=1,
+        issued_on="dummy",
+    )
+
+    assert [r.ok for r in results] == [False, True, False]
+    assert isinstance(results[0].error, DuplicateAssertionError)
+    assert results[0].error.assertion_eid == "a1"
+    assert results[2].error.assertion_eid == "a2"
+    assert lookup_mock.call_count == 1
+    assert create_mock.call_count == 1
+
+
+def test_client_releases_failed_recipients(client, requests_mock):
+    requests_mock.get(ASSERTIONS_URL, json={"result": []})
+    requests_mock.post(
+        ASSERTIONS_URL,
+        [
+            {"status_code": 400, "json": {"error": "Invalid"}},
+            {"json": {"result": [{"entityType": "Assertion", "entityId": "a2"}]}},
+        ],
+    )
+
+    first, second = client.issue_many(
+        [("bc1", "john@example.com"), ("bc1", "john@example.com")],
+        concurrency=1,
+        issued_on="dummy",
+    )
+
+    assert not first.ok
+    assert second.assertion.entityId == "a2"
+
+
+def test_client_reissues_after_bulk_revoke(client, requests_mock):
+    requests_mock.get(
+        ASSERTIONS_URL,
+        json={
+            "result": [
+                {
+                    "entityType": "Assertion",
+                    "entityId": "a1",
+                    "recipient": {"identity": "jane@example.com", "hashed": False},
+                },
+                {
+                    "entityType": "Assertion",
+                    "entityId": "a2",
+                    "recipient": {"identity": "john@example.com", "hashed": False},
+                },
+            ]
+        },
+    )
+    requests_mock.post(
+        ASSERTIONS_URL,
+        json={"result": [{"entityType": "Assertion", "entityId": "a3"}]},
+    )
+    requests_mock.post(
+        "http://localhost:8000/v2/assertions/revoke",
+        json={"result": [{"entityId": "a2", "revoked": False, "reason": "Locked"}]},
+    )
+
+    client.issue_many([("bc1", "someone@example.com")], issued_on="dummy")
+    client.revoke_many(["a1", "a2"])
+
+    jane, john = client.issue_many(
+        [("bc1", "jane@example.com"), ("bc1", "john@example.com")],
+        issued_on="dummy",
+    )
+
+    assert jane.ok
+    assert isinstance(john.error, DuplicateAssertionError)
+    assert john.error.assertion_eid == "a2"
+
+
+def test_client_reissues_after_revoke_by_id(client, requests_mock):
+    requests_mock.get(
+        ASSERTIONS_URL,
+        json={
+            "result": [
+                {
+                    "entityType": "Assertion",
+                    "entityId": "a1",
+                    "recipient": {"identity": "jane@example.com", "hashed": False},
+                }
+            ]
+        },
+    )
+    requests_mock.post(
+        ASSERTIONS_URL,
+        json={"result": [{"entityType": "Assertion", "entityId": "a2"}]},
+    )
+    requests_mock.delete("http://localhost:8000/v2/assertions/a1", json={})
+
+    duplicate, = client.issue_many([("bc1", "jane@example.com")], issued_on="dummy")
+    assert isinstance(duplicate.error, DuplicateAssertionError)
+
+    # Never fetched, so only its entityId is known
+    Assertion(client, "a1").revoke("Mistake")
+    reissued, = client.issue_many([("bc1", "jane@example.com")], issued_on="dummy")
+
+    assert reissued.assertion.entityId == "a2"
@@ -0,0 +1,71 @@
+from badgrclient import BadgrClient, Assertion
+from badgrclient.results import LazyResult
+
+ROWS = [
+    {
+        "entityType": "Assertion",
+        "entityId": "a{}".format(i),
+        "recipient": {"identity": "user{}@example.com".format(i)},
+        "image": "data:image/png;base64,...",
+    }
+    for i in range(5)
+] + [{"entityType": "Unknown", "entityId": "u1"}]
+
+
+def make_result(mocker):
+    mocker.patch("badgrclient.BadgrClient._get_auth_token")
+    client = BadgrClient(username="test", password="test", client_id="kewl_client")
+
+    return client._deserialize(ROWS)
+
+
+def test_lazy_result_builds_models_on_access(mocker):
+    set_data = mocker.spy(Assertion, "set_data")
+    result = make_result(mocker)
+
+    assert isinstance(result, LazyResult)
+    assert len(result) == 6
+    assert set_data.call_count == 0
+
+    first = result[0]
+    assert isinstance(first, Assertion)
+    assert first.entityId == "a0"
+    assert result[0] is first
+    assert result[-1] == {"entityType": "Unknown", "entityId": "u1"}
+    assert set_data.call_count == 1
+
+
+def test_lazy_result_slicing(mocker):
+    set_data = mocker.spy(Assertion, "set_data")
+    result = make_result(mocker)
+
+    page = result[1:3]
+    assert isinstance(page, LazyResult)
+    assert len(page) == 2
+    assert set_data.call_count == 0
+    assert [a.entityId for a in page] == ["a1", "a2"]
+    assert repr(page) == "[Assertion(a1), Assertion(a2)]"
+
+
+def test_lazy_result_project(mocker):
+    set_data = mocker.spy(Assertion, "set_data")
+    result = make_result(mocker)
+
+    assert result[:2].project("entityId", "recipient") == [
+        {"entityId": "a0", "recipient": {"identity": "user0@example.com"}},
+        {"entityId": "a1", "recipient": {"identity": "user1@example.com"}},
+    ]
+    assert set_data.call_count == 0
+
+
+def test_lazy_result_concatenates_to_list(mocker):
+    result = make_result(mocker)
+    extra = {"entityType": "Unknown", "entityId": "u2"}
+
+    combined = result + [extra]
+    assert isinstance(combined, list)
+    assert combined == list(result) + [extra]
+    assert [extra] + result == [extra] + list(result)
+    assert [row.entityId for row in result[:2] + result[2:5]] == [
+        row["entityId"] for row in ROWS[:5]
+    ]
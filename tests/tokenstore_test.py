@@ -0,0 +1,190 @@
+import asyncio
+import datetime
+import multiprocessing
+import os
+import stat
+import time
+import httpx
+import pytest
+from urllib.parse import parse_qs
+from badgrclient import AsyncBadgrClient, BadgrClient
+from badgrclient.exceptions import APIError
+from badgrclient.fakeserver import FakeBadgrServer
+from badgrclient.tokenstore import FileTokenStore, TokenStore, token_key
+from tests.conftest import BASE_URL, TOKEN_URL, token_response
+
+KEY = token_key(BASE_URL, "client", "user", "rw:profile rw:issuer rw:backpack")
+
+
+def make_client(store, cls=BadgrClient, **kwargs):
+    return cls("user", "pass", "client", token_store=store, **kwargs)
+
+
+def stored(token="stored_token", expires_in=3600):
+    return {
+        "access_token": token,
+        "refresh_token": "stored_refresh_token",
+        "expires_at": time.time() + expires_in,
+    }
+
+
+def test_token_key():
+    assert token_key(BASE_URL, "client", "user", "scope") != token_key(
+        BASE_URL, "client", "other_user", "scope"
+    )
+
+
+def test_memory_store_shares_token(requests_mock):
+    token_mock = requests_mock.post(TOKEN_URL, json=token_response())
+    store = TokenStore()
+
+    clients = [make_client(store) for _ in range(3)]
+
+    assert token_mock.call_count == 1
+    assert all(
+        client.header == {"Authorization": "Bearer mock_token"} for client in clients
+    )
+    assert store.get(KEY)["refresh_token"] == "mock_refresh_token"
+
+
+def test_expired_token_refreshed(requests_mock):
+    token_mock = requests_mock.post(TOKEN_URL, json=token_response("refreshed"))
+    requests_mock.get(BASE_URL + "/v2/backpack/assertions", json={"result": []})
+    store = TokenStore()
+    store.set(KEY, stored())
+
+    client = make_client(store)
+    assert client.header == {"Authorization": "Bearer stored_token"}
+    assert token_mock.call_count == 0
+
+    # Another client refreshed the token meanwhile
+    store.set(KEY, stored("other_token"))
+    client.token_expires_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    client.fetch_assertion()
+
+    assert client.header == {"Authorization": "Bearer other_token"}
+    assert token_mock.call_count == 0
+
+    # The stored token expired too, refresh it with the latest refresh token
+    store.set(KEY, stored(expires_in=-1))
+    client.token_expires_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+    client.fetch_assertion()
+
+    assert client.header == {"Authorization": "Bearer refreshed"}
+    assert store.get(KEY)["access_token"] == "refreshed"
+    assert parse_qs(token_mock.last_request.text)["refresh_token"] == [
+        "stored_refresh_token"
+    ]
+
+
+def test_file_store(tmp_path, requests_mock):
+    token_mock = requests_mock.post(TOKEN_URL, json=token_response())
+    path = str(tmp_path / "tokens.json")
+
+    make_client(FileTokenStore(path))
+    # A new store on the same file, e.g. in another process
+    client = make_client(FileTokenStore(path))
+
+    assert token_mock.call_count == 1
+    assert client.header == {"Authorization": "Bearer mock_token"}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    FileTokenStore(path).delete(KEY)
+    assert FileTokenStore(path).get(KEY) is None
+
+
+def login(url, path):
+    BadgrClient("user", "pass", "client", base_url=url, token_store=FileTokenStore(path))
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_file_store_between_processes(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    context = multiprocessing.get_context("fork")
+
+    with FakeBadgrServer(latency=0.05) as server:
+        processes = [
+            context.Process(target=login, args=(server.url, path)) for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert [process.exitcode for process in processes] == [0] * 4
+        assert server.requests["token"] == 1
+
+
+def test_async_client_uses_store():
+    store = TokenStore()
+    store.set(KEY, stored())
+
+    async def authenticate():
+        async with make_client(store, AsyncBadgrClient) as client:
+            await client._authenticate()
+
+            return client.header
+
+    assert asyncio.run(authenticate()) == {"Authorization": "Bearer stored_token"}
+
+
+def test_rejected_token_deleted(requests_mock):
+    token_mock = requests_mock.post(TOKEN_URL, json=token_response("new_token"))
+    assertions_mock = requests_mock.get(
+        BASE_URL + "/v2/backpack/assertions",
+        [
+            {"status_code": 401, "json": {"error": "Invalid token"}},
+            {"json": {"result": []}},
+        ],
+    )
+    store = TokenStore()
+    store.set(KEY, stored())
+    client = make_client(store)
+
+    assert client.fetch_assertion() == []
+    assert token_mock.call_count == 1
+    assert store.get(KEY)["access_token"] == "new_token"
+    assert assertions_mock.last_request.headers["Authorization"] == "Bearer new_token"
+
+    # Only authenticates again once per request
+    store.set(KEY, stored())
+    client = make_client(store)
+    requests_mock.get(
+        BASE_URL + "/v2/backpack/assertions",
+        status_code=401,
+        json={"error": "Invalid token"},
+    )
+
+    with pytest.raises(APIError):
+        client.fetch_assertion()
+
+    assert token_mock.call_count == 2
+
+
+def test_async_rejected_token_deleted():
+    store = TokenStore()
+    store.set(KEY, stored())
+    headers = []
+
+    def handler(request):
+        if request.url.path == "/o/token":
+            return httpx.Response(200, json=token_response("new_token"))
+
+        headers.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer stored_token":
+            return httpx.Response(401, json={"error": "Invalid token"})
+
+        return httpx.Response(200, json={"result": []})
+
+    async def fetch():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = make_client(store, AsyncBadgrClient, http_client=http_client)
+
+        async with client:
+            return await client.fetch_assertion()
+
+    assert asyncio.run(fetch()) == []
+    assert headers == ["Bearer stored_token", "Bearer new_token"]
+    assert store.get(KEY)["access_token"] == "new_token"
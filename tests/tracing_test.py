@@ -0,0 +1,123 @@
+import asyncio
+import httpx
+from contextlib import contextmanager
+from badgrclient import AsyncBadgrClient, AsyncBadgeClass, BadgeClass
+from tests.conftest import TEST_CLIENT_ID, TEST_PASSWORD, TEST_USER, TOKEN_RESPONSE
+
+
+class FakeSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+
+class FakeTracer:
+    """Records spans like OpenTelemetry's start_as_current_span, for a single
+    thread or task
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._current = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        parent = self._current[-1] if self._current else None
+        span = FakeSpan(name, dict(attributes or {}), parent)
+        self.spans.append(span)
+        self._current.append(span)
+        try:
+            yield span
+        finally:
+            self._current.pop()
+
+    def tree(self):
+        return [
+            (span.name, span.parent.name if span.parent else None)
+            for span in self.spans
+        ]
+
+
+def test_spans_nest(client_factory, requests_mock):
+    requests_mock.get(
+        "http://localhost:8000/v2/issuers/is1/badgeclasses",
+        json={
+            "result": [
+                {
+                    "entityType": "BadgeClass",
+                    "entityId": "bc1",
+                    "name": "Speak Up!",
+                    "issuer": "is1",
+                }
+            ]
+        },
+    )
+    requests_mock.post(
+        "http://localhost:8000/v2/badgeclasses/bc1/assertions",
+        json={"result": [{"entityType": "Assertion", "entityId": "a1"}]},
+    )
+    tracer = FakeTracer()
+    client = client_factory(unique_badge_names=True, tracer=tracer)
+
+    client.load_badge_names("is1")
+    BadgeClass(client, badge_name="Speak Up!", issuer_eid="is1").issue(
+        "jane@example.com"
+    )
+
+    assert tracer.tree() == [
+        ("BadgrClient._get_auth_token", None),
+        ("BadgrClient.load_badge_names", None),
+        ("Issuer.fetch_badgeclasses", "BadgrClient.load_badge_names"),
+        ("GET /v2/issuers/{eid}/badgeclasses", "Issuer.fetch_badgeclasses"),
+        ("BadgeClass.issue", None),
+        ("Assertion.create", "BadgeClass.issue"),
+        ("POST /v2/badgeclasses/{eid}/assertions", "Assertion.create"),
+    ]
+    issue, request = tracer.spans[4], tracer.spans[6]
+    assert issue.attributes == {
+        "badgr.entity_type": "BadgeClass",
+        "badgr.entity_id": "bc1",
+    }
+    assert request.attributes["http.status_code"] == 200
+    assert request.attributes["badgr.endpoint"] == "/v2/badgeclasses/{eid}/assertions"
+    assert request.attributes["badgr.payload_size"] > 0
+
+
+def test_async_spans_nest():
+    def handler(request):
+        if request.url.path == "/o/token":
+            return httpx.Response(200, json=TOKEN_RESPONSE)
+
+        return httpx.Response(
+            200, json={"result": [{"entityType": "Assertion", "entityId": "a1"}]}
+        )
+
+    tracer = FakeTracer()
+    client = AsyncBadgrClient(
+        username=TEST_USER,
+        password=TEST_PASSWORD,
+        client_id=TEST_CLIENT_ID,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        tracer=tracer,
+    )
+
+    asyncio.run(AsyncBadgeClass(client, "bc1").issue("jane@example.com"))
+
+    assert tracer.tree() == [
+        ("AsyncBadgeClass.issue", None),
+        ("AsyncAssertion.create", "AsyncBadgeClass.issue"),
+        ("POST /v2/badgeclasses/{eid}/assertions", "AsyncAssertion.create"),
+        # The deferred login happens in the first request
+        ("AsyncBadgrClient._get_auth_token", "POST /v2/badgeclasses/{eid}/assertions"),
+    ]
+
+
+def test_no_tracer(client, requests_mock):
+    requests_mock.get("http://localhost:8000/v2/issuers", json={"result": []})
+
+    assert client.tracer is None
+    assert client.fetch_issuer() == []